@@ -1,8 +1,29 @@
 # Orchestrator package init
-# Expose main components for easy import and IDE discovery
+# Expose main components for easy import and IDE discovery.
+# Submodules are imported on first attribute access so that importing the
+# package (e.g. when uvicorn loads orchestrator.main) does not pull in ccxt,
+# numpy, requests or mcp before they are needed.
 
-from .exchange import binance
-from .integrations import slack
-from .data import volatility
-from .strategies import moving_average
-from .bots import manager 
+import importlib
+
+_LAZY_SUBMODULES = {
+    'binance': 'orchestrator.exchange.binance',
+    'slack': 'orchestrator.integrations.slack',
+    'volatility': 'orchestrator.data.volatility',
+    'moving_average': 'orchestrator.strategies.moving_average',
+    'manager': 'orchestrator.bots.manager',
+}
+
+__all__ = list(_LAZY_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(_LAZY_SUBMODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module 'orchestrator' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
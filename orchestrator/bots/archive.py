@@ -0,0 +1,261 @@
+"""
+Compressed log archive.
+
+Each bot run's log entries are stored as one closed segment: a JSON-lines
+file compressed with gzip (or zstd when LOG_ARCHIVE_CODEC=zstd and the
+`zstandard` package is installed). A manifest (manifest.json) indexes the
+segments with their date, entry count and sizes, so listing the history
+reads memory instead of scanning the directory. Segments are read back
+with streaming decompression, and retention drops the oldest segments
+beyond LOG_ARCHIVE_MAX_MB or older than LOG_ARCHIVE_MAX_DAYS.
+
+Uncompressed `bot_logs_<run_id>.json` files from earlier versions are
+compressed into the archive the first time it is opened.
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+
+MANIFEST = 'manifest.json'
+CODECS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+
+def _format_run_id(run_id: str) -> str:
+    """'20250101_120000' -> '2025-01-01 12:00:00'; anything else unchanged."""
+    date, _, clock = run_id.partition('_')
+    if len(date) == 8 and len(clock) == 6 and (date + clock).isdigit():
+        return f"{date[:4]}-{date[4:6]}-{date[6:]} {clock[:2]}:{clock[2:4]}:{clock[4:]}"
+    return run_id
+
+
+def _open_write(path: str, codec: str):
+    if codec == 'zstd':
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')), encoding='utf-8')
+    return gzip.open(path, 'wt', encoding='utf-8')
+
+
+def _open_read(path: str):
+    if path.endswith(CODECS['zstd']):
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')), encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _codec_from_env() -> str:
+    codec = os.getenv('LOG_ARCHIVE_CODEC', 'gzip').lower()
+    if codec == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("LOG_ARCHIVE_CODEC=zstd needs the zstandard package; using gzip")
+            return 'gzip'
+    return codec if codec in CODECS else 'gzip'
+
+
+class LogArchive:
+    """
+    Args:
+        directory (str): Where segments and the manifest live.
+        legacy_dir (str): Directory searched once for uncompressed
+            `bot_logs_*.json` files to migrate (None = no migration).
+        max_bytes (int): Total compressed size kept; oldest segments go first.
+        max_age (float): Seconds a segment is kept (None = forever).
+    """
+    def __init__(self, directory: str, legacy_dir: Optional[str] = None, prefix: str = 'bot_logs_',
+                 codec: str = 'gzip', max_bytes: Optional[int] = None, max_age: Optional[float] = None,
+                 clock=time.time):
+        self.directory = directory
+        self.legacy_dir = legacy_dir
+        self.prefix = prefix
+        self.codec = codec
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+        self._segments = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls, log_dir: str) -> 'LogArchive':
+        max_mb = float(os.getenv('LOG_ARCHIVE_MAX_MB', '200'))
+        max_days = float(os.getenv('LOG_ARCHIVE_MAX_DAYS', '90'))
+        return cls(
+            os.getenv('LOG_ARCHIVE_DIR') or os.path.join(log_dir, 'archive'), legacy_dir=log_dir,
+            codec=_codec_from_env(), max_bytes=int(max_mb * 1024 * 1024) if max_mb > 0 else None,
+            max_age=max_days * 86400 if max_days > 0 else None,
+        )
+
+    # -- manifest ------------------------------------------------------------
+
+    def _open(self) -> dict:
+        """Segments by filename, loaded from the manifest on first use."""
+        if self._segments is None:
+            os.makedirs(self.directory, exist_ok=True)
+            rebuilt = False
+            try:
+                with open(os.path.join(self.directory, MANIFEST), encoding='utf-8') as f:
+                    segments = {entry['filename']: entry for entry in json.load(f)['segments']}
+            except (OSError, ValueError, KeyError):
+                # Missing or damaged: index whatever segments are on disk
+                segments = self._rebuild_manifest()
+                rebuilt = bool(segments)
+            self._segments = segments
+            if rebuilt:
+                self._enforce_retention()
+                self._save_manifest()
+            if self.legacy_dir:
+                self._migrate_legacy()
+        return self._segments
+
+    def _rebuild_manifest(self) -> dict:
+        """Re-index the segment files after the manifest was lost or damaged."""
+        segments = {}
+        for filename in os.listdir(self.directory):
+            for suffix in CODECS.values():
+                if filename.startswith(self.prefix) and filename.endswith(suffix):
+                    path = os.path.join(self.directory, filename)
+                    run_id = filename[len(self.prefix):-len(suffix)]
+                    with _open_read(path) as f:
+                        entries = sum(1 for line in f if line.strip())
+                    segments[filename] = {
+                        'filename': filename, 'run_id': run_id, 'date': _format_run_id(run_id),
+                        'entries': entries, 'size': os.path.getsize(path), 'raw_size': None,
+                        'created': os.path.getmtime(path),
+                    }
+        return segments
+
+    def _save_manifest(self):
+        ordered = sorted(self._segments.values(), key=lambda entry: entry['created'])
+        path = os.path.join(self.directory, MANIFEST)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'segments': ordered}, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def _migrate_legacy(self):
+        try:
+            names = sorted(os.listdir(self.legacy_dir))
+        except FileNotFoundError:
+            return
+        migrated = 0
+        for filename in names:
+            if not (filename.startswith(self.prefix) and filename.endswith('.json')):
+                continue
+            path = os.path.join(self.legacy_dir, filename)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            run_id = filename[len(self.prefix):-len('.json')]
+            self._write(run_id, entries, created=os.path.getmtime(path))
+            os.remove(path)
+            migrated += 1
+        if migrated:
+            self._enforce_retention()
+            self._save_manifest()
+
+    # -- writing ---------------------------------------------------------------
+
+    def _write(self, run_id: str, entries: List[dict], created: Optional[float] = None) -> dict:
+        filename = f"{self.prefix}{run_id}{CODECS[self.codec]}"
+        path = os.path.join(self.directory, filename)
+        tmp = f"{path}.tmp"
+        raw_size = 0
+        with _open_write(tmp, self.codec) as f:
+            for entry in entries:
+                line = json.dumps(entry, separators=(',', ':')) + '\n'
+                raw_size += len(line)
+                f.write(line)
+        os.replace(tmp, path)
+        segment = {
+            'filename': filename, 'run_id': run_id, 'date': _format_run_id(run_id),
+            'entries': len(entries), 'size': os.path.getsize(path), 'raw_size': raw_size,
+            'created': self.clock() if created is None else created,
+        }
+        self._segments[filename] = segment
+        return segment
+
+    def write_segment(self, run_id: str, entries: List[dict]) -> dict:
+        """Store (or replace) the segment of `run_id`, then apply retention."""
+        with self._lock:
+            self._open()
+            segment = self._write(run_id, list(entries))
+            self._enforce_retention()
+            self._save_manifest()
+            return segment
+
+    def _enforce_retention(self) -> List[str]:
+        ordered = sorted(self._segments.values(), key=lambda entry: entry['created'])
+        removed = []
+        total = sum(entry['size'] for entry in ordered)
+        cutoff = self.clock() - self.max_age if self.max_age else None
+        # The newest segment is always kept
+        for entry in ordered[:-1]:
+            too_old = cutoff is not None and entry['created'] < cutoff
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_big):
+                break
+            try:
+                os.remove(os.path.join(self.directory, entry['filename']))
+            except FileNotFoundError:
+                pass
+            total -= entry['size']
+            del self._segments[entry['filename']]
+            removed.append(entry['filename'])
+        return removed
+
+    def enforce_retention(self) -> List[str]:
+        """Drop segments beyond the size / age limits; returns their filenames."""
+        with self._lock:
+            self._open()
+            removed = self._enforce_retention()
+            if removed:
+                self._save_manifest()
+            return removed
+
+    # -- reading ---------------------------------------------------------------
+
+    def list(self) -> List[dict]:
+        """Segments, newest first, from the manifest."""
+        with self._lock:
+            segments = list(self._open().values())
+        return sorted(segments, key=lambda entry: entry['run_id'], reverse=True)
+
+    def has(self, filename: str) -> bool:
+        with self._lock:
+            return filename in self._open()
+
+    def read(self, filename: str, category: Optional[str] = None) -> Iterator[dict]:
+        """
+        Stream the entries of a segment, oldest first, decompressing as it goes.
+
+        Raises:
+            KeyError: If `filename` is not in the archive.
+        """
+        if not self.has(filename):
+            raise KeyError(filename)
+        with _open_read(os.path.join(self.directory, filename)) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if category is None or entry.get('category') == category:
+                    yield entry
+
+    def stats(self) -> dict:
+        segments = self.list()
+        size = sum(entry['size'] for entry in segments)
+        raw = sum(entry['raw_size'] or 0 for entry in segments)
+        return {
+            'segments': len(segments), 'bytes': size, 'codec': self.codec,
+            'compression_ratio': round(raw / size, 2) if size and raw else None,
+            'max_bytes': self.max_bytes, 'max_age': self.max_age,
+        }
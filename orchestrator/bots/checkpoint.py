@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+CHECKPOINT_DIR = os.getenv(
+    'CHECKPOINT_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs', 'checkpoints')
+)
+# Seconds between periodic checkpoints of a running bot
+CHECKPOINT_INTERVAL = float(os.getenv('CHECKPOINT_INTERVAL', '60'))
+# Older checkpoints are ignored: their candles no longer connect to the live feed
+CHECKPOINT_MAX_AGE = float(os.getenv('CHECKPOINT_MAX_AGE', str(6 * 60 * 60)))
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(symbol: str, timeframe: str, directory: Optional[str] = None) -> str:
+    """File holding the checkpoint of the bot trading `symbol` on `timeframe`."""
+    name = f"{symbol.replace('/', '_')}_{timeframe}.json"
+    return os.path.join(directory or CHECKPOINT_DIR, name)
+
+
+def save_checkpoint(path: str, state: dict, now: Optional[float] = None):
+    """
+    Atomically write `state` to `path`: the JSON goes to a temporary file in
+    the same directory which then replaces the old checkpoint, so a crash
+    mid-write never leaves a truncated file behind.
+
+    Args:
+        now (float): Time stamped as `saved_at` (default: the wall clock);
+            pass the same clock load_checkpoint will be given.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    saved_at = time.time() if now is None else now
+    state = dict(state, version=CHECKPOINT_VERSION, saved_at=saved_at)
+    fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str, max_age: Optional[float] = CHECKPOINT_MAX_AGE,
+                    now: Optional[float] = None) -> Optional[dict]:
+    """
+    Read a checkpoint written by save_checkpoint.
+
+    Returns:
+        Optional[dict]: The saved state, or None if there is no usable
+        checkpoint (missing, unreadable, other version, or older than max_age).
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if state.get('version') != CHECKPOINT_VERSION:
+        return None
+    now = time.time() if now is None else now
+    if max_age is not None and now - state.get('saved_at', 0) > max_age:
+        return None
+    return state
+
+
+def remove_checkpoint(path: str):
+    if os.path.exists(path):
+        os.remove(path)
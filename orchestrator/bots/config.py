@@ -0,0 +1,281 @@
+"""
+Hot-reloadable bot configuration.
+
+The ConfigStore holds strategy and execution parameters in a JSON (or,
+with PyYAML installed, YAML) file at BOT_CONFIG_FILE (default
+config/bot.json). The file is polled for changes, and `PUT /config`
+updates it through `update()`. Every change is validated as a whole and
+published as a new numbered version; running bots pick the latest version
+up at the start of their next cycle and switch all parameters at once.
+
+A file may hold defaults for every bot plus per-symbol overrides:
+
+    {"short_window": 8, "long_window": 30,
+     "symbols": {"ETH/USDT": {"trade_amount": 0.05}}}
+
+Keys not in the file keep the bot's constructor values (a removed key
+leaves bots on the last value they got). Changing the symbol still needs
+a restart.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from orchestrator.data.candles import TIMEFRAME_MS
+
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'bot.json'
+)
+
+
+class ConfigError(ValueError):
+    """Raised for configuration values that fail validation."""
+
+
+def _number(kind, minimum=None, maximum=None, optional=False, exclusive_min=False):
+    def check(name, value):
+        if value is None and optional:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigError(f"{name} must be a number")
+        if kind is int and float(value) != int(value):
+            raise ConfigError(f"{name} must be a whole number")
+        value = kind(value)
+        if minimum is not None and (value <= minimum if exclusive_min else value < minimum):
+            raise ConfigError(f"{name} must be {'>' if exclusive_min else '>='} {minimum}")
+        if maximum is not None and value > maximum:
+            raise ConfigError(f"{name} must be <= {maximum}")
+        return value
+    return check
+
+
+def _choice(options, optional=False):
+    def check(name, value):
+        if value is None and optional:
+            return None
+        if value not in options:
+            raise ConfigError(f"{name} must be one of {', '.join(sorted(options))}")
+        return value
+    return check
+
+
+def _flag(name, value):
+    if not isinstance(value, bool):
+        raise ConfigError(f"{name} must be true or false")
+    return value
+
+
+# Parameters a running bot accepts, with their validators
+PARAMETERS: Dict[str, Callable] = {
+    'timeframe': _choice(set(TIMEFRAME_MS)),
+    'trade_amount': _number(float, 0, exclusive_min=True),
+    'short_window': _number(int, 1),
+    'long_window': _number(int, 2),
+    'vol_window': _number(int, 2),
+    'min_vol': _number(float, 0),
+    'stop_loss_pct': _number(float, 0, 1, optional=True, exclusive_min=True),
+    'take_profit_pct': _number(float, 0, optional=True, exclusive_min=True),
+    'trailing_stop_pct': _number(float, 0, 1, optional=True, exclusive_min=True),
+    'execution_algo': _choice({'twap', 'iceberg'}, optional=True),
+    'algo_slices': _number(int, 1),
+    'algo_duration': _number(float, 0, exclusive_min=True),
+    'sizing': _flag,
+    'max_slippage_bps': _number(float, 0, optional=True, exclusive_min=True),
+}
+
+
+def validate_params(values: dict, where: str = 'config') -> dict:
+    """Check and coerce one set of parameters (without cross-field checks)."""
+    if not isinstance(values, dict):
+        raise ConfigError(f"{where} must be an object")
+    unknown = sorted(set(values) - set(PARAMETERS))
+    if unknown:
+        raise ConfigError(f"Unknown parameter(s) in {where}: {', '.join(unknown)}")
+    return {name: PARAMETERS[name](name, value) for name, value in values.items()}
+
+
+def validate_config(config: dict) -> dict:
+    """
+    Validate a whole configuration (defaults plus `symbols` overrides).
+
+    Raises:
+        ConfigError: On unknown keys, bad values or a short window that is
+            not shorter than the long one for any symbol.
+    """
+    if not isinstance(config, dict):
+        raise ConfigError("config must be an object")
+    config = dict(config)
+    overrides = config.pop('symbols', None) or {}
+    if not isinstance(overrides, dict):
+        raise ConfigError("symbols must map symbols to parameter objects")
+    result = validate_params(config)
+    symbols = {symbol: validate_params(values, f"symbols.{symbol}") for symbol, values in overrides.items()}
+    for symbol, values in [(None, {})] + list(symbols.items()):
+        merged = dict(result, **values)
+        short, long = merged.get('short_window'), merged.get('long_window')
+        if short is not None and long is not None and short >= long:
+            where = f" for {symbol}" if symbol else ""
+            raise ConfigError(f"short_window must be below long_window{where}")
+    if symbols:
+        result['symbols'] = symbols
+    return result
+
+
+def _loads(text: str, path: str) -> dict:
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ConfigError("YAML config files need PyYAML (pip install pyyaml)")
+        return yaml.safe_load(text) or {}
+    return json.loads(text) if text.strip() else {}
+
+
+def _dumps(config: dict, path: str) -> str:
+    if path.endswith(('.yaml', '.yml')):
+        import yaml
+        return yaml.safe_dump(config, sort_keys=True)
+    return json.dumps(config, indent=2, sort_keys=True) + '\n'
+
+
+class ConfigStore:
+    """
+    Versioned bot configuration backed by a file.
+
+    Args:
+        path (str): JSON or YAML file; it need not exist yet.
+        poll_interval (float): Seconds between checks of the file for changes.
+    """
+    def __init__(self, path: str = DEFAULT_CONFIG_PATH, poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._config: dict = {}
+        self.version = 0
+        self.last_error = None
+        self.history: List[dict] = []
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _publish(self, config: dict, source: str):
+        # Called with the lock held; readers get the new dict or the old one, never a mix
+        if config == self._config:
+            return False
+        self._config = config
+        self.version += 1
+        self.history.append({'version': self.version, 'source': source, 'time': time.time()})
+        del self.history[:-20]
+        return True
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the file if it changed. An invalid file is reported in
+        `last_error` and leaves the current configuration in place.
+
+        Returns:
+            bool: True if a new version was published.
+        """
+        with self._lock:
+            mtime = self._file_mtime()
+            if not force and mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            if mtime is None:
+                return False
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    config = validate_config(_loads(f.read(), self.path))
+            except Exception as e:
+                # Unreadable, malformed or invalid; keep running on the last good version
+                self.last_error = f"{self.path}: {e}"
+                return False
+            self.last_error = None
+            return self._publish(config, 'file')
+
+    def update(self, changes: dict, symbol: Optional[str] = None, persist: bool = True) -> dict:
+        """
+        Merge `changes` into the defaults (or into the overrides of
+        `symbol`); None turns an optional setting off. The merged
+        configuration is validated before anything changes.
+
+        Returns:
+            dict: The new snapshot.
+        """
+        with self._lock:
+            config = json.loads(json.dumps(self._config))
+            target = config.setdefault('symbols', {}).setdefault(symbol, {}) if symbol else config
+            target.update(changes or {})
+            if symbol and not target:
+                del config['symbols'][symbol]
+            if not config.get('symbols'):
+                config.pop('symbols', None)
+            config = validate_config(config)
+            if persist:
+                self._write(config)
+            self._publish(config, 'api')
+        return self.snapshot()
+
+    def _write(self, config: dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(_dumps(config, self.path))
+        os.replace(tmp, self.path)
+        # Our own write is not a change to pick up again
+        self._mtime = self._file_mtime()
+        self.last_error = None
+
+    def current(self) -> Tuple[int, dict]:
+        """(version, configuration) as one consistent pair."""
+        with self._lock:
+            return self.version, self._config
+
+    def for_symbol(self, symbol: str) -> Tuple[int, dict]:
+        """(version, parameters for `symbol`): the defaults with its overrides applied."""
+        version, config = self.current()
+        params = {k: v for k, v in config.items() if k != 'symbols'}
+        params.update((config.get('symbols') or {}).get(symbol, {}))
+        return version, params
+
+    def snapshot(self) -> dict:
+        version, config = self.current()
+        return {
+            'version': version, 'path': self.path, 'config': config,
+            'last_error': self.last_error, 'history': list(self.history),
+        }
+
+    def start(self):
+        """Load the file and keep watching it in a background thread."""
+        self.reload(force=True)
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="bot-config-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.join(timeout=self.poll_interval + 1)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+
+# Shared by every bot in the process
+config_store = ConfigStore(os.getenv('BOT_CONFIG_FILE', DEFAULT_CONFIG_PATH))
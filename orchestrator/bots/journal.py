@@ -0,0 +1,468 @@
+"""
+Structured trade journal.
+
+Signals, orders, fills and per-cycle metrics are stored in a local SQLite
+database (WAL mode, indexed on symbol and time) instead of only as free
+text in the log files. Bots call the `record_*` methods, which just queue
+a row; a background writer inserts the queued rows in batches, one
+transaction per batch, so a bot cycle never waits for the disk. Readers
+use their own connections and, thanks to WAL, never block the writer.
+
+The writer also keeps per-symbol daily totals of the fills (`fill_days`)
+in the same transaction, so aggregates over whole days read one row per
+day and symbol instead of every fill.
+"""
+
+import argparse
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Union
+
+JOURNAL_PATH = os.getenv(
+    'JOURNAL_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs', 'journal.db')
+)
+# Rows written per transaction at most
+JOURNAL_BATCH_SIZE = int(os.getenv('JOURNAL_BATCH_SIZE', '500'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    timeframe TEXT,
+    run_id TEXT,
+    type TEXT NOT NULL,
+    price REAL,
+    candle_ts INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS signals_candle ON signals (symbol, timeframe, candle_ts, type);
+CREATE INDEX IF NOT EXISTS signals_symbol_ts ON signals (symbol, ts);
+CREATE INDEX IF NOT EXISTS signals_ts ON signals (ts);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    run_id TEXT,
+    order_id TEXT,
+    source TEXT,
+    side TEXT NOT NULL,
+    amount REAL,
+    price REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_symbol_ts ON orders (symbol, ts);
+CREATE INDEX IF NOT EXISTS orders_ts ON orders (ts);
+
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    run_id TEXT,
+    order_id TEXT,
+    side TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL NOT NULL,
+    realized_pnl REAL
+);
+CREATE INDEX IF NOT EXISTS fills_symbol_ts ON fills (symbol, ts);
+CREATE INDEX IF NOT EXISTS fills_ts ON fills (ts);
+
+CREATE TABLE IF NOT EXISTS fill_days (
+    symbol TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    trades INTEGER NOT NULL,
+    buys INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    realized_pnl REAL NOT NULL,
+    closing INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    PRIMARY KEY (symbol, day)
+);
+CREATE INDEX IF NOT EXISTS fill_days_day ON fill_days (day);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    timeframe TEXT,
+    run_id TEXT,
+    price REAL,
+    short_ma REAL,
+    long_ma REAL,
+    volatility REAL,
+    signal INTEGER
+);
+CREATE INDEX IF NOT EXISTS metrics_symbol_ts ON metrics (symbol, ts);
+CREATE INDEX IF NOT EXISTS metrics_ts ON metrics (ts);
+"""
+
+_INSERTS = {
+    'signals': "INSERT OR IGNORE INTO signals (ts, symbol, timeframe, run_id, type, price, candle_ts) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    'orders': "INSERT INTO orders (ts, symbol, run_id, order_id, source, side, amount, price, status) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'fills': "INSERT INTO fills (ts, symbol, run_id, order_id, side, amount, price, realized_pnl) "
+             "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'metrics': "INSERT INTO metrics (ts, symbol, timeframe, run_id, price, short_ma, long_ma, volatility, signal) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+}
+
+_ROLLUP = (
+    "INSERT INTO fill_days (symbol, day, trades, buys, volume, realized_pnl, closing, wins, losses, "
+    "first_ts, last_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (symbol, day) DO UPDATE SET "
+    "trades = trades + excluded.trades, buys = buys + excluded.buys, "
+    "volume = volume + excluded.volume, realized_pnl = realized_pnl + excluded.realized_pnl, "
+    "closing = closing + excluded.closing, wins = wins + excluded.wins, "
+    "losses = losses + excluded.losses, first_ts = MIN(first_ts, excluded.first_ts), "
+    "last_ts = MAX(last_ts, excluded.last_ts)"
+)
+
+TABLES = tuple(_INSERTS)
+DAY_MS = 86_400_000
+
+
+def to_ms(value: Union[None, int, float, str, datetime.datetime]) -> Optional[int]:
+    """
+    Epoch milliseconds from epoch seconds / milliseconds, an ISO date or
+    datetime string (naive values are UTC) or a datetime.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp() * 1000)
+    # Anything below year 2286 in seconds is well under 1e10
+    return int(value if value > 1e10 else value * 1000)
+
+
+def _where(symbol: Optional[str], start: Optional[int], end: Optional[int]):
+    clauses, params = [], []
+    if symbol:
+        clauses.append("symbol = ?")
+        params.append(symbol)
+    if start is not None:
+        clauses.append("ts >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("ts < ?")
+        params.append(end)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _day_totals(fills: List[tuple]) -> List[tuple]:
+    """`fill_days` rows for a batch of `fills` rows."""
+    days = {}
+    for ts, symbol, _, _, side, amount, price, pnl in fills:
+        key = (symbol, ts // DAY_MS)
+        day = days.get(key)
+        if day is None:
+            day = days[key] = [symbol, key[1], 0, 0, 0.0, 0.0, 0, 0, 0, ts, ts]
+        day[2] += 1
+        day[3] += side == 'buy'
+        day[4] += amount * price
+        if pnl is not None:
+            day[5] += pnl
+            day[6] += 1
+            day[7] += pnl > 0
+            day[8] += pnl < 0
+        day[9] = min(day[9], ts)
+        day[10] = max(day[10], ts)
+    return [tuple(day) for day in days.values()]
+
+
+def _whole_days(start: Optional[int], end: Optional[int]) -> bool:
+    """Whether [start, end) can be answered from the daily totals."""
+    return (start is None or start % DAY_MS == 0) and (end is None or end % DAY_MS == 0)
+
+
+class TradeJournal:
+    """
+    SQLite journal of signals, orders, fills and cycle metrics.
+
+    Timestamps are epoch milliseconds. The database and the writer thread
+    are created on first use, so importing the module costs nothing.
+    """
+    def __init__(self, path: str = JOURNAL_PATH, batch_size: int = JOURNAL_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._writer = None
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+
+    # -- connections ---------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent on a crash; a power loss may drop the last batches
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_started(self):
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read connection (sqlite3 connections are per thread)."""
+        self._ensure_started()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    # -- writing -------------------------------------------------------
+
+    def _put(self, table: str, row: tuple):
+        self._ensure_started()
+        self._queue.put((table, row))
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            batch, waiters = [], []
+            # Take whatever else is already queued, up to one batch
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(conn, batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[tuple]):
+        by_table = {}
+        for table, row in batch:
+            by_table.setdefault(table, []).append(row)
+        try:
+            with conn:
+                for table, rows in by_table.items():
+                    conn.executemany(_INSERTS[table], rows)
+                if 'fills' in by_table:
+                    conn.executemany(_ROLLUP, _day_totals(by_table['fills']))
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Trade journal failed to write {len(batch)} rows: {e}")
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every row queued so far is committed."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def record_signal(self, symbol: str, signal_type: str, price: float, candle_ts: Optional[int] = None,
+                      timeframe: Optional[str] = None, run_id: Optional[str] = None,
+                      ts: Optional[int] = None):
+        """A strategy signal; repeats for the same candle are ignored."""
+        ts = ts if ts is not None else int(time.time() * 1000)
+        self._put('signals', (ts, symbol, timeframe, run_id, signal_type, price, candle_ts))
+
+    def record_order(self, symbol: str, side: str, amount: float, price: Optional[float],
+                     order: Optional[dict] = None, source: str = 'strategy',
+                     run_id: Optional[str] = None, ts: Optional[int] = None):
+        """An order sent to the exchange (`order` None = rejected before reaching it)."""
+        ts = ts if ts is not None else int(time.time() * 1000)
+        order = order or {}
+        status = order.get('status') or ('rejected' if not order else None)
+        price = order.get('average') or order.get('average_price') or order.get('price') or price
+        self._put('orders', (ts, symbol, run_id, order.get('id'), source, side, amount, price, status))
+
+    def record_fill(self, symbol: str, side: str, amount: float, price: float,
+                    order_id: Optional[str] = None, realized_pnl: Optional[float] = None,
+                    run_id: Optional[str] = None, ts: Optional[int] = None):
+        """A fill; `realized_pnl` is set when it reduced a position."""
+        ts = ts if ts is not None else int(time.time() * 1000)
+        self._put('fills', (ts, symbol, run_id, order_id, side, amount, price, realized_pnl))
+
+    def record_metric(self, symbol: str, price: float, short_ma: Optional[float] = None,
+                      long_ma: Optional[float] = None, volatility: Optional[float] = None,
+                      signal: int = 0, timeframe: Optional[str] = None,
+                      run_id: Optional[str] = None, ts: Optional[int] = None):
+        """Indicator values of one bot cycle."""
+        ts = ts if ts is not None else int(time.time() * 1000)
+        self._put('metrics', (ts, symbol, timeframe, run_id, price, short_ma, long_ma, volatility, signal))
+
+    # -- queries -------------------------------------------------------
+
+    def _fill_totals(self, symbol: Optional[str], start: Optional[int], end: Optional[int],
+                     per_day: bool) -> List[sqlite3.Row]:
+        """Fill totals over [start, end), overall or per UTC day."""
+        if _whole_days(start, end):
+            where, params = _where(symbol, None, None)
+            clauses = [where[len(" WHERE "):]] if where else []
+            if start is not None:
+                clauses.append("day >= ?")
+                params.append(start // DAY_MS)
+            if end is not None:
+                clauses.append("day < ?")
+                params.append(end // DAY_MS)
+            where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+            columns = (
+                "COALESCE(SUM(trades), 0) AS trades, COALESCE(SUM(buys), 0) AS buys, "
+                "COALESCE(SUM(volume), 0.0) AS volume, COALESCE(SUM(realized_pnl), 0.0) AS realized_pnl, "
+                "COALESCE(SUM(closing), 0) AS closing, COALESCE(SUM(wins), 0) AS wins, "
+                "COALESCE(SUM(losses), 0) AS losses, MIN(first_ts) AS first_ts, MAX(last_ts) AS last_ts"
+            )
+            table, day = "fill_days", "fill_days.day"
+        else:
+            where, params = _where(symbol, start, end)
+            columns = (
+                "COUNT(*) AS trades, COALESCE(SUM(side = 'buy'), 0) AS buys, "
+                "COALESCE(SUM(amount * price), 0.0) AS volume, "
+                "COALESCE(SUM(realized_pnl), 0.0) AS realized_pnl, COUNT(realized_pnl) AS closing, "
+                "COALESCE(SUM(realized_pnl > 0), 0) AS wins, COALESCE(SUM(realized_pnl < 0), 0) AS losses, "
+                "MIN(ts) AS first_ts, MAX(ts) AS last_ts"
+            )
+            table, day = "fills", f"ts / {DAY_MS}"
+        if per_day:
+            sql = (f"SELECT date({day} * 86400, 'unixepoch') AS day, {columns} FROM {table}{where} "
+                   f"GROUP BY {day} ORDER BY {day}")
+        else:
+            sql = f"SELECT {columns} FROM {table}{where}"
+        return self._reader().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _with_rates(row: sqlite3.Row) -> dict:
+        totals = dict(row)
+        totals['sells'] = totals['trades'] - totals['buys']
+        totals['win_rate'] = round(totals['wins'] / totals['closing'], 4) if totals['closing'] else None
+        return totals
+
+    def summary(self, symbol: Optional[str] = None, start=None, end=None) -> dict:
+        """
+        Trade count, volume, realized P&L and win rate over fills in
+        [start, end). A trade counts as a win / loss when it closed part of
+        a position at a profit / loss. Ranges on whole UTC days are read
+        from the daily totals.
+        """
+        start, end = to_ms(start), to_ms(end)
+        result = self._with_rates(self._fill_totals(symbol, start, end, per_day=False)[0])
+        where, params = _where(symbol, start, end)
+        conn = self._reader()
+        result['orders'] = conn.execute(f"SELECT COUNT(*) FROM orders{where}", params).fetchone()[0]
+        result['signals'] = conn.execute(f"SELECT COUNT(*) FROM signals{where}", params).fetchone()[0]
+        return result
+
+    def daily(self, symbol: Optional[str] = None, start=None, end=None) -> List[dict]:
+        """Trades, volume, realized P&L and win rate per UTC day."""
+        rows = self._fill_totals(symbol, to_ms(start), to_ms(end), per_day=True)
+        return [self._with_rates(row) for row in rows]
+
+    def rows(self, table: str, symbol: Optional[str] = None, start=None, end=None,
+             limit: int = 100) -> List[dict]:
+        """Newest rows of one journal table."""
+        if table not in TABLES:
+            raise ValueError(f"Unknown journal table {table}; use one of {', '.join(TABLES)}")
+        where, params = _where(symbol, to_ms(start), to_ms(end))
+        rows = self._reader().execute(
+            f"SELECT * FROM {table}{where} ORDER BY ts DESC, id DESC LIMIT ?", params + [limit]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict:
+        return {
+            'path': self.path,
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'batches': self.batches,
+            'errors': self.errors,
+        }
+
+
+# Shared by every bot in the process
+trade_journal = TradeJournal()
+
+
+def benchmark(path: str, days: int = 180, fills_per_day: int = 500, symbols: int = 10) -> dict:
+    """Journal `days` of synthetic fills into `path` and time the aggregate queries."""
+    import random
+
+    journal = TradeJournal(path)
+    rng = random.Random(0)
+    day_ms = 86_400_000
+    start = int(time.time() * 1000) - days * day_ms
+    started = time.perf_counter()
+    for i in range(days * fills_per_day):
+        side = 'buy' if i % 2 == 0 else 'sell'
+        pnl = rng.gauss(0, 5) if side == 'sell' else None
+        journal.record_fill(
+            f"C{i % symbols}/USDT", side, 0.01, 100 + rng.random(),
+            realized_pnl=pnl, ts=start + i * day_ms // fills_per_day
+        )
+    journal.flush(timeout=None)
+    write_seconds = time.perf_counter() - started
+
+    # Day-aligned starts read the daily totals, others scan the fills
+    last_month = (start // day_ms + days - 30) * day_ms
+    timings = {}
+    for name, query in (
+        ('summary', lambda: journal.summary()),
+        ('summary_symbol_month', lambda: journal.summary('C3/USDT', start=last_month)),
+        ('summary_partial_day', lambda: journal.summary(start=last_month + 1)),
+        ('daily', lambda: journal.daily()),
+        ('daily_symbol', lambda: journal.daily('C3/USDT')),
+    ):
+        query_started = time.perf_counter()
+        query()
+        timings[name] = round((time.perf_counter() - query_started) * 1000, 2)
+    return {
+        'fills': days * fills_per_day,
+        'write_seconds': round(write_seconds, 2),
+        'batches': journal.batches,
+        'query_ms': timings,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time journal writes and aggregate queries.")
+    parser.add_argument('path', help="Database file to create (use a scratch path)")
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--fills-per-day', type=int, default=500)
+    options = parser.parse_args()
+    print(benchmark(options.path, options.days, options.fills_per_day))
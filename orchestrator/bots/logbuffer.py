@@ -0,0 +1,102 @@
+import threading
+from bisect import bisect_right
+from collections import deque
+from typing import Iterator, List, Optional
+
+
+class LogRingBuffer:
+    """
+    Fixed-size ring buffer of bot log entries.
+
+    Every entry gets a monotonically increasing `seq` number, and each
+    category keeps a secondary index of the sequence numbers it owns, so
+    `since(after_seq, category)` returns only the entries a client has not
+    seen yet, in O(log n + new entries).
+
+    Writers are serialized by a lock. Readers take no lock: a slot is
+    written before the sequence counter that publishes it is advanced, and
+    readers drop any slot whose `seq` no longer matches because it was
+    overwritten in the meantime.
+    """
+    def __init__(self, capacity: int = 100):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._slots: List[Optional[dict]] = [None] * capacity
+        self._by_category = {}
+        self._write_lock = threading.Lock()
+        # Sequence number of the newest published entry (0 = none yet)
+        self._last_seq = 0
+        # Entries up to and including this sequence number were cleared
+        self._cleared_seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest entry still held (last_seq + 1 if empty)."""
+        return self._first_seq(self._last_seq)
+
+    def append(self, entry: dict) -> int:
+        """Store a copy of `entry` with its `seq` number and return that number."""
+        with self._write_lock:
+            seq = self._last_seq + 1
+            stored = dict(entry, seq=seq)
+            self._slots[seq % self.capacity] = stored
+            index = self._by_category.get(stored.get('category'))
+            if index is None:
+                index = self._by_category[stored.get('category')] = deque(maxlen=self.capacity)
+            index.append(seq)
+            self._last_seq = seq
+        return seq
+
+    def clear(self):
+        """Drop all entries; sequence numbers keep increasing."""
+        with self._write_lock:
+            self._cleared_seq = self._last_seq
+
+    def _first_seq(self, last: int) -> int:
+        return max(self._cleared_seq + 1, last - self.capacity + 1, 1)
+
+    def _entry(self, seq: int) -> Optional[dict]:
+        entry = self._slots[seq % self.capacity]
+        if entry is None or entry['seq'] != seq:
+            return None
+        return entry
+
+    def since(self, after_seq: int = 0, category: Optional[str] = None,
+              limit: Optional[int] = None) -> List[dict]:
+        """
+        Entries with `seq > after_seq`, oldest first, optionally limited to one
+        category and to the newest `limit` entries.
+        """
+        last = self._last_seq
+        first = max(self._first_seq(last), after_seq + 1)
+        if category is None:
+            seqs = range(first, last + 1)
+        else:
+            index = self._by_category.get(category)
+            # Copying a deque happens in one step under the GIL
+            seqs = list(index) if index is not None else []
+            seqs = seqs[bisect_right(seqs, first - 1):bisect_right(seqs, last)]
+        if limit is not None:
+            seqs = seqs[-limit:] if limit > 0 else []
+        entries = []
+        for seq in seqs:
+            entry = self._entry(seq)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def latest(self, category: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        """Newest entries first, as the dashboard shows them."""
+        return self.since(0, category, limit)[::-1]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.since(0))
+
+    def __len__(self) -> int:
+        last = self._last_seq
+        return last - self._first_seq(last) + 1
@@ -1,21 +1,40 @@
 import time
 import datetime
 from orchestrator.exchange.binance import BinanceClient
-from orchestrator.strategies.moving_average import MovingAverageStrategy
-from orchestrator.data.volatility import calculate_volatility
+from orchestrator.data.indicators import indicator_batcher
+from orchestrator.data.candles import (
+    get_aggregator, required_base_candles, TIMEFRAME_MS, BASE_TIMEFRAME
+)
+from orchestrator.data.hub import market_data_hub
+from orchestrator.data.orderbook import order_books
 from orchestrator.integrations.slack import send_slack_message
+from orchestrator.bots.logbuffer import LogRingBuffer
+from orchestrator.bots.journal import trade_journal
+from orchestrator.execution.triggers import trigger_engine, TRAILING_STOP
+from orchestrator.execution.risk import risk_engine
+from orchestrator.execution.algos import algo_scheduler, create_algo
+from orchestrator.execution.sizing import position_sizer
+from orchestrator.exchange.resilience import Backoff
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.config import config_store
+from orchestrator.bots.checkpoint import (
+    checkpoint_path, save_checkpoint, load_checkpoint, CHECKPOINT_INTERVAL
+)
 import numpy as np
-import json
 import os
 import threading
+from collections import deque
+from typing import Optional
 
 # At the top of the file
 # Add a lock for the last_bot_run_data to prevent race conditions
 last_bot_run_data_lock = threading.Lock()
 
-# Each log entry will be a dict with timestamp, category, and message
-bot_logs = []
-bot_logs_history = []  # To store historical logs
+# Each log entry will be a dict with timestamp, category, message and seq.
+# Only the last 100 entries are kept in memory.
+bot_logs = LogRingBuffer(capacity=100)
+# Entries of earlier runs (the full logs are in LOG_DIR); bounded so it cannot grow for days
+bot_logs_history = deque(maxlen=int(os.getenv('BOT_LOGS_HISTORY_LIMIT', '1000')))
 log_categories = [
     "INFO", "ERROR", "TRADE", "SIGNAL", "PRICE", "METRIC", "SYSTEM"
 ]
@@ -27,6 +46,8 @@ LOG_DIR = os.path.join(
 )
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
+# Compressed log segments of past runs, indexed by a manifest
+log_archive = LogArchive.from_env(LOG_DIR)
 
 # Initialize with empty data structure
 last_bot_run_data = {
@@ -40,6 +61,14 @@ last_bot_run_data = {
     'no_data': True        # Flag to indicate no real data is available
 }
 
+def _env_fraction(name: str, value=None):
+    """`value` if given, else the float in environment variable `name` (unset/empty = None)."""
+    if value is not None:
+        return value
+    raw = os.getenv(name, '').strip()
+    return float(raw) if raw else None
+
+
 class TradingBot:
     """
     Trading bot manager that runs a moving average strategy with volatility filter on Binance.
@@ -47,14 +76,41 @@ class TradingBot:
     def __init__(
         self,
         symbol: str = 'BTC/USDT',
+        timeframe: str = BASE_TIMEFRAME,
         trade_amount: float = 0.001,
         short_window: int = 5,
         long_window: int = 20,
         vol_window: int = 20,
         min_vol: float = None,
-        stop_event=None
+        stop_event=None,
+        hub=None,
+        on_log=None,
+        on_update=None,
+        exchange=None,
+        clock=None,
+        notify=send_slack_message,
+        checkpoints: bool = None,
+        stop_loss_pct: float = None,
+        take_profit_pct: float = None,
+        trailing_stop_pct: float = None,
+        triggers=None,
+        risk=None,
+        execution_algo: str = None,
+        algo_slices: int = None,
+        algo_duration: float = None,
+        scheduler=None,
+        indicators=None,
+        journal=None,
+        sizing: bool = None,
+        sizer=None,
+        max_slippage_bps: float = None,
+        books=None,
+        config=None
     ):
+        if timeframe not in TIMEFRAME_MS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
         self.symbol = symbol
+        self.timeframe = timeframe
         self.trade_amount = trade_amount
         self.short_window = short_window
         self.long_window = long_window
@@ -69,7 +125,58 @@ class TradingBot:
             self.min_vol = min_vol
             
         self.stop_event = stop_event
-        self.run_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Optional hooks used when the bot runs outside the web server process
+        self.on_log = on_log
+        self.on_update = on_update
+        # `time`-like object providing time() and sleep(); replays pass a virtual clock
+        self.clock = clock or time
+        # Where log lines are sent besides the dashboard (Slack by default)
+        self.notify = notify
+        if checkpoints is None:
+            checkpoints = os.getenv('BOT_CHECKPOINTS', 'true').lower() == 'true'
+        self.checkpoints = checkpoints
+        # Protective exits armed after each buy (fractions, e.g. 0.02 = 2%); unset = off
+        self.stop_loss_pct = _env_fraction('STOP_LOSS_PCT', stop_loss_pct)
+        self.take_profit_pct = _env_fraction('TAKE_PROFIT_PCT', take_profit_pct)
+        self.trailing_stop_pct = _env_fraction('TRAILING_STOP_PCT', trailing_stop_pct)
+        self.triggers = triggers if triggers is not None else trigger_engine
+        # Pre-trade limits shared by all bots in the process
+        self.risk = risk if risk is not None else risk_engine
+        # Strategy orders can be worked as TWAP / iceberg parents instead of one market order
+        self.execution_algo = execution_algo or os.getenv('EXECUTION_ALGO', '').strip().lower() or None
+        self.algo_slices = algo_slices or int(os.getenv('EXECUTION_SLICES', '5'))
+        self.algo_duration = algo_duration or float(os.getenv('EXECUTION_DURATION', '300'))
+        self.scheduler = scheduler if scheduler is not None else algo_scheduler
+        # Batches indicator evaluation with the other bots of this process
+        self.indicators = indicators if indicators is not None else indicator_batcher
+        # Structured record of signals, orders, fills and cycle metrics; False turns it off
+        if journal is None:
+            journal = trade_journal if os.getenv('BOT_JOURNAL', 'true').lower() == 'true' else False
+        self.journal = journal or None
+        # Volatility-targeted order sizes instead of the fixed trade_amount
+        if sizing is None:
+            sizing = os.getenv('POSITION_SIZING', 'false').lower() == 'true'
+        self.sizing = sizing
+        self.sizer = sizer if sizer is not None else position_sizer
+        # Size of the position opened by the last buy, which the next sell closes
+        self.entry_amount = None
+        # Orders whose expected cost against the order book mid exceeds this are skipped
+        self.max_slippage_bps = _env_fraction('MAX_SLIPPAGE_BPS', max_slippage_bps)
+        self.books = books if books is not None else order_books
+        # Hot-reloaded parameters, applied between cycles; False turns reloading off
+        self.config = config_store if config is None else (config or None)
+        self.config_version = None
+        # Cycles in a row without any price data; the retry delay grows with it
+        self.fetch_failures = 0
+        self.retry_backoff = Backoff(base=10, cap=290)
+        self.algo_orders = {}
+        # Parent order opening the current position; its fills (re)arm the exits
+        self.entry_algo = None
+        # One-cancels-other group of the exits protecting the current position
+        self.exit_group = None
+        self.checkpoint_file = checkpoint_path(symbol, timeframe)
+        self.last_checkpoint = None
+        self.run_id = datetime.datetime.fromtimestamp(self.clock.time()).strftime("%Y%m%d_%H%M%S")
         
         # Archive previous logs if any
         if bot_logs:
@@ -83,8 +190,8 @@ class TradingBot:
         
         # Initialize exchange with improved error handling
         try:
-            self.exchange = BinanceClient()
-            self.log("Successfully connected to Binance exchange", "SYSTEM")
+            self.exchange = exchange or BinanceClient()
+            self.log("Binance client created, validating credentials in the background", "SYSTEM")
         except Exception as e:
             import traceback
             self.log(f"Failed to initialize Binance client: {e}", "ERROR")
@@ -92,17 +199,372 @@ class TradingBot:
             self.log("Check your .env file for valid API credentials", "ERROR")
             raise  # Re-raise to prevent bot from running with no exchange
             
-        self.strategy = MovingAverageStrategy()
+        self.hub = hub if hub is not None else market_data_hub
+        self.subscription = None
         self.prices = []
         self.timestamps = []
+        # Candle on which the last order was placed; never trade the same candle twice
+        self.last_trade_candle = None
+        self.open_orders = {}
+
+    def _history_needed(self) -> int:
+        """Candles the strategy needs for its current windows (at least 100)."""
+        return max(100, self.long_window + 1, self.vol_window + 1)
+
+    def _apply_config(self) -> bool:
+        """
+        Switch to the latest configuration version, all parameters at once.
+        Indicators are recomputed from the shared candle buffer on the next
+        fetch, which only backfills candles a longer window needs; a new
+        timeframe is rolled up from the same 1m buffer.
+        """
+        if self.config is None:
+            return False
+        version, params = self.config.for_symbol(self.symbol)
+        if version == self.config_version:
+            return False
+        self.config_version = version
+        changes = {name: value for name, value in params.items() if getattr(self, name, None) != value}
+        if not changes:
+            return False
+        short = changes.get('short_window', self.short_window)
+        long = changes.get('long_window', self.long_window)
+        if short >= long:
+            self.log(
+                f"Config v{version} ignored: short_window {short} must be below long_window {long}", 
+                "ERROR"
+            )
+            return False
+        previous = None
+        if 'timeframe' in changes:
+            previous, self.subscription = self.subscription, None
+            self.checkpoint_file = checkpoint_path(self.symbol, changes['timeframe'])
+        for name, value in changes.items():
+            setattr(self, name, value)
+        if previous is not None:
+            # Join the new feed before leaving the old one so the shared 1m buffer is kept
+            self._ensure_subscription(self._history_needed())
+            previous.close()
+        self.log(
+            f"Config v{version} applied: " + ", ".join(f"{name}={value}" for name, value in sorted(changes.items())), 
+            "SYSTEM"
+        )
+        return True
+
+    def _ensure_subscription(self, limit: int):
+        if self.subscription is None or self.subscription.limit < limit:
+            previous = self.subscription
+            self.subscription = self.hub.subscribe(
+                self.symbol, self.timeframe, limit=limit
+            )
+            if previous is not None:
+                previous.close()
+        return self.subscription
+
+    def checkpoint_state(self, limit: int = 100) -> dict:
+        """Everything needed to resume this bot without a warm-up fetch."""
+        candles = []
+        if self.subscription is not None:
+            candles = get_aggregator(self.symbol).get(
+                limit=required_base_candles(self.timeframe, limit)
+            )
+        with last_bot_run_data_lock:
+            chart = dict(last_bot_run_data) if last_bot_run_data.get('symbol') == self.symbol else None
+        return {
+            'config': {
+                'symbol': self.symbol,
+                'timeframe': self.timeframe,
+                'trade_amount': self.trade_amount,
+                'short_window': self.short_window,
+                'long_window': self.long_window,
+                'vol_window': self.vol_window,
+                'min_vol': self.min_vol,
+            },
+            'run_id': self.run_id,
+            'base_candles': candles,
+            'last_trade_candle': self.last_trade_candle,
+            'entry_amount': self.entry_amount,
+            'open_orders': list(self.open_orders.values()),
+            'exits': self.triggers.active(self.symbol, group=self.exit_group) if self.exit_group else [],
+            'chart': chart,
+        }
+
+    def save_checkpoint(self):
+        """Write a checkpoint now (no-op when checkpoints are disabled)."""
+        if not self.checkpoints:
+            return
+        try:
+            now = self.clock.time()
+            save_checkpoint(self.checkpoint_file, self.checkpoint_state(), now=now)
+            self.last_checkpoint = now
+        except Exception as e:
+            self.log(f"Failed to write checkpoint: {e}", "ERROR")
+
+    def _maybe_checkpoint(self):
+        if self.last_checkpoint is None or self.clock.time() - self.last_checkpoint >= CHECKPOINT_INTERVAL:
+            self.save_checkpoint()
+
+    def restore_checkpoint(self, limit: int = 100) -> bool:
+        """
+        Resume from the last checkpoint of this symbol/timeframe: seed the
+        candle buffer so the next fetch is incremental, restore the chart,
+        the last traded candle and the orders that were still open.
+        """
+        if not self.checkpoints:
+            return False
+        state = load_checkpoint(self.checkpoint_file, now=self.clock.time())
+        if state is None:
+            return False
+        self._ensure_subscription(limit)
+        get_aggregator(self.symbol).update(state.get('base_candles') or [])
+        self.last_trade_candle = state.get('last_trade_candle')
+        self.entry_amount = state.get('entry_amount')
+        for order in state.get('open_orders') or []:
+            status = self.exchange.get_order_status(order['id'], self.symbol)
+            if status and status.get('status') in ('closed', 'canceled', 'expired', 'rejected'):
+                self.log(f"Restored order {order['id']} is {status['status']}", "TRADE")
+            else:
+                self.open_orders[order['id']] = dict(order, **(status or {}))
+        self._restore_exits(state.get('exits') or [])
+        chart = state.get('chart')
+        if chart and chart.get('prices'):
+            with last_bot_run_data_lock:
+                last_bot_run_data.clear()
+                last_bot_run_data.update(chart)
+        self.log(
+            f"Restored checkpoint from run {state.get('run_id')} with "
+            f"{len(state.get('base_candles') or [])} candles and "
+            f"{len(self.open_orders)} open orders", 
+            "SYSTEM"
+        )
+        return True
+
+    def _record_order(self, order):
+        if not order:
+            return
+        self.last_trade_candle = self.timestamps[-1] if self.timestamps else None
+        # Parent orders of execution algorithms are tracked by the scheduler
+        if 'algo' not in order and order.get('status') not in ('closed', 'canceled', 'expired', 'rejected'):
+            self.open_orders[order['id']] = order
+        # Orders are exactly what must not be lost on a restart
+        self.save_checkpoint()
+
+    def _arm_exits(self, entry_price: float, amount: float):
+        """
+        Register the stop-loss / take-profit / trailing stop of a new long
+        position, or resize those of the position being bought in slices.
+        """
+        if not (self.stop_loss_pct or self.take_profit_pct or self.trailing_stop_pct):
+            return
+        group = f"{self.symbol}:{self.timeframe}:{self.run_id}:{self.last_trade_candle}"
+        reference = entry_price
+        if group == self.exit_group:
+            # Resizing: the trailing stop keeps the high it has seen
+            for info in self.triggers.active(self.symbol, group=group):
+                if info['kind'] == TRAILING_STOP:
+                    reference = max(reference, info['watermark'])
+        self._disarm_exits()
+        self.exit_group = group
+        if self.stop_loss_pct:
+            self.triggers.add_stop_loss(
+                self.symbol, 'sell', amount, entry_price * (1 - self.stop_loss_pct),
+                group=self.exit_group, callback=self._on_trigger
+            )
+        if self.take_profit_pct:
+            self.triggers.add_take_profit(
+                self.symbol, 'sell', amount, entry_price * (1 + self.take_profit_pct),
+                group=self.exit_group, callback=self._on_trigger
+            )
+        if self.trailing_stop_pct:
+            self.triggers.add_trailing_stop(
+                self.symbol, 'sell', amount, reference, percent=self.trailing_stop_pct,
+                group=self.exit_group, callback=self._on_trigger
+            )
+        self.log(f"Armed exit triggers for {amount} around entry ${entry_price:.2f}", "TRADE")
+
+    def _restore_exits(self, exits):
+        if not exits:
+            return
+        self.exit_group = exits[0]['group']
+        for info in exits:
+            if info['kind'] == TRAILING_STOP:
+                self.triggers.add_trailing_stop(
+                    self.symbol, info['side'], info['amount'], info['watermark'],
+                    offset=info['offset'], percent=info['percent'],
+                    group=self.exit_group, callback=self._on_trigger
+                )
+            else:
+                add = self.triggers.add_stop_loss if info['kind'] == 'stop_loss' else self.triggers.add_take_profit
+                add(
+                    self.symbol, info['side'], info['amount'], info['level'],
+                    group=self.exit_group, callback=self._on_trigger
+                )
+
+    def _disarm_exits(self):
+        if self.exit_group is not None:
+            self.triggers.cancel_group(self.exit_group)
+            self.exit_group = None
+
+    def _cancel_entry_algo(self):
+        """Stop a sliced entry that is still buying into a position being closed."""
+        if self.entry_algo is not None:
+            self.scheduler.cancel(self.entry_algo)
+            self.entry_algo = None
+
+    def _on_trigger(self, trigger, price: float):
+        """A protective exit was crossed: close the position with a market order."""
+        self.exit_group = None
+        self._cancel_entry_algo()
+        # Closing the position must not be held back by limits on new risk
+        reason = self.risk.check(self.symbol, trigger.side, trigger.amount, price, protective=True)
+        if reason:
+            self.log(f"{trigger.kind} exit blocked by risk limits: {reason}", "ERROR")
+            return
+        self.log(
+            f"{trigger.kind.replace('_', ' ').title()} triggered at ${price:.2f}: "
+            f"placing {trigger.side.upper()} order for {trigger.amount} {self.symbol.split('/')[0]}",
+            "TRADE"
+        )
+        # Exits must not wait for a slicing schedule
+        order = self._submit_order(trigger.side, trigger.amount, price, sliced=False, source=trigger.kind)
+        self.entry_amount = None
+        self.log(f"{trigger.side.upper()} order placed: {order}", "TRADE")
+
+    def _submit_algo(self, side: str, amount: float):
+        """Hand an approved order to the execution scheduler as a TWAP / iceberg parent."""
+        def on_fill(algo, child):
+            pnl = self.risk.on_fill(self.symbol, side, child['new_fill'], child['fill_price'])
+            self._journal_fill(side, child['new_fill'], child['fill_price'], algo.id, pnl)
+            self.log(
+                f"{algo.kind.upper()} {algo.id}: filled {child['new_fill']} at "
+                f"${child['fill_price']:.2f} ({algo.progress:.0%} done)", 
+                "TRADE"
+            )
+            if side == 'buy' and self.entry_algo == algo.id:
+                # Protect what has been bought so far, not the whole parent
+                self.entry_amount = (self.entry_amount or 0.0) + child['new_fill']
+                self._arm_exits(algo.average_price, self.entry_amount)
+
+        def on_done(algo):
+            if algo.remaining > 0:
+                self.risk.release(self.symbol, side, algo.remaining)
+            self.algo_orders.pop(algo.id, None)
+            self.log(f"{algo.kind.upper()} {algo.id} {algo.status}: {algo.to_dict()}", "TRADE")
+
+        algo = create_algo(
+            self.execution_algo, self.exchange, self.symbol, side, amount,
+            slices=self.algo_slices, duration=self.algo_duration,
+            on_fill=on_fill, on_done=on_done
+        )
+        self.algo_orders[algo.id] = algo
+        # Set before the scheduler can report a first fill
+        if side == 'buy':
+            self.entry_algo = algo.id
+            self.entry_amount = None
+        self.scheduler.submit(algo)
+        return algo.to_dict()
+
+    def _submit_order(self, side: str, amount: float, price: float, sliced: bool = True,
+                      source: str = 'strategy'):
+        """
+        Send an order the risk engine has approved and report the outcome
+        back to it: fills update its positions, failed orders free the
+        exposure they reserved. Orders still open stay reserved.
+        """
+        if sliced and self.execution_algo:
+            order = self._submit_algo(side, amount)
+            self._journal_order(side, amount, price, order, self.execution_algo)
+            self._record_order(order)
+            return order
+        order = self.exchange.create_order(self.symbol, side, amount, reference_price=price)
+        self._journal_order(side, amount, price, order, source)
+        if not order:
+            self.risk.release(self.symbol, side, amount)
+        elif order.get('status') == 'closed':
+            filled = order.get('filled') or order.get('amount') or amount
+            fill_price = order.get('average') or order.get('price') or price
+            pnl = self.risk.on_fill(self.symbol, side, filled, fill_price, ordered=amount)
+            self._journal_fill(side, filled, fill_price, order.get('id'), pnl)
+            if self.sizing:
+                self.sizer.invalidate_balances()
+        self._record_order(order)
+        return order
+
+    def _order_amount(self, side: str, price: float) -> float:
+        """
+        Size of the next strategy order: `trade_amount`, or with sizing on
+        the volatility-targeted size (a sell closes what the last buy
+        opened). Falls back to `trade_amount` until the sizer has data.
+        """
+        if not self.sizing:
+            return self.trade_amount
+        if side == 'sell' and self.entry_amount:
+            return self.entry_amount
+        decision = self.sizer.size(self.symbol, self.timeframe, price, self.exchange)
+        if decision['amount'] is None:
+            self.log(
+                f"Position sizing unavailable ({decision['reason']}), "
+                f"using trade amount {self.trade_amount}", 
+                "INFO"
+            )
+            return self.trade_amount
+        note = f", {decision['reason']}" if decision['reason'] else ""
+        self.log(
+            f"Sized {side.upper()} at {decision['amount']} {self.symbol.split('/')[0]} "
+            f"(volatility {decision['volatility']:.4f}, equity {decision['equity']:.2f}{note})", 
+            "METRIC"
+        )
+        return decision['amount']
+
+    def _slippage_check(self, side: str, amount: float) -> Optional[str]:
+        """
+        Reason to skip a strategy order whose expected slippage, from the
+        local order book, is above `max_slippage_bps`. Passes when the
+        check is off or no book is available.
+        """
+        if not self.max_slippage_bps:
+            return None
+        book = self.books.refresh(self.symbol, self.exchange.client)
+        expected = book.slippage_bps(side, amount) if book is not None else None
+        if expected is None:
+            return None
+        self.log(f"Expected slippage for {side.upper()} {amount}: {expected:.1f} bps", "METRIC")
+        if expected > self.max_slippage_bps:
+            return f"expected slippage {expected:.1f} bps above {self.max_slippage_bps} bps"
+        return None
+
+    def _now_ms(self) -> int:
+        return int(self.clock.time() * 1000)
+
+    def _journal_order(self, side, amount, price, order, source):
+        if self.journal:
+            self.journal.record_order(
+                self.symbol, side, amount, price, order, source=source,
+                run_id=self.run_id, ts=self._now_ms()
+            )
+
+    def _journal_fill(self, side, amount, price, order_id, pnl):
+        if self.journal:
+            self.journal.record_fill(
+                self.symbol, side, amount, price, order_id=order_id, realized_pnl=pnl,
+                run_id=self.run_id, ts=self._now_ms()
+            )
 
     def fetch_recent_prices(self, limit: int = 100):
-        """Fetch recent close prices for the symbol."""
+        """
+        Fetch recent close prices for the symbol on the bot's timeframe.
+
+        Candles come from the shared market-data hub, which fetches each
+        symbol once per refresh and rolls 1m candles up to the bot's
+        timeframe, so bots on the same symbol share one upstream feed.
+        """
         try:
-            self.log(f"Fetching recent price data for {self.symbol}...", "PRICE")
-            ohlcv = self.exchange.client.fetch_ohlcv(
-                self.symbol, timeframe='1m', limit=limit
+            self.log(
+                f"Fetching recent {self.timeframe} price data for {self.symbol}...", 
+                "PRICE"
             )
+            self._ensure_subscription(limit)
+            ohlcv = self.subscription.fetch(limit)
             
             if not ohlcv or len(ohlcv) == 0:
                 self.log(f"No OHLCV data returned for {self.symbol}", "ERROR")
@@ -132,6 +594,7 @@ class TradingBot:
 
     def run(self):
         global last_bot_run_data
+        participant = None
         
         try:
             # Set real-time flag to true when bot starts
@@ -140,39 +603,79 @@ class TradingBot:
                 # 'no_data' will be set to False once data is successfully fetched.
                 # If it was True, let it remain True until first fetch.
             
+            # Credentials are checked asynchronously; don't trade before the result is in
+            valid = self.exchange.wait_until_validated(timeout=30)
+            if valid is not True:
+                # A check that timed out is not a pass: never trade on unconfirmed credentials
+                reason = self.exchange.credentials_error if valid is False else "no answer within 30s"
+                self.log(f"Binance credential check failed: {reason}", "ERROR")
+                self.log("Check your .env file for valid API credentials", "ERROR")
+                return
+            self.log("Successfully connected to Binance exchange", "SYSTEM")
+            participant = self.indicators.register()
+            if self.config is not None:
+                self.config.start()
+                self._apply_config()
+            self.restore_checkpoint()
+            self.last_checkpoint = self.clock.time()
+            
             while not self.stop_event.is_set():
+                self._apply_config()
+                self._maybe_checkpoint()
                 print("TradingBot.run() called")
                 self.log("--- New Bot Run ---", "SYSTEM")
                 self.log(
-                    f"Trading pair: {self.symbol}, Trade amount: {self.trade_amount}", 
+                    f"Trading pair: {self.symbol} ({self.timeframe}), "
+                    f"Trade amount: {self.trade_amount}", 
                     "INFO"
                 )
                 if self.stop_event and self.stop_event.is_set():
                     self.log("Bot stopped before starting.", "SYSTEM")
                     print("Bot stopped before starting.")
                     return
-                self.fetch_recent_prices()
+                self.fetch_recent_prices(self._history_needed())
+                if self.prices:
+                    if self.sizing:
+                        self.sizer.update(self.symbol, self.timeframe, self.timestamps, self.prices)
+                    self.risk.mark(self.symbol, self.prices[-1])
+                    # Exits fire on every price update, independent of the strategy filters
+                    self.triggers.on_price(self.symbol, self.prices[-1])
                 if len(self.prices) < self.long_window + 1:
                     self.log(
                         f"Not enough price data to run strategy. Need at least "
                         f"{self.long_window + 1}, got {len(self.prices)}.", 
                         "ERROR"
                     )
-                    time.sleep(10)
+                    if self.prices:
+                        self.fetch_failures = 0
+                        self._sleep(participant, 10)
+                    else:
+                        # The exchange is failing: back off with jitter instead of hammering it
+                        self.fetch_failures += 1
+                        self._sleep(participant, 10 + self.retry_backoff.delay(self.fetch_failures - 1))
                     continue
+                self.fetch_failures = 0
                 try:
-                    volatility = calculate_volatility(
-                        self.prices, window=self.vol_window
+                    # One row of a matrix pass shared with every bot due in this tick
+                    indicators = self.indicators.ma_crossover(
+                        self.prices, self.short_window, self.long_window, self.vol_window,
+                        participant=participant
                     )
+                    volatility = indicators['volatility']
+                    if not np.isfinite(volatility):
+                        raise ValueError(
+                            f"Not enough price data to calculate volatility "
+                            f"(need at least {self.vol_window + 1})."
+                        )
                     self.log(
                         f"Calculated volatility: {volatility:.4f} "
                         f"(threshold: {self.min_vol})", 
                         "METRIC"
                     )
-                    short_ma = self._ma(self.prices, self.short_window)
-                    long_ma = self._ma(self.prices, self.long_window)
-                    prev_short_ma = self._ma(self.prices[:-1], self.short_window)
-                    prev_long_ma = self._ma(self.prices[:-1], self.long_window)
+                    short_series = indicators['short_ma']
+                    long_series = indicators['long_ma']
+                    short_ma, prev_short_ma = float(short_series[-1]), float(short_series[-2])
+                    long_ma, prev_long_ma = float(long_series[-1]), float(long_series[-2])
                     self.log(
                         f"Short MA ({self.short_window}): {short_ma:.2f} | "
                         f"Long MA ({self.long_window}): {long_ma:.2f}", 
@@ -186,65 +689,63 @@ class TradingBot:
                     current_price = self.prices[-1]
                     self.log(f"Current price: {current_price:.2f}", "PRICE")
                     
-                    # Calculate all MAs for chart
-                    short_ma_arr = list(np.convolve(
-                        self.prices, np.ones(self.short_window)/self.short_window, mode='valid'
-                    ))
-                    long_ma_arr = list(np.convolve(
-                        self.prices, np.ones(self.long_window)/self.long_window, mode='valid'
-                    ))
-                    short_ma_arr = [None]*(self.short_window-1) + short_ma_arr
-                    long_ma_arr = [None]*(self.long_window-1) + long_ma_arr
+                    # MAs for the chart, None where the window does not fit yet
+                    short_ma_arr = [None if np.isnan(v) else float(v) for v in short_series]
+                    long_ma_arr = [None if np.isnan(v) else float(v) for v in long_series]
                     
-                    # Detect trade signals for chart
+                    # Trade signals for the chart
+                    crossover_series = indicators['crossovers']
                     signals = []
-                    for i in range(1, len(self.prices)):
-                        if (short_ma_arr[i-1] is not None and 
-                            long_ma_arr[i-1] is not None and 
-                            short_ma_arr[i] is not None and 
-                            long_ma_arr[i] is not None):
-                            
-                            if (short_ma_arr[i-1] <= long_ma_arr[i-1] and 
-                                short_ma_arr[i] > long_ma_arr[i]):
-                                signals.append({
-                                    'type': 'buy', 
-                                    'index': i, 
-                                    'price': self.prices[i]
-                                })
-                                self.log(
-                                    f"Chart signal detected: BUY at index {i}, "
-                                    f"price {self.prices[i]:.2f}", 
-                                    "SIGNAL"
-                                )
-                            elif (short_ma_arr[i-1] >= long_ma_arr[i-1] and 
-                                  short_ma_arr[i] < long_ma_arr[i]):
-                                signals.append({
-                                    'type': 'sell', 
-                                    'index': i, 
-                                    'price': self.prices[i]
-                                })
-                                self.log(
-                                    f"Chart signal detected: SELL at index {i}, "
-                                    f"price {self.prices[i]:.2f}", 
-                                    "SIGNAL"
-                                )
+                    for i in np.flatnonzero(crossover_series):
+                        i = int(i)
+                        signal_type = 'buy' if crossover_series[i] > 0 else 'sell'
+                        signals.append({
+                            'type': signal_type, 
+                            'index': i, 
+                            'price': self.prices[i]
+                        })
+                        self.log(
+                            f"Chart signal detected: {signal_type.upper()} at index {i}, "
+                            f"price {self.prices[i]:.2f}", 
+                            "SIGNAL"
+                        )
                     
                     # Save all data for chart visualization with thread safety
                     print(f"Updating last_bot_run_data with {len(self.prices)} prices and {len(signals)} signals")
                     
+                    chart_data = {
+                        'timestamps': self.timestamps,
+                        'prices': self.prices,
+                        'short_ma': short_ma_arr,
+                        'long_ma': long_ma_arr,
+                        'signals': signals,
+                        'volatility': volatility,
+                        'symbol': self.symbol,
+                        'timeframe': self.timeframe,
+                        'live_update': True,
+                        'no_data': False if self.prices else True # Set no_data based on prices
+                    }
+                    
                     # Use lock to safely update the shared data structure
                     with last_bot_run_data_lock:
                         last_bot_run_data.clear() # Clear the existing dictionary
-                        last_bot_run_data.update({ # Update it with new key-value pairs
-                            'timestamps': self.timestamps,
-                            'prices': self.prices,
-                            'short_ma': short_ma_arr,
-                            'long_ma': long_ma_arr,
-                            'signals': signals,
-                            'volatility': volatility,
-                            'live_update': True,
-                            'no_data': False if self.prices else True # Set no_data based on prices
-                        })
+                        last_bot_run_data.update(chart_data) # Update it with new key-value pairs
+                    if self.on_update:
+                        self.on_update(chart_data)
+                    if self.journal:
+                        now = self._now_ms()
+                        signal = int(crossover_series[-1])
+                        self.journal.record_metric(
+                            self.symbol, current_price, short_ma, long_ma, volatility, signal,
+                            timeframe=self.timeframe, run_id=self.run_id, ts=now
+                        )
+                        if signal:
+                            # Re-evaluations of the same candle are ignored by the journal
+                            self.journal.record_signal(
+                                self.symbol, 'buy' if signal > 0 else 'sell', current_price,
+                                candle_ts=self.timestamps[-1], timeframe=self.timeframe,
+                                run_id=self.run_id, ts=now
+                            )
                     
                     # Debug the structure of last_bot_run_data
                     print(f"DEBUG last_bot_run_data: prices={len(self.prices)}, "
@@ -257,50 +758,78 @@ class TradingBot:
                             f"Volatility too low ({volatility:.4f}), skipping trade.", 
                             "INFO"
                         )
-                        time.sleep(10)
+                        self._sleep(participant, 10)
                         continue
-                    if self.strategy.should_buy(
-                        self.prices, self.short_window, self.long_window
-                    ):
+                    if self.timestamps[-1] == self.last_trade_candle:
                         self.log(
-                            "Buy signal detected (short MA crossed above long MA).", 
-                            "TRADE"
-                        )
-                        order = self.exchange.create_order(
-                            self.symbol, 'buy', self.trade_amount
+                            "Already traded on the current candle, waiting for the next one.", 
+                            "INFO"
                         )
+                    elif crossover_series[-1] > 0:
                         self.log(
-                            f"Placing BUY order: {self.trade_amount} "
-                            f"{self.symbol.split('/')[0]} at ~${current_price:.2f}", 
+                            "Buy signal detected (short MA crossed above long MA).", 
                             "TRADE"
                         )
-                        self.log(f"BUY order placed: {order}", "TRADE")
-                    elif self.strategy.should_sell(
-                        self.prices, self.short_window, self.long_window
-                    ):
+                        amount = self._order_amount('buy', current_price)
+                        if amount:
+                            reason = self.risk.check(
+                                self.symbol, 'buy', amount, current_price
+                            ) or self._slippage_check('buy', amount)
+                        else:
+                            reason = "size below the exchange minimum"
+                        if reason:
+                            self.log(f"BUY blocked: {reason}", "TRADE")
+                        else:
+                            order = self._submit_order('buy', amount, current_price)
+                            # Sliced parents size and arm their exits as their children fill
+                            if order and 'algo' not in order:
+                                self.entry_amount = amount
+                                self._arm_exits(current_price, amount)
+                            self.log(
+                                f"Placing BUY order: {amount} "
+                                f"{self.symbol.split('/')[0]} at ~${current_price:.2f}", 
+                                "TRADE"
+                            )
+                            self.log(f"BUY order placed: {order}", "TRADE")
+                    elif crossover_series[-1] < 0:
                         self.log(
                             "Sell signal detected (short MA crossed below long MA).", 
                             "TRADE"
                         )
-                        order = self.exchange.create_order(
-                            self.symbol, 'sell', self.trade_amount
-                        )
-                        self.log(
-                            f"Placing SELL order: {self.trade_amount} "
-                            f"{self.symbol.split('/')[0]} at ~${current_price:.2f}", 
-                            "TRADE"
-                        )
-                        self.log(f"SELL order placed: {order}", "TRADE")
+                        amount = self._order_amount('sell', current_price)
+                        if amount:
+                            reason = self.risk.check(
+                                self.symbol, 'sell', amount, current_price
+                            ) or self._slippage_check('sell', amount)
+                        else:
+                            reason = "size below the exchange minimum"
+                        if reason:
+                            self.log(f"SELL blocked: {reason}", "TRADE")
+                        else:
+                            # The position is closed; its entry and protective exits go with it
+                            self._cancel_entry_algo()
+                            order = self._submit_order('sell', amount, current_price)
+                            if order:
+                                self.entry_amount = None
+                            self._disarm_exits()
+                            self.log(
+                                f"Placing SELL order: {amount} "
+                                f"{self.symbol.split('/')[0]} at ~${current_price:.2f}", 
+                                "TRADE"
+                            )
+                            self.log(f"SELL order placed: {order}", "TRADE")
                     else:
                         self.log("No trade signal this cycle.", "INFO")
                 except Exception as e:
                     self.log(f"Error in bot run: {e}", "ERROR")
-                time.sleep(10)  # Wait 10 seconds before next check
+                self._sleep(participant, 10)  # Wait 10 seconds before next check
             self.log("Bot loop detected stop_event, exiting loop.", "SYSTEM")
         except Exception as e:
             self.log(f"FATAL: Bot loop crashed: {e}", "ERROR")
             print(f"FATAL: Bot loop crashed: {e}")
         finally:
+            if participant is not None:
+                self.indicators.unregister(participant)
             # Set real-time flag to false when bot stops
             with last_bot_run_data_lock:
                 last_bot_run_data['live_update'] = False
@@ -308,18 +837,21 @@ class TradingBot:
                 # mark as no_data for the next potential static display.
                 if not last_bot_run_data.get('prices'):
                     last_bot_run_data['no_data'] = True
+            # Final checkpoint so a restart resumes from here
+            self.save_checkpoint()
+            # Exits are in the checkpoint; nobody feeds them prices once we stop
+            self._disarm_exits()
+            for algo in list(self.algo_orders.values()):
+                self.scheduler.cancel(algo.id)
+            # Release our reference on the shared market data feed
+            if self.subscription is not None:
+                self.subscription.close()
+                self.subscription = None
             # Save logs to history
             self._save_logs_to_file()
 
-    def _ma(self, prices, window):
-        import numpy as np
-        if len(prices) < window:
-            return 0.0
-        return float(np.mean(prices[-window:]))
-
     def log(self, message, category="INFO"):
-        from datetime import datetime
-        timestamp = datetime.now()
+        timestamp = datetime.datetime.fromtimestamp(self.clock.time())
         timestamp_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
         
         # Ensure category is valid
@@ -338,24 +870,23 @@ class TradingBot:
         entry_str = f"[{timestamp_str}] [{category}] {message}"
         bot_logs.append(log_entry)
         
-        # Keep only the last 100 logs in memory
-        if len(bot_logs) > 100:
-            bot_logs.pop(0)
+        if self.on_log:
+            self.on_log(log_entry)
             
-        send_slack_message(entry_str)
+        if self.notify:
+            self.notify(entry_str)
     
+    def _sleep(self, participant, seconds: float):
+        """Sleep between cycles without holding up other bots' indicator batches."""
+        with self.indicators.idle(participant):
+            self.clock.sleep(seconds)
+
     def _save_logs_to_file(self):
-        """Save current logs to a file with timestamp"""
+        """Save current logs as this run's compressed archive segment"""
         if not bot_logs:
             return
-            
-        # Create filename with timestamp
-        filename = f"bot_logs_{self.run_id}.json"
-        filepath = os.path.join(LOG_DIR, filename)
-        
         try:
-            with open(filepath, 'w') as f:
-                json.dump(bot_logs, f, indent=2)
-            print(f"Logs saved to {filepath}")
+            segment = log_archive.write_segment(self.run_id, list(bot_logs))
+            print(f"Logs saved to {segment['filename']}")
         except Exception as e:
-            print(f"Error saving logs to file: {e}") 
\ No newline at end of file
+            print(f"Error saving logs to file: {e}")
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""
+Process-sharded bot execution.
+
+Symbols are partitioned across worker processes, each running the bots of
+its symbols in threads. Workers report logs and status to the web server
+over a multiprocessing queue, and write chart arrays into one shared
+memory block per bot (symbol and timeframe) so the dashboard can read them
+without pickling.
+"""
+
+import math
+import multiprocessing as mp
+import os
+import queue
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from orchestrator.data.candles import BASE_TIMEFRAME
+
+# Number of chart points each shared memory block can hold
+CHART_CAPACITY = 1000
+# Seconds between worker heartbeats
+HEARTBEAT_INTERVAL = 2.0
+# Give up restarting a shard that keeps crashing
+MAX_RESTARTS = 5
+
+# Header: version (odd while a write is in progress), length, volatility, updated_at
+_HEADER = struct.Struct('<qqdd')
+_SERIES = ('timestamps', 'prices', 'short_ma', 'long_ma')
+
+
+def partition_symbols(symbols: List[str], num_shards: int) -> Dict[str, int]:
+    """
+    Assign each distinct symbol to a shard, round-robin over the sorted
+    symbols so shards stay balanced and the layout is the same on every start.
+    Bots on the same symbol always land in the same shard and share its feed.
+    """
+    return {symbol: i % num_shards for i, symbol in enumerate(sorted(set(symbols)))}
+
+
+def chart_key(config: dict) -> str:
+    """Identity of a bot's chart: 'BTC/USDT@5m'. Each key has exactly one writer."""
+    return f"{config['symbol']}@{config.get('timeframe') or BASE_TIMEFRAME}"
+
+
+def _chart_block_name(key: str) -> str:
+    return f"mcpbot_{os.getpid()}_{key.replace('/', '_').replace('@', '_').lower()}"
+
+
+class ChartBuffer:
+    """
+    Fixed-size chart arrays for one bot in shared memory.
+
+    A single writer (the worker thread running the bot) and any number of
+    readers; the version counter in the header works as a seqlock so readers
+    never see a half-written update.
+    """
+    def __init__(self, name: Optional[str] = None, capacity: int = CHART_CAPACITY, create: bool = False):
+        self.capacity = capacity
+        size = _HEADER.size + len(_SERIES) * capacity * 8
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _HEADER.pack_into(self.shm.buf, 0, 0, 0, float('nan'), 0.0)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._arrays = np.ndarray(
+            (len(_SERIES), capacity), dtype=np.float64, buffer=self.shm.buf, offset=_HEADER.size
+        )
+
+    def write(self, chart_data: dict):
+        length = min(len(chart_data.get('prices') or []), self.capacity)
+        version = _HEADER.unpack_from(self.shm.buf, 0)[0]
+        _HEADER.pack_into(self.shm.buf, 0, version + 1, 0, float('nan'), 0.0)
+        for row, key in enumerate(_SERIES):
+            values = (chart_data.get(key) or [])[-length:] if length else []
+            self._arrays[row, :length] = [np.nan if v is None else v for v in values]
+        volatility = chart_data.get('volatility')
+        _HEADER.pack_into(
+            self.shm.buf, 0, version + 2, length,
+            float('nan') if volatility is None else float(volatility), time.time()
+        )
+
+    def read(self, retries: int = 10) -> Optional[dict]:
+        for _ in range(retries):
+            version, length, volatility, updated_at = _HEADER.unpack_from(self.shm.buf, 0)
+            if version % 2:
+                time.sleep(0.001)
+                continue
+            arrays = self._arrays[:, :length].copy()
+            if _HEADER.unpack_from(self.shm.buf, 0)[0] != version:
+                continue
+            if version == 0:
+                return None
+            data = {
+                key: [None if math.isnan(v) else v for v in arrays[row].tolist()]
+                for row, key in enumerate(_SERIES)
+            }
+            data['timestamps'] = [int(ts) for ts in data['timestamps']]
+            data['volatility'] = None if math.isnan(volatility) else volatility
+            data['updated_at'] = updated_at
+            return data
+        return None
+
+    def close(self):
+        self._arrays = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _shard_worker(shard_id: int, bot_configs: List[dict], chart_blocks: Dict[str, str],
+                  events, stop_event):
+    """Entry point of a worker process: run the shard's bots until stop_event is set."""
+    from orchestrator.bots.manager import TradingBot
+
+    buffers = {key: ChartBuffer(name) for key, name in chart_blocks.items()}
+    threads = []
+
+    def make_hooks(config):
+        symbol, key = config['symbol'], chart_key(config)
+
+        def on_log(entry):
+            events.put(('log', shard_id, dict(entry, symbol=symbol, shard=shard_id)))
+
+        def on_update(chart_data):
+            buffers[key].write(chart_data)
+            events.put(('chart', shard_id, {
+                'key': key,
+                'symbol': symbol,
+                'signals': chart_data.get('signals', []),
+                'timeframe': chart_data.get('timeframe'),
+            }))
+        return on_log, on_update
+
+    for config in bot_configs:
+        on_log, on_update = make_hooks(config)
+
+        def run_bot(config=config, on_log=on_log, on_update=on_update):
+            try:
+                bot = TradingBot(stop_event=stop_event, on_log=on_log, on_update=on_update, **config)
+                bot.run()
+            except Exception as e:
+                events.put(('error', shard_id, {'symbol': config['symbol'], 'error': str(e)}))
+
+        thread = threading.Thread(target=run_bot, name=f"bot-{chart_key(config)}", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    while not stop_event.is_set() and any(t.is_alive() for t in threads):
+        events.put(('status', shard_id, {
+            'pid': os.getpid(),
+            'bots': {t.name[4:]: t.is_alive() for t in threads},
+        }))
+        stop_event.wait(HEARTBEAT_INTERVAL)
+
+    for thread in threads:
+        thread.join(timeout=15)
+    for buffer in buffers.values():
+        buffer.close()
+
+
+class ShardSupervisor:
+    """
+    Runs one worker process per shard and aggregates their logs, status and
+    chart data for the web server. Crashed workers are restarted.
+    """
+    def __init__(self, bot_configs: List[dict], num_shards: Optional[int] = None, log_sink=None):
+        if not bot_configs:
+            raise ValueError("At least one bot configuration is required.")
+        keys = [chart_key(c) for c in bot_configs]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate bots: {', '.join(duplicates)}")
+        self.bot_configs = bot_configs
+        distinct = len({c['symbol'] for c in bot_configs})
+        self.num_shards = min(num_shards or os.cpu_count() or 1, distinct)
+        self.log_sink = log_sink
+        self._ctx = mp.get_context('spawn')
+        self._events = self._ctx.Queue()
+        self._stop_event = self._ctx.Event()
+        self._lock = threading.Lock()
+        self._processes: Dict[int, mp.Process] = {}
+        self._shard_configs: Dict[int, List[dict]] = {}
+        self._status: Dict[int, dict] = {}
+        self._signals: Dict[str, dict] = {}
+        self._buffers: Dict[str, ChartBuffer] = {}
+        self._collector = None
+        self.running = False
+
+        assignment = partition_symbols([c['symbol'] for c in bot_configs], self.num_shards)
+        for config in bot_configs:
+            shard_id = assignment[config['symbol']]
+            self._shard_configs.setdefault(shard_id, []).append(config)
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+            self._stop_event.clear()
+            for config in self.bot_configs:
+                key = chart_key(config)
+                if key not in self._buffers:
+                    self._buffers[key] = ChartBuffer(_chart_block_name(key), create=True)
+            for shard_id in self._shard_configs:
+                self._status[shard_id] = {'restarts': 0, 'last_heartbeat': None, 'bots': {}}
+                self._spawn(shard_id)
+        self._collector = threading.Thread(target=self._collect, name="shard-collector", daemon=True)
+        self._collector.start()
+
+    def _spawn(self, shard_id: int):
+        configs = self._shard_configs[shard_id]
+        blocks = {chart_key(c): self._buffers[chart_key(c)].name for c in configs}
+        process = self._ctx.Process(
+            target=_shard_worker,
+            args=(shard_id, configs, blocks, self._events, self._stop_event),
+            name=f"bot-shard-{shard_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[shard_id] = process
+        self._status[shard_id]['pid'] = process.pid
+
+    def _collect(self):
+        while self.running:
+            try:
+                kind, shard_id, payload = self._events.get(timeout=1.0)
+            except queue.Empty:
+                kind = None
+            if kind == 'log':
+                if self.log_sink is not None:
+                    self.log_sink(payload)
+            elif kind == 'status':
+                with self._lock:
+                    self._status[shard_id].update(payload, last_heartbeat=time.time())
+            elif kind == 'chart':
+                self._signals[payload['key']] = payload
+            elif kind == 'error':
+                self._record_error(shard_id, f"Bot {payload['symbol']} failed: {payload['error']}")
+            self._check_workers()
+
+    def _check_workers(self):
+        with self._lock:
+            if not self.running or self._stop_event.is_set():
+                return
+            for shard_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                status = self._status[shard_id]
+                status['exitcode'] = process.exitcode
+                if status['restarts'] >= MAX_RESTARTS:
+                    continue
+                status['restarts'] += 1
+                self._record_error(
+                    shard_id,
+                    f"Shard {shard_id} exited with code {process.exitcode}, "
+                    f"restarting ({status['restarts']}/{MAX_RESTARTS})"
+                )
+                self._spawn(shard_id)
+
+    def _record_error(self, shard_id: int, message: str):
+        print(message)
+        if self.log_sink is not None:
+            self.log_sink({
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'category': 'ERROR',
+                'message': message,
+                'run_id': 'supervisor',
+                'shard': shard_id,
+            })
+
+    def stop(self, timeout: float = 20.0):
+        """Stop the workers, waiting up to `timeout` seconds; may take that long."""
+        with self._lock:
+            if not self.running or self._stop_event.is_set():
+                return
+            self._stop_event.set()
+            processes = list(self._processes.values())
+        deadline = time.time() + timeout
+        for process in processes:
+            process.join(timeout=max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=2)
+        with self._lock:
+            self.running = False
+            self._processes.clear()
+            for buffer in self._buffers.values():
+                buffer.close()
+                buffer.unlink()
+            self._buffers.clear()
+        if self._collector is not None:
+            self._collector.join(timeout=2)
+
+    def status(self) -> dict:
+        with self._lock:
+            shards = {}
+            for shard_id, configs in self._shard_configs.items():
+                process = self._processes.get(shard_id)
+                shards[shard_id] = dict(
+                    self._status.get(shard_id, {}),
+                    symbols=[c['symbol'] for c in configs],
+                    bots=[chart_key(c) for c in configs],
+                    alive=bool(process and process.is_alive()),
+                )
+            return {
+                'running': self.running, 'stopping': self.running and self._stop_event.is_set(),
+                'num_shards': self.num_shards, 'shards': shards,
+            }
+
+    def chart(self, symbol: str, timeframe: Optional[str] = None) -> Optional[dict]:
+        """
+        Chart arrays of the bot on `symbol` and `timeframe` (None = the first
+        configured bot on the symbol) read straight from its shared memory block.
+        """
+        if timeframe is None:
+            keys = [chart_key(c) for c in self.bot_configs if c['symbol'] == symbol]
+            key = keys[0] if keys else None
+        else:
+            key = chart_key({'symbol': symbol, 'timeframe': timeframe})
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return None
+        data = buffer.read()
+        if data is None:
+            return None
+        meta = self._signals.get(key, {})
+        data['symbol'] = symbol
+        data['timeframe'] = meta.get('timeframe') or key.partition('@')[2]
+        data['signals'] = meta.get('signals', [])
+        return data
+
+
+def configs_from_env() -> List[dict]:
+    """
+    Bot configurations for sharded mode from BOT_SYMBOLS (comma separated,
+    optionally `symbol@timeframe`, e.g. "BTC/USDT,ETH/USDT@5m").
+    """
+    configs = []
+    for item in os.getenv('BOT_SYMBOLS', 'BTC/USDT').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        symbol, _, timeframe = item.partition('@')
+        config = {'symbol': symbol}
+        if timeframe:
+            config['timeframe'] = timeframe
+        configs.append(config)
+    return configs
@@ -0,0 +1,232 @@
+"""
+Supervisor of the web server's bot.
+
+Control endpoints only enqueue a command and return; one control thread
+applies the commands in order and owns the bot's state transitions
+
+    stopped -> starting -> running -> stopping -> stopped
+
+so a request handler never waits on a bot thread. The bot thread moves the
+state to running once the exchange credentials are checked, and to stopped
+when its loop has exited.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+STOPPED = 'stopped'
+STARTING = 'starting'
+RUNNING = 'running'
+STOPPING = 'stopping'
+
+ACTIONS = ('start', 'stop')
+
+
+class BotCommand:
+    __slots__ = ('id', 'action', 'status', 'message', 'created_at', 'finished_at')
+
+    def __init__(self, command_id: str, action: str, created_at: float):
+        self.id = command_id
+        self.action = action
+        self.status = 'queued'
+        self.message = None
+        self.created_at = created_at
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id, 'action': self.action, 'status': self.status,
+            'message': self.message, 'created_at': self.created_at, 'finished_at': self.finished_at,
+        }
+
+
+class BotSupervisor:
+    """
+    Runs at most one bot, created by `bot_factory(stop_event)`, on a
+    background thread and applies start / stop commands to it.
+
+    Args:
+        start_timeout (float): Seconds a starting bot may spend on the
+            credential check; a bot whose check fails or does not finish
+            in time is stopped without running.
+        stop_timeout (float): Seconds a start command waits for the previous
+            bot to exit before giving up.
+    """
+    def __init__(self, bot_factory: Callable, start_timeout: float = 30.0,
+                 stop_timeout: float = 30.0, history: int = 50, clock=time.time):
+        self.bot_factory = bot_factory
+        self.start_timeout = start_timeout
+        self.stop_timeout = stop_timeout
+        self.clock = clock
+        self.state = STOPPED
+        self.since = clock()
+        self.bot = None
+        self.last_action = 'Bot not run yet.'
+        self.last_result = None
+        self.last_error = None
+        self._thread = None
+        self._stop_event = None
+        self._queue = queue.Queue()
+        self._control = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._commands = OrderedDict()
+        self._history = history
+        self.transitions = deque(maxlen=history)
+
+    # -- commands ------------------------------------------------------
+
+    def submit(self, action: str) -> dict:
+        """Queue a command and return it; its outcome shows up in `command()` / `status()`."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown bot command {action}; use one of {', '.join(ACTIONS)}")
+        command = BotCommand(f"cmd-{next(self._ids)}", action, self.clock())
+        with self._lock:
+            self._commands[command.id] = command
+            while len(self._commands) > self._history:
+                self._commands.popitem(last=False)
+            if self._control is None:
+                self._control = threading.Thread(target=self._control_loop, daemon=True)
+                self._control.start()
+        self._queue.put(command)
+        return command.to_dict()
+
+    def command(self, command_id: str) -> Optional[dict]:
+        command = self._commands.get(command_id)
+        return command.to_dict() if command else None
+
+    def _control_loop(self):
+        while True:
+            command = self._queue.get()
+            try:
+                if command.action == 'start':
+                    self._start(command)
+                else:
+                    self._stop(command)
+            except Exception as e:
+                self._finish(command, 'failed', f"{command.action} failed: {e}")
+                self.last_error = str(e)
+
+    def _finish(self, command: BotCommand, status: str, message: str):
+        command.status = status
+        command.message = message
+        command.finished_at = self.clock()
+
+    def _transition(self, state: str, action: Optional[str] = None, result: Optional[str] = None,
+                    error: Optional[str] = None, only_from: tuple = ()) -> bool:
+        """Move to `state` (only if currently in one of `only_from`, when given)."""
+        with self._lock:
+            if only_from and self.state not in only_from:
+                return False
+            self.state = state
+            self.since = self.clock()
+            self.transitions.append({'state': state, 'at': self.since})
+            if action is not None:
+                self.last_action, self.last_result, self.last_error = action, result, error
+        return True
+
+    def _start(self, command: BotCommand):
+        if self.state in (STARTING, RUNNING):
+            self.last_action = 'Bot is already running.'
+            self.last_result = 'Only one bot instance allowed at a time.'
+            self._finish(command, 'ignored', self.last_action)
+            return
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            # Still stopping: the new bot starts once the old one has exited
+            thread.join(self.stop_timeout)
+            if thread.is_alive():
+                self._finish(command, 'failed', 'Previous bot did not stop in time.')
+                self.last_error = 'Bot thread did not terminate within timeout.'
+                return
+        self._transition(STARTING, 'Bot starting.', 'Checking exchange credentials.')
+        stop_event = threading.Event()
+        try:
+            bot = self.bot_factory(stop_event)
+        except Exception as e:
+            self._transition(STOPPED, 'Bot run failed.', None, str(e))
+            self._finish(command, 'failed', f"Could not create bot: {e}")
+            return
+        with self._lock:
+            self.bot, self._stop_event = bot, stop_event
+            self._thread = threading.Thread(
+                target=self._run_bot, args=(bot, stop_event), name="trading-bot", daemon=True
+            )
+        self._thread.start()
+        self._finish(command, 'done', 'Bot is starting.')
+
+    def _stop(self, command: BotCommand):
+        if self.state == STOPPING:
+            self._finish(command, 'ignored', 'Bot is already stopping.')
+            return
+        # The bot may exit on its own at any moment; only a live bot gets stopped
+        if not self._transition(STOPPING, 'Stop signal sent to bot.', 'Bot will stop as soon as possible.',
+                                only_from=(STARTING, RUNNING)):
+            self.last_action, self.last_result, self.last_error = 'No bot is currently running.', None, None
+            self._finish(command, 'ignored', self.last_action)
+            return
+        self._stop_event.set()
+        self._finish(command, 'done', 'Stop signal sent to bot.')
+
+    def _run_bot(self, bot, stop_event: threading.Event):
+        error = None
+        try:
+            valid = bot.exchange.wait_until_validated(timeout=self.start_timeout)
+            if valid is None:
+                # Never counts as running on credentials nobody confirmed
+                error = f"Credential check did not finish within {self.start_timeout:g}s."
+            else:
+                if valid is True:
+                    # Unless a stop arrived in the meantime
+                    self._transition(
+                        RUNNING, 'Bot started.', 'Bot is running in the background.', only_from=(STARTING,)
+                    )
+                # With invalid credentials the bot logs why and returns at once
+                bot.run()
+        except Exception as e:
+            print(f"Exception in bot thread: {e}")
+            error = str(e)
+        finally:
+            with self._lock:
+                if self.bot is bot:
+                    self.bot = None
+            if error is not None:
+                self._transition(STOPPED, 'Bot run failed.', None, error)
+            elif stop_event.is_set():
+                self._transition(STOPPED, 'Bot stopped.', 'Bot has been stopped successfully.')
+            else:
+                error = getattr(bot.exchange, 'credentials_error', None)
+                self._transition(
+                    STOPPED, 'Bot run finished.', 'Check Slack for trade actions and logs.', error
+                )
+
+    # -- state ---------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self.state in (STARTING, RUNNING)
+
+    def checkpoint(self):
+        """Write a final checkpoint of the current bot (before the process exits)."""
+        bot = self.bot
+        if bot is not None:
+            bot.save_checkpoint()
+
+    def status(self) -> dict:
+        with self._lock:
+            commands = list(self._commands.values())[-5:]
+            return {
+                'state': self.state,
+                'since': self.since,
+                'is_running': self.is_running,
+                'last_action': self.last_action,
+                'last_result': self.last_result,
+                'last_error': self.last_error,
+                'queued_commands': self._queue.qsize(),
+                'recent_commands': [c.to_dict() for c in commands],
+                'transitions': list(self.transitions)[-10:],
+            }
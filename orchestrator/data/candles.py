@@ -0,0 +1,254 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Base timeframe every bot fetches; higher timeframes are derived from it.
+BASE_TIMEFRAME = '1m'
+
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '2h': 2 * 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000,
+}
+
+# Binance caps a single OHLCV request at 1000 candles
+MAX_FETCH_LIMIT = 1000
+
+
+def timeframe_factor(timeframe: str) -> int:
+    """Number of base (1m) candles that make up one candle of `timeframe`."""
+    if timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return TIMEFRAME_MS[timeframe] // TIMEFRAME_MS[BASE_TIMEFRAME]
+
+
+def required_base_candles(timeframe: str, count: int) -> int:
+    """
+    Number of 1m candles needed to build `count` complete candles of `timeframe`.
+    One extra bucket is requested because the oldest one is usually partial.
+    """
+    return (count + 1) * timeframe_factor(timeframe)
+
+
+class CandleAggregator:
+    """
+    Keeps the 1m candles of one symbol and incrementally rolls them up into
+    higher timeframes as each 1m candle arrives.
+
+    Candles use the ccxt OHLCV layout: [timestamp, open, high, low, close, volume].
+    """
+    def __init__(self, symbol: str, timeframes: Iterable[str] = ('5m', '15m', '1h'),
+                 max_candles: int = 6000):
+        self.symbol = symbol
+        self._lock = threading.Lock()
+        self._base = deque(maxlen=max_candles)
+        self._rollups: Dict[str, deque] = {}
+        self._partial_head: Dict[str, Optional[int]] = {}
+        for timeframe in timeframes:
+            self.add_timeframe(timeframe)
+
+    @property
+    def timeframes(self) -> List[str]:
+        return [BASE_TIMEFRAME] + list(self._rollups)
+
+    def add_timeframe(self, timeframe: str):
+        """Start maintaining `timeframe`, building it from the stored 1m candles."""
+        timeframe_factor(timeframe)
+        if timeframe == BASE_TIMEFRAME:
+            return
+        with self._lock:
+            if timeframe in self._rollups:
+                return
+            self._rollups[timeframe] = deque(maxlen=self._base.maxlen)
+            self._partial_head[timeframe] = None
+            for candle in self._base:
+                self._roll_new(timeframe, candle)
+
+    def ensure_capacity(self, base_candles: int):
+        """Grow the 1m buffer so it can hold at least `base_candles` candles."""
+        with self._lock:
+            if base_candles <= self._base.maxlen:
+                return
+            self._base = deque(self._base, maxlen=base_candles)
+            for timeframe, rollup in self._rollups.items():
+                self._rollups[timeframe] = deque(rollup, maxlen=base_candles)
+
+    def first_timestamp(self) -> Optional[int]:
+        """Open time of the oldest 1m candle, or None if nothing is stored yet."""
+        with self._lock:
+            return self._base[0][0] if self._base else None
+
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the newest 1m candle, or None if nothing is stored yet."""
+        with self._lock:
+            return self._base[-1][0] if self._base else None
+
+    def __len__(self):
+        return len(self._base)
+
+    def update(self, candles: Iterable[list]) -> int:
+        """
+        Merge 1m candles (oldest first) into the buffer.
+
+        A candle with the same timestamp as the newest stored one replaces it
+        (the exchange keeps updating the in-progress minute). Candles older
+        than the oldest stored one are backfilled history and are prepended
+        as far as the buffer has room; the rest are already known and skipped.
+
+        Returns:
+            int: Number of new 1m candles stored.
+        """
+        appended = 0
+        older = []
+        with self._lock:
+            for raw in candles:
+                candle = [int(raw[0])] + [float(v) for v in raw[1:6]]
+                if self._base and candle[0] < self._base[0][0]:
+                    older.append(candle)
+                elif not self._base or candle[0] > self._base[-1][0]:
+                    self._base.append(candle)
+                    for timeframe in self._rollups:
+                        self._roll_new(timeframe, candle)
+                    appended += 1
+                elif candle[0] == self._base[-1][0]:
+                    self._base[-1] = candle
+                    for timeframe in self._rollups:
+                        self._rebuild_last_bucket(timeframe)
+            if older:
+                appended += self._prepend(older)
+        return appended
+
+    def get(self, timeframe: str = BASE_TIMEFRAME, limit: Optional[int] = None) -> List[list]:
+        """
+        Return the most recent candles for `timeframe` (oldest first).
+
+        A leading bucket that started before the first stored 1m candle is
+        incomplete and is left out.
+        """
+        with self._lock:
+            if timeframe == BASE_TIMEFRAME:
+                candles = list(self._base)
+            elif timeframe in self._rollups:
+                candles = list(self._rollups[timeframe])
+                if candles and candles[0][0] == self._partial_head[timeframe]:
+                    candles = candles[1:]
+            else:
+                raise ValueError(f"Timeframe {timeframe} is not maintained for {self.symbol}")
+        candles = [list(candle) for candle in candles]
+        if limit is not None:
+            candles = candles[-limit:]
+        return candles
+
+    def _prepend(self, candles: List[list]) -> int:
+        # Never push out newer candles to make room for older ones
+        room = self._base.maxlen - len(self._base)
+        older = sorted({candle[0]: candle for candle in candles}.values())[-room:] if room else []
+        if not older:
+            return 0
+        self._base = deque(older + list(self._base), maxlen=self._base.maxlen)
+        # The rollups gain buckets at their start, so rebuild them from scratch
+        for timeframe, rollup in self._rollups.items():
+            self._rollups[timeframe] = deque(maxlen=rollup.maxlen)
+            self._partial_head[timeframe] = None
+            for candle in self._base:
+                self._roll_new(timeframe, candle)
+        return len(older)
+
+    def _roll_new(self, timeframe: str, candle: list):
+        tf_ms = TIMEFRAME_MS[timeframe]
+        bucket = candle[0] - candle[0] % tf_ms
+        rollup = self._rollups[timeframe]
+        if rollup and rollup[-1][0] == bucket:
+            last = rollup[-1]
+            last[2] = max(last[2], candle[2])
+            last[3] = min(last[3], candle[3])
+            last[4] = candle[4]
+            last[5] += candle[5]
+            return
+        if not rollup and candle[0] != bucket:
+            self._partial_head[timeframe] = bucket
+        rollup.append([bucket, candle[1], candle[2], candle[3], candle[4], candle[5]])
+
+    def _rebuild_last_bucket(self, timeframe: str):
+        rollup = self._rollups[timeframe]
+        if not rollup:
+            return
+        bucket = rollup[-1][0]
+        members = []
+        for candle in reversed(self._base):
+            if candle[0] < bucket:
+                break
+            members.append(candle)
+        members.reverse()
+        rollup[-1] = [
+            bucket,
+            members[0][1],
+            max(c[2] for c in members),
+            min(c[3] for c in members),
+            members[-1][4],
+            sum(c[5] for c in members),
+        ]
+
+
+def fetch_base_candles(client, symbol: str, count: int, since: Optional[int] = None) -> List[list]:
+    """
+    Fetch up to `count` 1m candles from a ccxt client, paging past the
+    per-request limit when a higher timeframe needs a long history.
+
+    Args:
+        client: ccxt exchange instance (e.g. BinanceClient().client).
+        symbol (str): Market symbol such as 'BTC/USDT'.
+        count (int): Number of most recent 1m candles wanted.
+        since (Optional[int]): Only fetch candles from this timestamp (ms) on.
+    Returns:
+        List[list]: OHLCV candles, oldest first.
+    """
+    tf_ms = TIMEFRAME_MS[BASE_TIMEFRAME]
+    if count <= MAX_FETCH_LIMIT and since is None:
+        return client.fetch_ohlcv(symbol, timeframe=BASE_TIMEFRAME, limit=count)
+    if since is None:
+        since = client.milliseconds() - count * tf_ms
+    candles = []
+    while len(candles) < count:
+        batch = client.fetch_ohlcv(
+            symbol, timeframe=BASE_TIMEFRAME, since=since,
+            limit=min(MAX_FETCH_LIMIT, count - len(candles))
+        )
+        if not batch:
+            break
+        candles.extend(batch)
+        if len(batch) < MAX_FETCH_LIMIT:
+            break
+        since = batch[-1][0] + tf_ms
+    return candles[-count:]
+
+
+_aggregators: Dict[str, CandleAggregator] = {}
+_aggregators_lock = threading.Lock()
+
+
+def get_aggregator(symbol: str) -> CandleAggregator:
+    """Return the process-wide aggregator for `symbol`, creating it on first use."""
+    with _aggregators_lock:
+        aggregator = _aggregators.get(symbol)
+        if aggregator is None:
+            aggregator = CandleAggregator(symbol)
+            _aggregators[symbol] = aggregator
+        return aggregator
+
+
+def list_aggregators() -> Dict[str, CandleAggregator]:
+    with _aggregators_lock:
+        return dict(_aggregators)
+
+
+def drop_aggregator(symbol: str):
+    """Forget the stored candles of `symbol` once nothing consumes them anymore."""
+    with _aggregators_lock:
+        _aggregators.pop(symbol, None)
@@ -0,0 +1,128 @@
+"""
+Shape-preserving downsampling of chart series.
+
+`lttb_indices` implements Largest-Triangle-Three-Buckets: the first and
+last points are kept and every bucket in between contributes the point
+that forms the largest triangle with its neighbours, so peaks and troughs
+survive. `downsample_chart` applies the chosen indices to all series of a
+bot chart at once and always keeps the candles that carry trade signals.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+CHART_SERIES = ('timestamps', 'prices', 'short_ma', 'long_ma')
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points LTTB keeps from the series (x, y)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        raise ValueError("LTTB needs at least 3 points")
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    # Bucket boundaries over the points between the first and the last
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    selected = 0
+    for b in range(threshold - 2):
+        start, end = edges[b], edges[b + 1]
+        next_start, next_end = edges[b + 1], (edges[b + 2] if b + 2 < len(edges) else n)
+        # Average of the next bucket (the last point when this is the final bucket)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        ax, ay = x[selected], y[selected]
+        areas = np.abs(
+            (ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay)
+        )
+        selected = start + int(np.argmax(areas))
+        indices[b + 1] = selected
+    return indices
+
+
+def downsample_indices(x, y, max_points: int, keep: Iterable[int] = ()) -> np.ndarray:
+    """LTTB indices plus the indices in `keep`, sorted and unique."""
+    chosen = lttb_indices(x, y, max_points)
+    keep = [i for i in keep if 0 <= i < len(y)]
+    if keep:
+        chosen = np.union1d(chosen, np.asarray(keep, dtype=int))
+    return chosen
+
+
+def downsample_chart(data: dict, max_points: int) -> dict:
+    """
+    Copy of a bot chart (`last_bot_run_data`) reduced to about `max_points`
+    candles. Every series keeps the same candles, so they stay aligned, and
+    signal indexes are remapped to the reduced series.
+    """
+    prices = data.get('prices') or []
+    result = {key: value for key, value in data.items() if key not in CHART_SERIES and key != 'signals'}
+    signals = data.get('signals') or []
+    if len(prices) <= max_points:
+        for key in CHART_SERIES:
+            result[key] = list(data.get(key) or [])
+        result['signals'] = [dict(s) for s in signals]
+        result['downsampled'] = False
+        result['original_count'] = len(prices)
+        return result
+    timestamps = data.get('timestamps') or []
+    x = timestamps if len(timestamps) == len(prices) else range(len(prices))
+    chosen = downsample_indices(x, prices, max_points, keep=(s['index'] for s in signals))
+    for key in CHART_SERIES:
+        series = data.get(key) or []
+        result[key] = [series[i] for i in chosen] if len(series) == len(prices) else list(series)
+    position = {int(index): new for new, index in enumerate(chosen)}
+    result['signals'] = [dict(s, index=position[s['index']]) for s in signals if s['index'] in position]
+    result['downsampled'] = True
+    result['original_count'] = len(prices)
+    return result
+
+
+class ChartViewCache:
+    """
+    Small LRU of downsampled chart views keyed by data version and
+    `max_points` (the zoom level), so repeated polls between two bot
+    updates cost a dictionary lookup.
+    """
+    def __init__(self, size: int = 16):
+        self.size = size
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def version(data: dict) -> Optional[tuple]:
+        """Cheap fingerprint of a chart: changes whenever a candle is added or updated."""
+        prices = data.get('prices') or []
+        timestamps = data.get('timestamps') or []
+        if not prices:
+            return None
+        return (
+            data.get('symbol'), data.get('timeframe'), len(prices),
+            timestamps[0] if timestamps else None, timestamps[-1] if timestamps else None,
+            prices[-1], len(data.get('signals') or []), data.get('volatility'),
+            data.get('live_update'), data.get('no_data'),
+        )
+
+    def get(self, data: dict, max_points: int) -> dict:
+        key = (self.version(data), max_points)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return view
+        view = downsample_chart(data, max_points)
+        with self._lock:
+            self.misses += 1
+            self._views[key] = view
+            while len(self._views) > self.size:
+                self._views.popitem(last=False)
+        return view
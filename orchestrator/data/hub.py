@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from orchestrator.data.candles import (
+    get_aggregator, drop_aggregator, fetch_base_candles, required_base_candles,
+    TIMEFRAME_MS, BASE_TIMEFRAME
+)
+
+# A feed is refreshed at most once per interval no matter how many bots read it.
+# Slightly below the bot loop period so each bot still sees a fresh candle per cycle.
+DEFAULT_MIN_INTERVAL = float(os.getenv('MARKET_DATA_INTERVAL', '9.0'))
+
+
+class Subscription:
+    """
+    A bot's handle on a (symbol, timeframe) feed of a MarketDataHub.
+    Close it (or use it as a context manager) to release the reference.
+    """
+    def __init__(self, hub, symbol: str, timeframe: str, limit: int,
+                 callback: Optional[Callable[[str, str, List[list]], None]] = None):
+        self.hub = hub
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.limit = limit
+        self.callback = callback
+        self.closed = False
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.symbol, self.timeframe)
+
+    def fetch(self, limit: Optional[int] = None) -> List[list]:
+        """Refresh the shared feed if it is stale and return the newest candles."""
+        if self.closed:
+            raise RuntimeError(f"Subscription to {self.symbol} {self.timeframe} is closed")
+        self.hub.refresh(self.symbol)
+        return get_aggregator(self.symbol).get(self.timeframe, limit or self.limit)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MarketDataHub:
+    """
+    Publish/subscribe market data keyed by (symbol, timeframe).
+
+    Every symbol is fetched once per refresh as 1m candles from a single
+    shared exchange client, rolled up by the symbol's CandleAggregator and
+    fanned out to all subscribers, so upstream load grows with the number
+    of distinct symbols rather than the number of bots.
+    """
+    def __init__(self, client_factory: Optional[Callable] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 clock: Callable[[], float] = time.time):
+        self._client_factory = client_factory
+        self._client = None
+        self.min_interval = min_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[Tuple[str, str], List[Subscription]] = {}
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._last_refresh: Dict[str, float] = {}
+        self._history: Dict[str, int] = {}
+        self._backfilled: Dict[str, int] = {}
+        self._fetch_counts: Dict[str, int] = {}
+
+    @property
+    def client(self):
+        """ccxt client shared by all feeds, created on first use."""
+        with self._lock:
+            if self._client is None:
+                if self._client_factory is None:
+                    from orchestrator.exchange.binance import BinanceClient
+                    self._client = BinanceClient().client
+                else:
+                    self._client = self._client_factory()
+            return self._client
+
+    def subscribe(self, symbol: str, timeframe: str = BASE_TIMEFRAME, limit: int = 100,
+                  callback: Optional[Callable[[str, str, List[list]], None]] = None) -> Subscription:
+        """
+        Subscribe to candles of `symbol` on `timeframe`.
+
+        Args:
+            symbol (str): Market symbol such as 'BTC/USDT'.
+            timeframe (str): Candle timeframe, rolled up from 1m.
+            limit (int): Number of candles the subscriber needs.
+            callback: Optional fn(symbol, timeframe, candles) called on every refresh.
+        Returns:
+            Subscription: Handle used to read candles and to unsubscribe.
+        """
+        if timeframe not in TIMEFRAME_MS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        subscription = Subscription(self, symbol, timeframe, limit, callback)
+        aggregator = get_aggregator(symbol)
+        aggregator.add_timeframe(timeframe)
+        needed = required_base_candles(timeframe, limit)
+        aggregator.ensure_capacity(needed)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.key, []).append(subscription)
+            self._symbol_locks.setdefault(symbol, threading.Lock())
+            self._history[symbol] = max(self._history.get(symbol, 0), needed)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Drop a reference; the symbol's feed is released with its last subscriber."""
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.key, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscriptions.pop(subscription.key, None)
+            if self._symbol_refcount(subscription.symbol) == 0:
+                self._symbol_locks.pop(subscription.symbol, None)
+                self._last_refresh.pop(subscription.symbol, None)
+                self._history.pop(subscription.symbol, None)
+                self._backfilled.pop(subscription.symbol, None)
+                drop_aggregator(subscription.symbol)
+
+    def refcount(self, symbol: str, timeframe: Optional[str] = None) -> int:
+        with self._lock:
+            if timeframe is not None:
+                return len(self._subscriptions.get((symbol, timeframe), []))
+            return self._symbol_refcount(symbol)
+
+    def _symbol_refcount(self, symbol: str) -> int:
+        return sum(len(subs) for (sym, _), subs in self._subscriptions.items() if sym == symbol)
+
+    def refresh(self, symbol: str, force: bool = False) -> bool:
+        """
+        Fetch new 1m candles for `symbol` unless the feed was refreshed less
+        than `min_interval` seconds ago, page in older ones if a subscriber
+        that joined late needs more history, then publish to all subscribers.
+
+        Returns:
+            bool: True if the exchange was queried.
+        """
+        with self._lock:
+            symbol_lock = self._symbol_locks.get(symbol)
+        if symbol_lock is None:
+            raise ValueError(f"No subscribers for {symbol}")
+
+        with symbol_lock:
+            now = self.clock()
+            last = self._last_refresh.get(symbol)
+            stale = force or last is None or now - last >= self.min_interval
+            if stale:
+                self._fetch(symbol)
+                self._last_refresh[symbol] = now
+            if not (self._backfill(symbol) or stale):
+                return False
+            self._fetch_counts[symbol] = self._fetch_counts.get(symbol, 0) + 1
+
+        self._publish(symbol)
+        return True
+
+    def _fetch(self, symbol: str):
+        aggregator = get_aggregator(symbol)
+        needed = self._history.get(symbol, required_base_candles(BASE_TIMEFRAME, 100))
+        client = self.client
+        last_ts = aggregator.last_timestamp()
+        if last_ts is None:
+            base = fetch_base_candles(client, symbol, needed)
+        else:
+            # Only ask for what is new since the newest stored (possibly in-progress) candle
+            missing = (client.milliseconds() - last_ts) // TIMEFRAME_MS[BASE_TIMEFRAME] + 1
+            if missing >= needed:
+                base = fetch_base_candles(client, symbol, needed)
+            else:
+                base = fetch_base_candles(client, symbol, max(int(missing), 2), since=last_ts)
+        aggregator.update(base or [])
+
+    def _backfill(self, symbol: str) -> bool:
+        """Page in the 1m candles just before the oldest stored one that the history falls short of."""
+        needed = self._history.get(symbol, 0)
+        aggregator = get_aggregator(symbol)
+        first_ts = aggregator.first_timestamp()
+        shortfall = needed - len(aggregator)
+        # Asked once per history size, so a young market is not re-queried every refresh
+        if first_ts is None or shortfall <= 0 or self._backfilled.get(symbol, 0) >= needed:
+            return False
+        self._backfilled[symbol] = needed
+        since = first_ts - shortfall * TIMEFRAME_MS[BASE_TIMEFRAME]
+        aggregator.update(fetch_base_candles(self.client, symbol, shortfall, since=since) or [])
+        return True
+
+    def _publish(self, symbol: str):
+        with self._lock:
+            subscribers = [
+                sub for (sym, _), subs in self._subscriptions.items() if sym == symbol
+                for sub in subs if sub.callback is not None
+            ]
+        aggregator = get_aggregator(symbol)
+        for subscription in subscribers:
+            try:
+                subscription.callback(
+                    symbol, subscription.timeframe,
+                    aggregator.get(subscription.timeframe, subscription.limit)
+                )
+            except Exception as e:
+                print(f"Market data subscriber for {symbol} failed: {e}")
+
+    def stats(self) -> dict:
+        """Subscription counts and fetch counters per feed, for the status endpoint."""
+        with self._lock:
+            feeds = {}
+            for (symbol, timeframe), subs in self._subscriptions.items():
+                feed = feeds.setdefault(symbol, {
+                    'subscribers': {},
+                    'fetches': self._fetch_counts.get(symbol, 0),
+                    'last_refresh': self._last_refresh.get(symbol),
+                })
+                feed['subscribers'][timeframe] = len(subs)
+            return feeds
+
+
+# Process-wide hub shared by every TradingBot
+market_data_hub = MarketDataHub()
@@ -0,0 +1,319 @@
+"""
+Indicator kernels over (symbols x time) matrices.
+
+Each function evaluates an indicator for every row of a 2-D float array in
+one NumPy call, so hundreds of symbols cost about as much Python overhead
+as one. Rows are right-aligned (newest value in the last column); shorter
+series are left-padded with NaN by `as_matrix`, and outputs are NaN where
+a window does not fit.
+
+IndicatorBatcher groups the requests of all bots that evaluate in the same
+tick into one such call.
+"""
+
+import argparse
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def as_matrix(series: Sequence[Sequence[float]], length: Optional[int] = None) -> np.ndarray:
+    """Stack price series into a right-aligned, NaN-padded (symbols x length) array."""
+    lengths = {len(s) for s in series}
+    length = length or max(lengths, default=0)
+    if lengths == {length}:
+        # Common case: equal lengths convert in a single call
+        return np.array(series, dtype=float).reshape(len(series), length)
+    matrix = np.full((len(series), length), np.nan)
+    for i, values in enumerate(series):
+        values = values[-length:] if length else []
+        if len(values):
+            matrix[i, length - len(values):] = values
+    return matrix
+
+
+def _window_sums(matrix: np.ndarray, window: int):
+    """Sums and counts of finite values over every trailing window, via cumulative sums."""
+    valid = np.isfinite(matrix)
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+    if valid.all():
+        # No padding: every window is full
+        np.cumsum(matrix, axis=1, out=padded[:, 1:])
+        return padded[:, window:] - padded[:, :-window], window
+    counts = np.zeros_like(padded)
+    np.cumsum(np.where(valid, matrix, 0.0), axis=1, out=padded[:, 1:])
+    np.cumsum(valid, axis=1, out=counts[:, 1:])
+    return padded[:, window:] - padded[:, :-window], counts[:, window:] - counts[:, :-window]
+
+
+def sma(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average along time; NaN until a full window of values exists."""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    out = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] < window:
+        return out
+    sums, counts = _window_sums(matrix, window)
+    if np.isscalar(counts):
+        out[:, window - 1:] = sums / window
+        return out
+    with np.errstate(invalid='ignore'):
+        out[:, window - 1:] = np.where(counts == window, sums / window, np.nan)
+    return out
+
+
+def ema(matrix: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average with alpha = 2 / (span + 1), seeded with each
+    row's first value. Recursive in time, vectorized across symbols.
+    """
+    if span < 1:
+        raise ValueError("span must be at least 1")
+    alpha = 2.0 / (span + 1)
+    out = np.full(matrix.shape, np.nan)
+    current = np.full(matrix.shape[0], np.nan)
+    for t in range(matrix.shape[1]):
+        column = matrix[:, t]
+        valid = np.isfinite(column)
+        seeded = np.isfinite(current)
+        current = np.where(valid & seeded, alpha * column + (1 - alpha) * current, current)
+        current = np.where(valid & ~seeded, column, current)
+        out[:, t] = current
+    return out
+
+
+def log_returns(matrix: np.ndarray) -> np.ndarray:
+    """Log returns along time; one column shorter than the input."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.diff(np.log(matrix), axis=1)
+
+
+def volatility(matrix: np.ndarray, window: int = 20) -> np.ndarray:
+    """
+    Standard deviation of the last `window` log returns of every row, the
+    same measure as `calculate_volatility`. NaN for rows that are too short.
+    """
+    if matrix.shape[1] < window + 1:
+        return np.full(matrix.shape[0], np.nan)
+    returns = log_returns(matrix[:, -(window + 1):])
+    return returns.std(axis=1)
+
+
+def rolling_volatility(matrix: np.ndarray, window: int = 20) -> np.ndarray:
+    """Volatility (as above) at every candle, from cumulative sums of returns and squares."""
+    returns = log_returns(matrix)
+    out = np.full(matrix.shape, np.nan)
+    if returns.shape[1] < window:
+        return out
+    sums, counts = _window_sums(returns, window)
+    squares, _ = _window_sums(returns * returns, window)
+    with np.errstate(invalid='ignore'):
+        mean = sums / window
+        variance = np.maximum(squares / window - mean * mean, 0.0)
+        out[:, window:] = np.where(np.asarray(counts) == window, np.sqrt(variance), np.nan)
+    return out
+
+
+def crossovers(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """
+    +1 where `fast` crosses above `slow` (was <=, now >), -1 where it
+    crosses below (was >=, now <), 0 elsewhere. Column 0 is always 0.
+    """
+    out = np.zeros(fast.shape, dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        prev_fast, prev_slow = fast[:, :-1], slow[:, :-1]
+        now_fast, now_slow = fast[:, 1:], slow[:, 1:]
+        out[:, 1:][(prev_fast <= prev_slow) & (now_fast > now_slow)] = 1
+        out[:, 1:][(prev_fast >= prev_slow) & (now_fast < now_slow)] = -1
+    return out
+
+
+def ma_crossover(series: Sequence[Sequence[float]], short_window: int, long_window: int,
+                 vol_window: int) -> List[dict]:
+    """
+    Everything the moving-average bot needs, for many price series at once:
+    both SMAs, their crossovers and the latest volatility, per series and
+    trimmed to that series' own length.
+    """
+    matrix = as_matrix(series)
+    short_ma = sma(matrix, short_window)
+    long_ma = sma(matrix, long_window)
+    crosses = crossovers(short_ma, long_ma)
+    vols = volatility(matrix, vol_window)
+    results = []
+    for i, values in enumerate(series):
+        start = matrix.shape[1] - len(values)
+        results.append({
+            'short_ma': short_ma[i, start:],
+            'long_ma': long_ma[i, start:],
+            'crossovers': crosses[i, start:],
+            'volatility': float(vols[i]),
+        })
+    return results
+
+
+class _Request:
+    __slots__ = ('prices', 'key', 'result', 'error', 'done')
+
+    def __init__(self, prices, key):
+        self.prices = prices
+        self.key = key
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class Participant:
+    """A registered bot; `due` while it is awake and has not submitted this tick."""
+    __slots__ = ('due',)
+
+    def __init__(self):
+        self.due = True
+
+
+class IndicatorBatcher:
+    """
+    Batches indicator requests from bots that evaluate in the same tick.
+
+    Bots `register()` while running and wrap their sleep between cycles in
+    `idle()`, so only bots that are awake and have not submitted yet count
+    as due. The first bot to call `ma_crossover()` leads the batch: it waits
+    up to `max_wait` seconds while other bots are due, then evaluates all
+    requests with the same windows in one matrix pass and hands every bot
+    its row. With no other bot due it is evaluated immediately, so sleeping
+    bots (and lone bots under a virtual clock) never cost a wait.
+    """
+    def __init__(self, max_wait: float = 0.05):
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pending: List[_Request] = []
+        self._participants = 0
+        self._due = 0
+        self._leading = False
+        self.batches = 0
+        self.requests = 0
+
+    def register(self) -> Participant:
+        participant = Participant()
+        with self._cond:
+            self._participants += 1
+            self._due += 1
+        return participant
+
+    def _settle(self, participant: Optional[Participant]):
+        # Called with the lock held: the participant is no longer awaited this tick
+        if participant is not None and participant.due:
+            participant.due = False
+            self._due -= 1
+            self._cond.notify_all()
+
+    def unregister(self, participant: Participant):
+        with self._cond:
+            self._settle(participant)
+            self._participants = max(0, self._participants - 1)
+
+    @contextmanager
+    def idle(self, participant: Participant):
+        """Block during which the participant sleeps; batches do not wait for it."""
+        with self._cond:
+            self._settle(participant)
+        try:
+            yield
+        finally:
+            with self._cond:
+                if not participant.due:
+                    participant.due = True
+                    self._due += 1
+
+    def ma_crossover(self, prices: Sequence[float], short_window: int, long_window: int,
+                     vol_window: int, participant: Optional[Participant] = None) -> dict:
+        request = _Request(prices, (short_window, long_window, vol_window))
+        with self._cond:
+            self._pending.append(request)
+            self._settle(participant)
+            self._cond.notify_all()
+            leader = not self._leading
+            if leader:
+                self._leading = True
+                deadline = time.monotonic() + self.max_wait
+                while self._due > 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._leading = False
+                self.batches += 1
+                self.requests += len(batch)
+        if leader:
+            self._run(batch)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self, batch: List[_Request]):
+        groups: Dict[tuple, List[_Request]] = {}
+        for request in batch:
+            groups.setdefault(request.key, []).append(request)
+        for key, requests in groups.items():
+            try:
+                results = ma_crossover([r.prices for r in requests], *key)
+                for request, result in zip(requests, results):
+                    request.result = result
+            except Exception as e:
+                for request in requests:
+                    request.error = e
+            finally:
+                for request in requests:
+                    request.done.set()
+
+    def stats(self) -> dict:
+        return {
+            'participants': self._participants,
+            'due': self._due,
+            'batches': self.batches,
+            'requests': self.requests,
+            'avg_batch_size': round(self.requests / self.batches, 2) if self.batches else 0,
+        }
+
+
+# Shared by every bot in the process
+indicator_batcher = IndicatorBatcher()
+
+
+def benchmark(symbols: int = 500, length: int = 100, short_window: int = 5,
+              long_window: int = 20, vol_window: int = 20) -> dict:
+    """Per-symbol convolve/mean/std loop versus one matrix pass."""
+    from orchestrator.data.volatility import calculate_volatility
+
+    rng = np.random.default_rng(0)
+    series = [list(100 * np.exp(np.cumsum(rng.normal(0, 0.001, length)))) for _ in range(symbols)]
+
+    started = time.perf_counter()
+    for prices in series:
+        np.convolve(prices, np.ones(short_window) / short_window, mode='valid')
+        np.convolve(prices, np.ones(long_window) / long_window, mode='valid')
+        calculate_volatility(prices, window=vol_window)
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ma_crossover(series, short_window, long_window, vol_window)
+    batched = time.perf_counter() - started
+    return {
+        'symbols': symbols,
+        'per_symbol_ms': round(loop * 1000, 3),
+        'batched_ms': round(batched * 1000, 3),
+        'speedup': round(loop / batched, 1),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare per-symbol and batched indicator evaluation.")
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--length', type=int, default=100)
+    options = parser.parse_args()
+    print(benchmark(options.symbols, options.length))
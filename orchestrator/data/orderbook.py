@@ -0,0 +1,285 @@
+"""
+Local L2 order books.
+
+An OrderBook is built from a REST snapshot and kept current with depth
+diffs (Binance semantics: each level carries the new total amount at that
+price, 0 removes it; `first_id` / `final_id` must continue the last applied
+update id, otherwise the book is out of sync and needs a new snapshot).
+Each side is a pair of preallocated numpy arrays sorted best-first, so a
+level update is a binary search plus a short memmove, and mid, spread and
+the VWAP of filling a size are computed on the arrays directly.
+
+`order_books` is the process-wide cache used for demo fills and the
+pre-trade slippage check.
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# Levels kept per side; updates beyond the worst kept level are dropped
+DEFAULT_DEPTH = 1000
+
+
+class OrderBookGapError(Exception):
+    """Raised when a depth diff does not continue the book's update sequence."""
+
+
+class _Side:
+    """Price levels of one side, best first. Bids are keyed by -price so both sides sort ascending."""
+    __slots__ = ('sign', 'capacity', 'keys', 'amounts', 'count')
+
+    def __init__(self, sign: int, capacity: int):
+        self.sign = sign
+        self.capacity = capacity
+        self.keys = np.empty(capacity)
+        self.amounts = np.empty(capacity)
+        self.count = 0
+
+    def load(self, levels: Iterable):
+        levels = [(float(p), float(a)) for p, a, *_ in levels if float(a) > 0]
+        levels.sort(key=lambda level: self.sign * level[0])
+        levels = levels[:self.capacity]
+        self.count = len(levels)
+        if levels:
+            arr = np.asarray(levels)
+            self.keys[:self.count] = self.sign * arr[:, 0]
+            self.amounts[:self.count] = arr[:, 1]
+
+    def set(self, price: float, amount: float):
+        key = self.sign * price
+        n = self.count
+        i = int(np.searchsorted(self.keys[:n], key))
+        if i < n and self.keys[i] == key:
+            if amount > 0:
+                self.amounts[i] = amount
+            else:
+                self.keys[i:n - 1] = self.keys[i + 1:n]
+                self.amounts[i:n - 1] = self.amounts[i + 1:n]
+                self.count = n - 1
+        elif amount > 0 and i < self.capacity:
+            if n == self.capacity:
+                n -= 1  # the worst level falls off
+            self.keys[i + 1:n + 1] = self.keys[i:n]
+            self.amounts[i + 1:n + 1] = self.amounts[i:n]
+            self.keys[i] = key
+            self.amounts[i] = amount
+            self.count = n + 1
+
+    def best(self) -> Optional[float]:
+        return self.sign * self.keys[0] if self.count else None
+
+    def levels(self, depth: Optional[int] = None) -> list:
+        n = self.count if depth is None else min(depth, self.count)
+        return [[float(self.sign * k), float(a)] for k, a in zip(self.keys[:n], self.amounts[:n])]
+
+    def vwap(self, amount: float) -> Tuple[Optional[float], float]:
+        """Average price of taking `amount` from this side, and how much of it the book can fill."""
+        n = self.count
+        if n == 0 or amount <= 0:
+            return None, 0.0
+        amounts = self.amounts[:n]
+        cumulative = np.cumsum(amounts)
+        # Levels consumed in full, plus the one partially consumed
+        k = int(np.searchsorted(cumulative, amount))
+        if k >= n:
+            filled = float(cumulative[-1])
+            notional = float(np.dot(self.keys[:n], amounts))
+        else:
+            filled = amount
+            before = float(cumulative[k - 1]) if k else 0.0
+            notional = float(np.dot(self.keys[:k], amounts[:k])) + (amount - before) * self.keys[k]
+        return self.sign * notional / filled, filled
+
+
+class OrderBook:
+    """L2 order book of one symbol."""
+    def __init__(self, symbol: str, depth: int = DEFAULT_DEPTH, clock=time.time):
+        self.symbol = symbol
+        self.clock = clock
+        self.bids = _Side(-1, depth)
+        self.asks = _Side(1, depth)
+        self.update_id = None
+        self.synced = False
+        self.updated_at = None
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, bids: Iterable, asks: Iterable, update_id: Optional[int] = None):
+        """Replace the book with a full snapshot (ccxt `fetch_order_book` levels)."""
+        with self._lock:
+            self.bids.load(bids)
+            self.asks.load(asks)
+            self.update_id = update_id
+            self.synced = True
+            self.updated_at = self.clock()
+
+    def apply_diff(self, bids: Iterable, asks: Iterable, first_id: Optional[int] = None,
+                   final_id: Optional[int] = None) -> bool:
+        """
+        Apply a depth diff. Diffs already covered by the book are ignored
+        (returns False).
+
+        Raises:
+            OrderBookGapError: If updates between the book and the diff are
+                missing; the book stays unsynced until the next snapshot.
+        """
+        with self._lock:
+            if not self.synced:
+                raise OrderBookGapError(f"{self.symbol} book needs a snapshot first")
+            if final_id is not None and self.update_id is not None:
+                if final_id <= self.update_id:
+                    return False
+                if first_id is not None and first_id > self.update_id + 1:
+                    self.synced = False
+                    raise OrderBookGapError(
+                        f"{self.symbol}: missed updates {self.update_id + 1}..{first_id - 1}"
+                    )
+            for price, amount, *_ in bids:
+                self.bids.set(float(price), float(amount))
+            for price, amount, *_ in asks:
+                self.asks.set(float(price), float(amount))
+            if final_id is not None:
+                self.update_id = final_id
+            self.updated_at = self.clock()
+            self.updates += 1
+            return True
+
+    def age(self) -> Optional[float]:
+        return None if self.updated_at is None else self.clock() - self.updated_at
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best()
+
+    def mid(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+
+    def spread(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        return ask - bid if bid is not None and ask is not None else None
+
+    def vwap(self, side: str, amount: float) -> Tuple[Optional[float], float]:
+        """
+        Average fill price of a market order of `amount` on `side` ('buy'
+        takes asks, 'sell' takes bids) and the amount the book can fill.
+        """
+        with self._lock:
+            return (self.asks if side == 'buy' else self.bids).vwap(amount)
+
+    def slippage_bps(self, side: str, amount: float) -> Optional[float]:
+        """
+        Expected cost of a market order against the mid in basis points
+        (positive = worse than mid). Infinite if the book cannot fill it,
+        None if there is no two-sided book.
+        """
+        mid = self.mid()
+        price, filled = self.vwap(side, amount)
+        if mid is None or price is None:
+            return None
+        if filled < amount:
+            return float('inf')
+        sign = 1 if side == 'buy' else -1
+        return sign * (price - mid) / mid * 1e4
+
+    def snapshot(self, depth: int = 20) -> dict:
+        with self._lock:
+            return {
+                'symbol': self.symbol, 'bids': self.bids.levels(depth), 'asks': self.asks.levels(depth),
+                'update_id': self.update_id, 'synced': self.synced, 'updates': self.updates,
+                'age': None if self.updated_at is None else round(self.clock() - self.updated_at, 3),
+            }
+
+
+class OrderBookCache:
+    """
+    Order books by symbol. `refresh()` reloads a book from a REST snapshot
+    when it is older than `max_age` seconds or out of sync.
+    """
+    def __init__(self, depth: int = DEFAULT_DEPTH, max_age: float = 2.0, snapshot_limit: int = 100,
+                 clock=time.time):
+        self.depth = depth
+        self.max_age = max_age
+        self.snapshot_limit = snapshot_limit
+        self.clock = clock
+        self._books: Dict[str, OrderBook] = {}
+        self._lock = threading.Lock()
+        self.snapshots = 0
+
+    def get(self, symbol: str) -> OrderBook:
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None:
+                book = self._books[symbol] = OrderBook(symbol, self.depth, clock=self.clock)
+            return book
+
+    def refresh(self, symbol: str, client) -> Optional[OrderBook]:
+        """
+        The book of `symbol`, fetched with `client.fetch_order_book` if it
+        is stale. None if the client has no order books or the fetch failed.
+        """
+        book = self.get(symbol)
+        age = book.age()
+        if book.synced and age is not None and age < self.max_age:
+            return book
+        if not hasattr(client, 'fetch_order_book'):
+            return None
+        try:
+            data = client.fetch_order_book(symbol, self.snapshot_limit)
+        except Exception:
+            return None
+        book.apply_snapshot(data.get('bids') or [], data.get('asks') or [], data.get('nonce'))
+        self.snapshots += 1
+        return book
+
+    def symbols(self) -> list:
+        with self._lock:
+            return sorted(self._books)
+
+
+order_books = OrderBookCache(max_age=float(os.getenv('ORDER_BOOK_MAX_AGE', '2')))
+
+
+def benchmark(updates: int = 200_000, levels: int = 1000, seed: int = 0) -> dict:
+    """Apply `updates` random single-level diffs to a `levels`-deep book and time them and the queries."""
+    rng = np.random.default_rng(seed)
+    book = OrderBook('BENCH/USDT', depth=levels)
+    ticks = np.arange(1, levels + 1) * 0.01
+    book.apply_snapshot([[100 - t, 1.0] for t in ticks], [[100 + t, 1.0] for t in ticks], update_id=0)
+    prices = np.round(100 + rng.choice([-1, 1], updates) * rng.integers(1, levels, updates) * 0.01, 2)
+    amounts = np.where(rng.random(updates) < 0.2, 0.0, rng.random(updates) * 2)
+    started = time.perf_counter()
+    for i in range(updates):
+        level = [[prices[i], amounts[i]]]
+        if prices[i] < 100:
+            book.apply_diff(level, (), i + 1, i + 1)
+        else:
+            book.apply_diff((), level, i + 1, i + 1)
+    update_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(10_000):
+        book.slippage_bps('buy', 50.0)
+    return {
+        'updates_per_second': round(updates / update_seconds),
+        'slippage_query_us': round((time.perf_counter() - started) / 10_000 * 1e6, 2),
+        'levels': (book.bids.count, book.asks.count),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time order book updates and VWAP queries.")
+    parser.add_argument('--updates', type=int, default=200_000)
+    parser.add_argument('--levels', type=int, default=1000)
+    options = parser.parse_args()
+    print(benchmark(options.updates, options.levels))
@@ -0,0 +1,178 @@
+"""
+Cross-symbol screener.
+
+Pulls candles for every market of a quote currency, stacks the closes and
+volumes into (symbols x time) arrays and computes volatility, moving-average
+spread, momentum and volume metrics for all symbols in one vectorized pass.
+The ranked result is meant to pick which symbols bots should trade.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from orchestrator.data import indicators
+from orchestrator.data.candles import TIMEFRAME_MS
+
+# Parallel candle requests; ccxt's rate limiter still spaces them out
+SCREENER_WORKERS = int(os.getenv('SCREENER_WORKERS', '8'))
+# Screens are cached this long; a new one costs one request per symbol
+SCREENER_TTL = float(os.getenv('SCREENER_TTL', '60'))
+
+SORT_KEYS = ('volatility', 'ma_spread', 'momentum', 'quote_volume', 'volume_ratio')
+
+
+def list_universe(client, quote: str = 'USDT', max_symbols: Optional[int] = None) -> List[str]:
+    """
+    Active spot markets quoted in `quote`, most traded first when tickers
+    are available (one request for all symbols), limited to `max_symbols`.
+    """
+    markets = getattr(client, 'markets', None) or client.load_markets()
+    symbols = [
+        symbol for symbol, market in markets.items()
+        if market.get('quote') == quote and market.get('active', True) is not False
+        and market.get('spot', True) and ':' not in symbol
+    ]
+    try:
+        tickers = client.fetch_tickers()
+        symbols.sort(key=lambda s: -((tickers.get(s) or {}).get('quoteVolume') or 0))
+    except Exception as e:
+        print(f"Screener could not rank by ticker volume: {e}")
+        symbols.sort()
+    return symbols[:max_symbols] if max_symbols else symbols
+
+
+def fetch_universe_candles(client, symbols: List[str], timeframe: str = '1h', limit: int = 100,
+                           workers: int = SCREENER_WORKERS) -> Dict[str, list]:
+    """Fetch `limit` candles for every symbol concurrently; failures are skipped."""
+    def fetch(symbol):
+        try:
+            return symbol, client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        except Exception as e:
+            print(f"Screener failed to fetch {symbol}: {e}")
+            return symbol, None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(fetch, symbols)
+    return {symbol: candles for symbol, candles in results if candles}
+
+
+def stack_candles(candles_by_symbol: Dict[str, list], length: int) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Stack candles into aligned (symbols x length) close and volume arrays.
+
+    Symbols with fewer than `length` candles, or whose newest candle is not
+    the most common newest timestamp (stale or halted markets), are dropped.
+    """
+    candidates = {s: c for s, c in candles_by_symbol.items() if len(c) >= length}
+    if not candidates:
+        return [], np.empty((0, length)), np.empty((0, length))
+    last = [c[-1][0] for c in candidates.values()]
+    values, counts = np.unique(last, return_counts=True)
+    newest = values[np.argmax(counts)]
+    symbols = [s for s, c in candidates.items() if c[-1][0] == newest]
+    data = np.array([candidates[s][-length:] for s in symbols], dtype=float)
+    return symbols, data[:, :, 4], data[:, :, 5]
+
+
+def compute_metrics(closes: np.ndarray, volumes: np.ndarray, vol_window: int = 20,
+                    short_window: int = 5, long_window: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Per-symbol metrics over a (symbols x time) matrix, all vectorized:
+
+    - volatility: std of the last `vol_window` log returns
+    - ma_spread: (short SMA - long SMA) / long SMA at the last candle
+    - momentum: return over the last `long_window` candles
+    - quote_volume: mean traded quote volume per candle over `long_window`
+    - volume_ratio: last candle's volume over that mean
+    """
+    short_ma = indicators.sma(closes[:, -short_window:], short_window)[:, -1]
+    long_ma = indicators.sma(closes[:, -long_window:], long_window)[:, -1]
+    quote_volume = (closes[:, -long_window:] * volumes[:, -long_window:]).mean(axis=1)
+    mean_volume = volumes[:, -long_window:].mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = np.where(mean_volume > 0, volumes[:, -1] / mean_volume, 0.0)
+    return {
+        'volatility': indicators.volatility(closes, vol_window),
+        'ma_spread': (short_ma - long_ma) / long_ma,
+        'momentum': closes[:, -1] / closes[:, -long_window - 1] - 1,
+        'quote_volume': quote_volume,
+        'volume_ratio': volume_ratio,
+        'last_price': closes[:, -1],
+    }
+
+
+def rank(symbols: List[str], metrics: Dict[str, np.ndarray], sort_by: str = 'volatility',
+         min_volatility: Optional[float] = None, top: Optional[int] = None) -> List[dict]:
+    """Symbols ordered by `sort_by` (descending), filtered by minimum volatility."""
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key {sort_by}; use one of {', '.join(SORT_KEYS)}")
+    mask = np.isfinite(metrics[sort_by])
+    if min_volatility is not None:
+        mask &= metrics['volatility'] >= min_volatility
+    indexes = np.flatnonzero(mask)
+    order = indexes[np.argsort(-metrics[sort_by][indexes], kind='stable')]
+    if top:
+        order = order[:top]
+    return [
+        dict({'symbol': symbols[i]}, **{name: float(values[i]) for name, values in metrics.items()})
+        for i in order
+    ]
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def screen(client=None, quote: str = 'USDT', timeframe: str = '1h', max_symbols: Optional[int] = 50,
+           top: Optional[int] = 20, sort_by: str = 'volatility', min_volatility: Optional[float] = None,
+           vol_window: int = 20, short_window: int = 5, long_window: int = 20,
+           ttl: float = SCREENER_TTL) -> dict:
+    """
+    Screen the `quote` universe and return the ranked symbols with timings.
+
+    Candles for a given universe / timeframe are reused for `ttl` seconds,
+    so re-ranking by another metric does not refetch anything.
+    """
+    if timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    if client is None:
+        from orchestrator.data.hub import market_data_hub
+        client = market_data_hub.client
+    length = max(vol_window, long_window) + 1
+    key = (id(client), quote, timeframe, max_symbols, length)
+    started = time.perf_counter()
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and time.time() - cached['fetched_at'] < ttl:
+        symbols, closes, volumes, fetched_at = cached['symbols'], cached['closes'], cached['volumes'], cached['fetched_at']
+        fetch_seconds = 0.0
+    else:
+        universe = list_universe(client, quote, max_symbols)
+        candles = fetch_universe_candles(client, universe, timeframe, limit=length)
+        symbols, closes, volumes = stack_candles(candles, length)
+        fetched_at = time.time()
+        with _cache_lock:
+            _cache[key] = {'symbols': symbols, 'closes': closes, 'volumes': volumes, 'fetched_at': fetched_at}
+        fetch_seconds = time.perf_counter() - started
+
+    compute_started = time.perf_counter()
+    results = []
+    if symbols:
+        metrics = compute_metrics(closes, volumes, vol_window, short_window, long_window)
+        results = rank(symbols, metrics, sort_by, min_volatility, top)
+    compute_seconds = time.perf_counter() - compute_started
+    return {
+        'quote': quote,
+        'timeframe': timeframe,
+        'sort_by': sort_by,
+        'screened': len(symbols),
+        'fetched_at': fetched_at,
+        'fetch_seconds': round(fetch_seconds, 3),
+        'compute_ms': round(compute_seconds * 1000, 3),
+        'results': results,
+    }
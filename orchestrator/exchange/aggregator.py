@@ -0,0 +1,174 @@
+"""
+Best-price aggregation across venues.
+
+PriceAggregator asks every connector for a ticker or an order book at the
+same time on a shared thread pool, so one aggregation takes as long as the
+slowest venue (bounded by `timeout`) rather than the sum of all of them.
+Venues that fail or time out are reported and left out of the result.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Latency samples kept per venue for the stats
+LATENCY_SAMPLES = 200
+
+
+class PriceAggregator:
+    """
+    Args:
+        connectors (dict): Venue name -> ExchangeConnector (anything with
+            fetch_ticker / fetch_order_book).
+        timeout (float): Seconds to wait for the slowest venue.
+    """
+    def __init__(self, connectors: Dict[str, object], timeout: float = 5.0,
+                 max_workers: Optional[int] = None):
+        self.connectors = dict(connectors)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or max(4, 2 * len(self.connectors)),
+            thread_name_prefix="price-aggregator",
+        )
+        self._latencies = {name: deque(maxlen=LATENCY_SAMPLES) for name in self.connectors}
+        self._errors = {name: 0 for name in self.connectors}
+        self._lock = threading.Lock()
+
+    def _timed(self, name: str, method: str, *args):
+        started = time.perf_counter()
+        result = getattr(self.connectors[name], method)(*args)
+        return result, (time.perf_counter() - started) * 1000
+
+    def _gather(self, method: str, *args) -> Dict[str, dict]:
+        """Run `method` on every venue in parallel; {venue: {'result'|'error', 'latency_ms'}}."""
+        futures = {self._pool.submit(self._timed, name, method, *args): name for name in self.connectors}
+        done, _ = wait(futures, timeout=self.timeout)
+        outcomes = {}
+        for future, name in futures.items():
+            if future not in done:
+                future.cancel()
+                outcomes[name] = {'error': f"timed out after {self.timeout}s", 'latency_ms': None}
+                continue
+            try:
+                result, latency = future.result()
+                outcomes[name] = {'result': result, 'latency_ms': round(latency, 3)}
+            except Exception as e:
+                outcomes[name] = {'error': str(e) or type(e).__name__, 'latency_ms': None}
+        with self._lock:
+            for name, outcome in outcomes.items():
+                if 'error' in outcome:
+                    self._errors[name] += 1
+                else:
+                    self._latencies[name].append(outcome['latency_ms'])
+        return outcomes
+
+    def best_price(self, symbol: str) -> dict:
+        """
+        Highest bid and lowest ask of `symbol` across venues, from tickers.
+
+        Returns:
+            dict: `bid` / `ask` as {'venue', 'price'} (None if no venue
+            quoted one), `mid`, `spread`, per-venue quotes or errors and
+            the wall-clock `latency_ms` of the whole aggregation.
+        """
+        started = time.perf_counter()
+        outcomes = self._gather('fetch_ticker', symbol)
+        venues, bid, ask = {}, None, None
+        for name, outcome in outcomes.items():
+            if 'error' in outcome:
+                venues[name] = outcome
+                continue
+            ticker = outcome['result'] or {}
+            quote = {key: ticker.get(key) for key in ('bid', 'ask', 'last')}
+            venues[name] = dict(quote, latency_ms=outcome['latency_ms'])
+            if quote['bid'] and (bid is None or quote['bid'] > bid['price']):
+                bid = {'venue': name, 'price': quote['bid']}
+            if quote['ask'] and (ask is None or quote['ask'] < ask['price']):
+                ask = {'venue': name, 'price': quote['ask']}
+        return self._consolidated(symbol, bid, ask, venues, started)
+
+    def best_book(self, symbol: str, depth: int = 20) -> dict:
+        """
+        Consolidated order book of `symbol`: every venue's top `depth`
+        levels merged into one book, each level tagged with its venue.
+        """
+        started = time.perf_counter()
+        outcomes = self._gather('fetch_order_book', symbol, depth)
+        venues, bids, asks = {}, [], []
+        for name, outcome in outcomes.items():
+            if 'error' in outcome:
+                venues[name] = outcome
+                continue
+            book = outcome['result'] or {}
+            venue_bids = [level[:2] for level in (book.get('bids') or [])[:depth]]
+            venue_asks = [level[:2] for level in (book.get('asks') or [])[:depth]]
+            bids += [[price, amount, name] for price, amount in venue_bids]
+            asks += [[price, amount, name] for price, amount in venue_asks]
+            venues[name] = {'bid_levels': len(venue_bids), 'ask_levels': len(venue_asks),
+                            'latency_ms': outcome['latency_ms']}
+        bids.sort(key=lambda level: -level[0])
+        asks.sort(key=lambda level: level[0])
+        bid = {'venue': bids[0][2], 'price': bids[0][0]} if bids else None
+        ask = {'venue': asks[0][2], 'price': asks[0][0]} if asks else None
+        result = self._consolidated(symbol, bid, ask, venues, started)
+        result.update(bids=bids[:depth], asks=asks[:depth])
+        return result
+
+    @staticmethod
+    def _consolidated(symbol: str, bid: Optional[dict], ask: Optional[dict], venues: dict,
+                      started: float) -> dict:
+        mid = spread = None
+        if bid and ask:
+            mid = (bid['price'] + ask['price']) / 2
+            spread = ask['price'] - bid['price']
+        return {
+            'symbol': symbol, 'bid': bid, 'ask': ask, 'mid': mid, 'spread': spread,
+            'venues': venues, 'latency_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def stats(self) -> dict:
+        """Per-venue request count, errors and latency percentiles (ms) over recent calls."""
+        with self._lock:
+            samples = {name: list(latencies) for name, latencies in self._latencies.items()}
+            errors = dict(self._errors)
+        stats = {}
+        for name, latencies in samples.items():
+            entry = {'samples': len(latencies), 'errors': errors[name]}
+            if latencies:
+                p50, p95 = np.percentile(latencies, [50, 95])
+                entry.update(mean_ms=round(float(np.mean(latencies)), 3),
+                             p50_ms=round(float(p50), 3), p95_ms=round(float(p95), 3),
+                             max_ms=round(max(latencies), 3))
+            stats[name] = entry
+        return stats
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+def venues_from_env() -> List[str]:
+    """ccxt exchange ids to aggregate, from AGGREGATOR_VENUES (comma separated)."""
+    raw = os.getenv('AGGREGATOR_VENUES', 'binanceus')
+    return [venue.strip() for venue in raw.split(',') if venue.strip()]
+
+
+_price_aggregator = None
+_price_aggregator_lock = threading.Lock()
+
+
+def get_price_aggregator() -> PriceAggregator:
+    """The process-wide aggregator over AGGREGATOR_VENUES (public market data only)."""
+    global _price_aggregator
+    with _price_aggregator_lock:
+        if _price_aggregator is None:
+            from orchestrator.exchange.base import CcxtConnector
+            connectors = {venue: CcxtConnector(venue) for venue in venues_from_env()}
+            _price_aggregator = PriceAggregator(
+                connectors, timeout=float(os.getenv('AGGREGATOR_TIMEOUT', '5'))
+            )
+        return _price_aggregator
@@ -0,0 +1,129 @@
+"""
+Exchange connector interface.
+
+Bots and the price aggregator talk to venues through ExchangeConnector.
+BinanceClient implements it for Binance (with demo mode, market rules and
+the resilience layer); CcxtConnector plugs in any other ccxt exchange.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ExchangeConnector(ABC):
+    """
+    A trading venue reached through a ccxt(-compatible) client in `self.client`.
+    Market data methods raise on failure; account and order methods follow
+    BinanceClient and log and return an empty result instead.
+    """
+    client = None
+
+    @property
+    def name(self) -> str:
+        return getattr(self.client, 'id', type(self).__name__)
+
+    def fetch_ticker(self, symbol: str) -> dict:
+        """ccxt ticker (bid, ask, last, ...) of `symbol`."""
+        return self.client.fetch_ticker(symbol)
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> dict:
+        """ccxt order book of `symbol`: bids and asks as [price, amount] levels, best first."""
+        return self.client.fetch_order_book(symbol, limit)
+
+    @abstractmethod
+    def get_balance(self, asset: str = 'USDT') -> float:
+        """Total balance of `asset`."""
+
+    @abstractmethod
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Last traded price of `symbol`, or None if it could not be fetched."""
+
+    @abstractmethod
+    def create_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None,
+                     type: str = 'market', reference_price: Optional[float] = None):
+        """Place a market or limit order; None if it was not placed."""
+
+    @abstractmethod
+    def get_order_status(self, order_id: str, symbol: str) -> dict:
+        """Current state of an order."""
+
+    @abstractmethod
+    def cancel_order(self, order_id: str, symbol: str) -> dict:
+        """Cancel an open order."""
+
+
+class CcxtConnector(ExchangeConnector):
+    """
+    Connector for any ccxt exchange by id (e.g. 'kraken', 'coinbase').
+
+    Credentials are read from `<exchange_id>_api_key` / `<exchange_id>_api_secret`
+    when not given; without them only public market data works. Calls go
+    through the exchange's shared resilience layer like BinanceClient's.
+    """
+    def __init__(self, exchange_id: str, client=None, api_key: Optional[str] = None,
+                 secret: Optional[str] = None, resilience=None):
+        if client is None:
+            from orchestrator.exchange.binance import _ccxt
+            ccxt = _ccxt()
+            if not hasattr(ccxt, exchange_id):
+                raise ValueError(f"Unknown ccxt exchange: {exchange_id}")
+            config = {'enableRateLimit': True}
+            api_key = api_key or os.getenv(f'{exchange_id}_api_key')
+            secret = secret or os.getenv(f'{exchange_id}_api_secret')
+            if api_key and secret:
+                config.update(apiKey=api_key, secret=secret)
+            client = getattr(ccxt, exchange_id)(config)
+            if resilience is None and os.getenv('EXCHANGE_RESILIENCE', 'true').lower() != 'false':
+                from orchestrator.exchange.resilience import get_resilience
+                resilience = get_resilience(exchange_id)
+        if resilience is not None:
+            from orchestrator.exchange.resilience import ResilientClient
+            client = ResilientClient(client, resilience)
+        self.exchange_id = exchange_id
+        self.client = client
+        self.resilience = resilience
+
+    @property
+    def name(self) -> str:
+        return self.exchange_id
+
+    def get_balance(self, asset: str = 'USDT') -> float:
+        try:
+            return self.client.fetch_balance()['total'].get(asset, 0.0)
+        except Exception as e:
+            logging.error(f"Failed to get {asset} balance on {self.exchange_id}: {str(e)}")
+            return 0.0
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        try:
+            price = self.fetch_ticker(symbol).get('last')
+            return float(price) if price else None
+        except Exception as e:
+            logging.error(f"Failed to get price for {symbol} on {self.exchange_id}: {str(e)}")
+            return None
+
+    def create_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None,
+                     type: str = 'market', reference_price: Optional[float] = None):
+        try:
+            if type == 'market':
+                return self.client.create_market_order(symbol, side, amount)
+            return self.client.create_limit_order(symbol, side, amount, price)
+        except Exception as e:
+            logging.error(f"Failed to create {side} {type} order for {symbol} on {self.exchange_id}: {str(e)}")
+            return None
+
+    def get_order_status(self, order_id: str, symbol: str) -> dict:
+        try:
+            return self.client.fetch_order(order_id, symbol)
+        except Exception as e:
+            logging.error(f"Failed to get status for order {order_id} on {self.exchange_id}: {str(e)}")
+            return {}
+
+    def cancel_order(self, order_id: str, symbol: str) -> dict:
+        try:
+            return self.client.cancel_order(order_id, symbol)
+        except Exception as e:
+            logging.error(f"Failed to cancel order {order_id} on {self.exchange_id}: {str(e)}")
+            return {}
@@ -1,36 +1,140 @@
 import os
-import ccxt
+import threading
 from typing import Optional
 import logging
 
-class BinanceClient:
+from orchestrator.exchange.base import ExchangeConnector
+
+# ccxt takes the better part of a second to import, so it is loaded on first
+# use rather than when this module is imported.
+ccxt = None
+
+
+def _ccxt():
+    global ccxt
+    if ccxt is None:
+        import ccxt as _module
+        ccxt = _module
+    return ccxt
+
+
+class BinanceClient(ExchangeConnector):
     """
     Binance exchange connector using ccxt. Loads credentials from environment variables.
+
+    Credentials are checked with a `fetch_balance()` round trip. By default this
+    runs in a background thread (`validate='async'`) so constructing the client
+    does not block; use `wait_until_validated()` before trading. Pass
+    `validate='sync'` for the old blocking behaviour or `'none'` to skip it.
+
+    Market metadata comes from a MarketCache shared by all clients of the
+    exchange (loaded during validation), and orders are rounded and checked
+    against it before they are sent. API calls go through the exchange's
+    shared circuit breakers and request budget (see resilience.py; off with
+    EXCHANGE_RESILIENCE=false). Injected clients get neither unless they are
+    passed as `markets` / `resilience`.
     """
-    def __init__(self):
+    def __init__(self, validate: Optional[str] = None, client=None, markets=None, resilience=None):
         api_key = os.getenv('binanceusdt_api_key')
         api_secret = os.getenv('binanceusdt_api_secret')
         self.demo_mode = os.getenv('DEMO_MODE', 'False').lower() == 'true'
+        validate = validate or os.getenv('BINANCE_VALIDATE', 'async').lower()
+        if validate not in ('async', 'sync', 'none'):
+            raise ValueError(f"Unknown credential validation mode: {validate}")
+        self.validate = validate
         
-        if not api_key or not api_secret:
-            raise ValueError("Binance API key/secret not set in environment variables.")
+        if client is not None:
+            # Pre-built ccxt(-compatible) client, e.g. a ReplayClient
+            self.client = client
+        else:
+            if not api_key or not api_secret:
+                raise ValueError("Binance API key/secret not set in environment variables.")
+            try:
+                self.client = _ccxt().binanceus({
+                    'apiKey': api_key,
+                    'secret': api_secret,
+                    'enableRateLimit': True,
+                })
+            except Exception as e:
+                print(f"Error initializing Binance client: {e}")
+                logging.error(f"Binance connection error: {str(e)}")
+                raise
+            from orchestrator.exchange.replay import get_recorder, RecordingClient
+            recorder = get_recorder()
+            if recorder is not None:
+                self.client = RecordingClient(self.client, recorder)
+            if markets is None:
+                from orchestrator.exchange.markets import get_market_cache
+                markets = get_market_cache(self.client.id)
+            if resilience is None and os.getenv('EXCHANGE_RESILIENCE', 'true').lower() != 'false':
+                from orchestrator.exchange.resilience import get_resilience
+                resilience = get_resilience(self.client.id)
+        if resilience is not None:
+            from orchestrator.exchange.resilience import ResilientClient
+            self.client = ResilientClient(self.client, resilience)
+        self.markets = markets
+        self.resilience = resilience
+
+        # None until the credential check has finished
+        self.credentials_valid = None
+        self.credentials_error = None
+        self._validated = threading.Event()
+        if validate == 'sync':
+            self.validate_credentials()
+            if not self.credentials_valid:
+                raise self.credentials_error
+        elif validate == 'async':
+            threading.Thread(
+                target=self.validate_credentials, name="binance-credential-check", daemon=True
+            ).start()
+        else:
+            self._validated.set()
+
+    def prepare_markets(self) -> bool:
+        """Hand the shared market metadata to the ccxt client (loading it once if needed)."""
+        if self.markets is None:
+            return False
+        try:
+            return self.markets.apply(self.client)
+        except Exception as e:
+            print(f"Error loading markets: {e}")
+            logging.error(f"Failed to load markets: {str(e)}")
+            return False
+
+    def validate_credentials(self) -> bool:
+        """Test the connection to ensure credentials work."""
+        self.prepare_markets()
         try:
-            self.client = ccxt.binanceus({
-                'apiKey': api_key,
-                'secret': api_secret,
-                'enableRateLimit': True,
-            })
-            # Test the connection to ensure credentials work
             self.client.fetch_balance()
+            self.credentials_valid = True
+            self.credentials_error = None
             if self.demo_mode:
                 print("Successfully connected to Binance API (DEMO MODE - No real trades will be executed)")
                 logging.info("Running in DEMO MODE - No real trades will be executed")
             else:
                 print("Successfully connected to Binance API")
         except Exception as e:
+            self.credentials_valid = False
+            self.credentials_error = e
             print(f"Error initializing Binance client: {e}")
             logging.error(f"Binance connection error: {str(e)}")
-            raise
+        finally:
+            self._validated.set()
+        return self.credentials_valid
+
+    def wait_until_validated(self, timeout: Optional[float] = None) -> Optional[bool]:
+        """
+        Block until the credential check has finished.
+
+        Returns:
+            Optional[bool]: True for valid credentials or a skipped check
+            (validate='none'), False for invalid ones, None if the check did
+            not finish within `timeout`. Only True means it is safe to trade.
+        """
+        if self.validate == 'none':
+            return True
+        self._validated.wait(timeout)
+        return self.credentials_valid
 
     def get_balance(self, asset: str = 'USDT') -> float:
         """Get balance for a specific asset."""
@@ -42,22 +146,51 @@ class BinanceClient:
             logging.error(f"Failed to get balance for {asset}: {str(e)}")
             return 0.0
 
-    def get_price(self, symbol: str = 'BTC/USDT') -> float:
-        """Get the latest price for a symbol."""
+    def get_price(self, symbol: str = 'BTC/USDT') -> Optional[float]:
+        """Get the latest price for a symbol, or None if it could not be fetched."""
         try:
             ticker = self.client.fetch_ticker(symbol)
-            return ticker['last']
+            price = ticker.get('last')
+            return float(price) if price else None
         except Exception as e:
             print(f"Error fetching price: {e}")
             logging.error(f"Failed to get price for {symbol}: {str(e)}")
-            return 0.0
+            return None
+
+    def create_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None, type: str = 'market',
+                     reference_price: Optional[float] = None):
+        """
+        Create an order (market or limit).
 
-    def create_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None, type: str = 'market'):
-        """Create an order (market or limit)."""
+        The amount is rounded down to the market's lot size and the order is
+        checked against its limits first; `reference_price` is the expected
+        fill price used for the min-notional check of market orders.
+        """
+        if self.markets is not None:
+            if not self.markets.loaded:
+                self.prepare_markets()
+            from orchestrator.exchange.markets import OrderValidationError
+            try:
+                amount, checked_price = self.markets.check_order(
+                    symbol, amount, price if price is not None else reference_price
+                )
+            except OrderValidationError as e:
+                print(f"Order rejected before sending: {e}")
+                logging.error(f"Invalid {side} {type} order for {symbol}: {str(e)}")
+                return None
+            if price is not None:
+                price = checked_price
         try:
             # In demo mode, create a simulated order response but don't execute the actual trade
             if self.demo_mode:
-                current_price = self.get_price(symbol)
+                current_price = None
+                if type == 'market':
+                    current_price = self._book_fill_price(symbol, side, amount)
+                current_price = current_price or self.get_price(symbol) or price or reference_price
+                if not current_price:
+                    # A demo fill without a price would record a zero cost
+                    logging.error(f"[DEMO MODE] No price for {symbol}; {side} order not simulated")
+                    return None
                 logging.info(f"[DEMO MODE] Simulating {side} {type} order for {amount} {symbol} at ~${current_price}")
                 
                 # Create a simulated order response similar to what CCXT would return
@@ -70,8 +203,8 @@ class BinanceClient:
                     'price': current_price,
                     'cost': amount * current_price,
                     'status': 'closed',
-                    'timestamp': ccxt.Exchange.milliseconds(),
-                    'datetime': ccxt.Exchange.iso8601(ccxt.Exchange.milliseconds()),
+                    'timestamp': self.client.milliseconds(),
+                    'datetime': _ccxt().Exchange.iso8601(self.client.milliseconds()),
                     'fee': {
                         'cost': amount * current_price * 0.001,  # Simulated 0.1% fee
                         'currency': symbol.split('/')[1]
@@ -91,6 +224,15 @@ class BinanceClient:
             logging.error(f"Failed to create {side} {type} order for {symbol}: {str(e)}")
             return None
 
+    def _book_fill_price(self, symbol: str, side: str, amount: float) -> Optional[float]:
+        """Average price of walking the local order book with `amount`, if the book can fill it."""
+        from orchestrator.data.orderbook import order_books
+        book = order_books.refresh(symbol, self.client)
+        if book is None:
+            return None
+        price, filled = book.vwap(side, amount)
+        return price if filled >= amount else None
+
     def get_order_status(self, order_id: str, symbol: str) -> dict:
         """Get the status of an order by ID."""
         try:
@@ -108,4 +250,16 @@ class BinanceClient:
         except Exception as e:
             print(f"Error fetching order status: {e}")
             logging.error(f"Failed to get status for order {order_id}: {str(e)}")
-            return {} 
\ No newline at end of file
+            return {}
+
+    def cancel_order(self, order_id: str, symbol: str) -> dict:
+        """Cancel an open order by ID."""
+        try:
+            if self.demo_mode and order_id.startswith('demo-'):
+                # Demo orders fill immediately; there is nothing left to cancel
+                return self.get_order_status(order_id, symbol)
+            return self.client.cancel_order(order_id, symbol)
+        except Exception as e:
+            print(f"Error cancelling order: {e}")
+            logging.error(f"Failed to cancel order {order_id}: {str(e)}")
+            return {}
@@ -0,0 +1,251 @@
+"""
+Exchange market metadata (precision, lot sizes, min notional) cache.
+
+ccxt calls `load_markets()` on every new exchange instance before its first
+symbol-specific request. MarketCache loads the markets once per exchange,
+keeps them on disk for MARKETS_CACHE_TTL seconds, hands them to every
+client via `set_markets()` and rounds / validates orders against them
+before they are sent.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+MARKETS_CACHE_DIR = os.getenv(
+    'MARKETS_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs', 'markets')
+)
+# Markets rarely change; a day-old copy is good enough for precision and limits
+MARKETS_CACHE_TTL = float(os.getenv('MARKETS_CACHE_TTL', str(24 * 60 * 60)))
+
+# ccxt precision modes
+DECIMAL_PLACES = 2
+SIGNIFICANT_DIGITS = 3
+TICK_SIZE = 4
+
+
+class OrderValidationError(ValueError):
+    """The order would be rejected by the exchange (size, precision or notional)."""
+
+
+def _step(precision, mode: int) -> Optional[float]:
+    """Smallest increment for a ccxt precision value, or None if unknown."""
+    if precision is None:
+        return None
+    if mode == TICK_SIZE:
+        return float(precision)
+    if mode == DECIMAL_PLACES:
+        return 10.0 ** -int(precision)
+    return None
+
+
+def _decimals(step: float) -> int:
+    return max(0, -int(math.floor(math.log10(step) + 1e-9)))
+
+
+class _Rules:
+    """Per-symbol increments and limits, precomputed for fast rounding."""
+    __slots__ = ('amount_step', 'amount_decimals', 'price_step', 'price_decimals',
+                 'min_amount', 'max_amount', 'min_cost')
+
+    def __init__(self, market: dict, mode: int):
+        precision = market.get('precision') or {}
+        limits = market.get('limits') or {}
+        self.amount_step = _step(precision.get('amount'), mode)
+        self.price_step = _step(precision.get('price'), mode)
+        self.amount_decimals = _decimals(self.amount_step) if self.amount_step else None
+        self.price_decimals = _decimals(self.price_step) if self.price_step else None
+        self.min_amount = (limits.get('amount') or {}).get('min')
+        self.max_amount = (limits.get('amount') or {}).get('max')
+        self.min_cost = (limits.get('cost') or {}).get('min')
+
+
+class MarketCache:
+    """
+    Market metadata of one exchange, shared by all its clients.
+
+    Args:
+        exchange_id (str): ccxt exchange id, used for the cache file name.
+        client_factory (callable): Returns a ccxt client to load markets with
+            when neither memory nor disk has a fresh copy.
+    """
+    def __init__(self, exchange_id: str, client_factory: Optional[Callable] = None,
+                 path: Optional[str] = None, ttl: float = MARKETS_CACHE_TTL, clock=time.time):
+        self.exchange_id = exchange_id
+        self.client_factory = client_factory
+        self.path = path or os.path.join(MARKETS_CACHE_DIR, f"{exchange_id}.json")
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._markets = None
+        self._currencies = None
+        self._precision_mode = TICK_SIZE
+        self._loaded_at = None
+        self._rules: Dict[str, _Rules] = {}
+        self.loads = 0
+
+    def _fresh(self) -> bool:
+        return self._loaded_at is not None and self.clock() - self._loaded_at < self.ttl
+
+    def _read_disk(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable market cache {self.path}: {e}")
+            return False
+        if self.clock() - data.get('saved_at', 0) >= self.ttl:
+            return False
+        self._set(data['markets'], data.get('currencies'), data.get('precision_mode', TICK_SIZE),
+                  data['saved_at'])
+        return True
+
+    def _write_disk(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            'exchange': self.exchange_id,
+            'saved_at': self._loaded_at,
+            'precision_mode': self._precision_mode,
+            'markets': self._markets,
+            'currencies': self._currencies,
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix='.markets-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'), default=str)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _set(self, markets: dict, currencies, precision_mode: int, loaded_at: float):
+        self._markets = markets
+        self._currencies = currencies
+        self._precision_mode = precision_mode
+        self._loaded_at = loaded_at
+        self._rules = {}
+
+    def load(self, client=None, force: bool = False) -> dict:
+        """
+        Markets from memory, else from disk, else from the exchange (which
+        also refreshes the disk copy).
+        """
+        with self._lock:
+            if not force and self._fresh():
+                return self._markets
+            if not force and self._read_disk():
+                return self._markets
+            client = client or (self.client_factory() if self.client_factory else None)
+            if client is None:
+                raise RuntimeError(f"No client to load {self.exchange_id} markets with.")
+            markets = client.load_markets(True) if force else client.load_markets()
+            self.loads += 1
+            self._set(
+                markets, getattr(client, 'currencies', None),
+                getattr(client, 'precisionMode', TICK_SIZE), self.clock()
+            )
+            try:
+                self._write_disk()
+            except Exception as e:
+                print(f"Could not persist market cache to {self.path}: {e}")
+            return self._markets
+
+    def apply(self, client) -> bool:
+        """
+        Give `client` the cached markets so it never calls load_markets()
+        itself. Loads them (with this client) first if needed.
+        """
+        if not hasattr(client, 'set_markets'):
+            return False
+        markets = self.load(client)
+        if getattr(client, 'markets', None) is not markets:
+            client.set_markets(markets, self._currencies)
+        return True
+
+    @property
+    def loaded(self) -> bool:
+        return self._markets is not None
+
+    def market(self, symbol: str) -> Optional[dict]:
+        markets = self._markets
+        return markets.get(symbol) if markets else None
+
+    def _rules_for(self, symbol: str) -> Optional[_Rules]:
+        rules = self._rules.get(symbol)
+        if rules is None:
+            market = self.market(symbol)
+            if market is None:
+                return None
+            rules = self._rules[symbol] = _Rules(market, self._precision_mode)
+        return rules
+
+    def amount_to_precision(self, symbol: str, amount: float) -> float:
+        """Round an order size down to the symbol's lot step."""
+        rules = self._rules_for(symbol)
+        if rules is None or not rules.amount_step:
+            return amount
+        steps = math.floor(amount / rules.amount_step + 1e-9)
+        return round(steps * rules.amount_step, rules.amount_decimals)
+
+    def price_to_precision(self, symbol: str, price: float) -> float:
+        """Round a price to the symbol's tick size."""
+        rules = self._rules_for(symbol)
+        if rules is None or not rules.price_step:
+            return price
+        return round(round(price / rules.price_step) * rules.price_step, rules.price_decimals)
+
+    def check_order(self, symbol: str, amount: float, price: Optional[float] = None) -> Tuple[float, Optional[float]]:
+        """
+        Round an order to the exchange's precision and check its limits.
+
+        Args:
+            price (float): Limit price, or the expected fill price of a
+                market order; the min-notional check needs it.
+        Returns:
+            Tuple[float, Optional[float]]: The rounded amount and price.
+        Raises:
+            OrderValidationError: If the exchange would reject the order.
+        """
+        rules = self._rules_for(symbol)
+        if rules is None:
+            if self._markets is not None:
+                raise OrderValidationError(f"Unknown symbol {symbol} on {self.exchange_id}")
+            return amount, price
+        rounded = self.amount_to_precision(symbol, amount)
+        if price is not None:
+            price = self.price_to_precision(symbol, price)
+        if rounded <= 0:
+            raise OrderValidationError(
+                f"Amount {amount} rounds to zero (step {rules.amount_step}) for {symbol}"
+            )
+        if rules.min_amount is not None and rounded < rules.min_amount:
+            raise OrderValidationError(f"Amount {rounded} below minimum {rules.min_amount} for {symbol}")
+        if rules.max_amount is not None and rounded > rules.max_amount:
+            raise OrderValidationError(f"Amount {rounded} above maximum {rules.max_amount} for {symbol}")
+        if price and rules.min_cost is not None and rounded * price < rules.min_cost:
+            raise OrderValidationError(
+                f"Order value {rounded * price:.4f} below minimum notional {rules.min_cost} for {symbol}"
+            )
+        return rounded, price
+
+
+_caches: Dict[str, MarketCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_market_cache(exchange_id: str) -> MarketCache:
+    """The process-wide market cache for a ccxt exchange id."""
+    with _caches_lock:
+        cache = _caches.get(exchange_id)
+        if cache is None:
+            cache = _caches[exchange_id] = MarketCache(exchange_id)
+        return cache
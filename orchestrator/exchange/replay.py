@@ -0,0 +1,261 @@
+"""
+Record and replay exchange I/O.
+
+Setting EXCHANGE_RECORD_FILE makes every BinanceClient record each ccxt call
+it makes (OHLCV, tickers, balances, orders) with its response to a gzipped
+JSON-lines file. `run_replay()` feeds such a file back to an unchanged
+TradingBot through a ReplayClient and a VirtualClock, so the bot loop runs
+without network access and without real sleeps.
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+
+# ccxt methods worth recording; everything else is passed through untouched
+RECORDED_METHODS = (
+    'fetch_ohlcv', 'fetch_ticker', 'fetch_tickers', 'fetch_balance', 'fetch_order',
+    'fetch_order_book', 'fetch_open_orders', 'create_order', 'create_market_order',
+    'create_limit_order', 'cancel_order', 'load_markets',
+)
+
+# Flush the recording every N calls so a crash loses little
+FLUSH_EVERY = 20
+
+
+class ReplayExhausted(Exception):
+    """Raised when the bot asks for more calls than the recording holds."""
+
+
+class ExchangeRecorder:
+    """Thread-safe writer of recorded exchange calls (gzipped JSON lines)."""
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.count = 0
+
+    def write(self, method: str, args, kwargs, result=None, error: Optional[Exception] = None):
+        record = {'t': time.time(), 'm': method, 'a': list(args), 'k': kwargs}
+        if error is not None:
+            record['e'] = [type(error).__name__, str(error)]
+        else:
+            record['r'] = result
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self.count += 1
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self._file.flush()
+                self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingClient:
+    """Proxy around a ccxt client that records the calls in RECORDED_METHODS."""
+    def __init__(self, client, recorder: ExchangeRecorder):
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in RECORDED_METHODS or not callable(attr):
+            return attr
+
+        def recorded(*args, **kwargs):
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._recorder.write(name, args, kwargs, error=e)
+                raise
+            self._recorder.write(name, args, kwargs, result=result)
+            return result
+        return recorded
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[ExchangeRecorder]:
+    """The process-wide recorder if EXCHANGE_RECORD_FILE is set, else None."""
+    global _recorder
+    path = os.getenv('EXCHANGE_RECORD_FILE')
+    if not path:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = ExchangeRecorder(path)
+            atexit.register(_recorder.close)
+            print(f"Recording exchange I/O to {path}")
+        return _recorder
+
+
+class VirtualClock:
+    """
+    Stand-in for the `time` module: `sleep()` advances the clock instantly
+    instead of blocking.
+    """
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self._lock = threading.Lock()
+        self.slept = 0.0
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self._now += max(0.0, seconds)
+            self.slept += max(0.0, seconds)
+
+    def advance_to(self, timestamp: float):
+        with self._lock:
+            if timestamp > self._now:
+                self._now = timestamp
+
+
+class ReplayClient:
+    """
+    ccxt look-alike that answers each recorded method with the next recorded
+    response for that method, in the order they were captured.
+    """
+    def __init__(self, path: str, clock: Optional[VirtualClock] = None, on_exhausted=None):
+        self._queues = defaultdict(deque)
+        first = None
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                first = record['t'] if first is None else first
+                self._queues[record['m']].append(record)
+        self.total = sum(len(q) for q in self._queues.values())
+        # Methods the recorded client had; others are missing here too
+        self._recorded = set(self._queues)
+        self.clock = clock or VirtualClock(first)
+        self.on_exhausted = on_exhausted
+        self.calls = defaultdict(int)
+
+    def remaining(self, method: Optional[str] = None) -> int:
+        if method is not None:
+            return len(self._queues[method])
+        return sum(len(q) for q in self._queues.values())
+
+    def milliseconds(self) -> int:
+        return int(self.clock.time() * 1000)
+
+    def _replay(self, method: str):
+        queue = self._queues.get(method)
+        if not queue:
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            raise ReplayExhausted(f"No recorded responses left for {method}")
+        record = queue.popleft()
+        self.calls[method] += 1
+        # Keep virtual time in step with the recording
+        self.clock.advance_to(record['t'])
+        if 'e' in record:
+            error_type, message = record['e']
+            raise _exception_class(error_type)(message)
+        return record['r']
+
+    def __getattr__(self, name):
+        if name in RECORDED_METHODS and name in self._recorded:
+            return lambda *args, **kwargs: self._replay(name)
+        raise AttributeError(name)
+
+
+def _exception_class(name: str):
+    """Re-raise recorded ccxt errors with their original class where possible."""
+    try:
+        import ccxt
+        cls = getattr(ccxt, name, None)
+        if isinstance(cls, type) and issubclass(cls, Exception):
+            return cls
+    except ImportError:
+        pass
+    return Exception
+
+
+def run_replay(path: str, **bot_kwargs) -> dict:
+    """
+    Replay a recording through an unchanged TradingBot loop.
+
+    Args:
+        path (str): Recording written with EXCHANGE_RECORD_FILE.
+        **bot_kwargs: TradingBot arguments (symbol, timeframe, windows, ...).
+    Returns:
+        dict: Summary with the number of replayed calls per method, the
+              virtual and wall-clock durations and the orders placed.
+    """
+    from orchestrator.bots.manager import TradingBot
+    from orchestrator.data.hub import MarketDataHub
+    from orchestrator.exchange.binance import BinanceClient
+
+    stop_event = threading.Event()
+    replay_client = ReplayClient(path, on_exhausted=stop_event.set)
+    clock = replay_client.clock
+    start_virtual = clock.time()
+    exchange = BinanceClient(validate='none', client=replay_client)
+    hub = MarketDataHub(client_factory=lambda: replay_client, clock=clock.time)
+    orders = []
+
+    def on_log(entry):
+        if entry['category'] == 'TRADE' and entry['message'].startswith('Placing'):
+            orders.append(entry['message'])
+
+    # Replayed sessions stay out of the live trade journal and config unless passed
+    bot_kwargs.setdefault('journal', False)
+    bot_kwargs.setdefault('config', False)
+    bot = TradingBot(
+        stop_event=stop_event, exchange=exchange, hub=hub, clock=clock,
+        notify=None, on_log=on_log, checkpoints=False, **bot_kwargs
+    )
+    started = time.perf_counter()
+    bot.run()
+    return {
+        'recorded_calls': replay_client.total,
+        'replayed_calls': dict(replay_client.calls),
+        'unused_calls': replay_client.remaining(),
+        'virtual_seconds': round(clock.time() - start_virtual, 3),
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'orders': orders,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay a recorded exchange session through the bot.")
+    parser.add_argument('path', help="Recording file (EXCHANGE_RECORD_FILE)")
+    parser.add_argument('--symbol', default='BTC/USDT')
+    parser.add_argument('--timeframe', default='1m')
+    parser.add_argument('--short-window', type=int, default=5)
+    parser.add_argument('--long-window', type=int, default=20)
+    parser.add_argument('--min-vol', type=float, default=None)
+    options = parser.parse_args()
+    summary = run_replay(
+        options.path, symbol=options.symbol, timeframe=options.timeframe,
+        short_window=options.short_window, long_window=options.long_window,
+        min_vol=options.min_vol,
+    )
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,341 @@
+"""
+Resilience layer for exchange API calls.
+
+ResilientClient wraps a ccxt client so every REST call goes through:
+
+- a circuit breaker per endpoint (ccxt method), which fails calls fast
+  after repeated network errors and lets one probe through after a pause;
+- retries with exponential backoff and full jitter for transient errors
+  (never for order placement after a timeout, which may have gone through);
+- a request budget shared by all clients of the exchange, counted in
+  Binance request weight and corrected from the `X-MBX-USED-WEIGHT-1M`
+  response header. Near the limit, market data waits while orders and
+  cancels may still use the reserved headroom; a 429/418 blocks the
+  budget for the `Retry-After` period.
+
+`get_resilience(exchange_id)` returns the process-wide breakers and budget
+of an exchange, so any number of bots share one view of the API.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Binance weight of the REST calls behind each ccxt method (single symbol)
+ENDPOINT_WEIGHTS = {
+    'fetch_ohlcv': 2, 'fetch_ticker': 2, 'fetch_tickers': 80, 'fetch_order_book': 5,
+    'fetch_balance': 20, 'fetch_order': 4, 'fetch_open_orders': 6, 'load_markets': 20,
+    'create_order': 1, 'create_market_order': 1, 'create_limit_order': 1, 'cancel_order': 1,
+}
+# Calls that may use the budget headroom kept back from market data
+ORDER_METHODS = ('create_order', 'create_market_order', 'create_limit_order', 'cancel_order')
+PLACE_METHODS = ('create_order', 'create_market_order', 'create_limit_order')
+
+HIGH, LOW = 'order', 'market_data'
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class BudgetExhaustedError(Exception):
+    """Raised when a call would have to wait too long for request budget."""
+
+
+def _error_kind(error: Exception) -> Optional[str]:
+    """
+    'throttled' for rate-limit rejections, 'transient' for other network
+    errors, None for errors a retry cannot fix (bad symbol, no funds...).
+    Goes by ccxt class names so ccxt need not be imported here.
+    """
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if names & {'DDoSProtection', 'RateLimitExceeded'}:
+        return 'throttled'
+    if names & {'NetworkError', 'TimeoutError', 'ConnectionError'}:
+        return 'transient'
+    return None
+
+
+def _header(headers, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class Backoff:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2**attempt))."""
+    def __init__(self, base: float = 0.5, cap: float = 30.0, rng: Optional[random.Random] = None):
+        self.base = base
+        self.cap = cap
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; after
+    `reset_timeout` seconds one call is let through (half open) and its
+    outcome closes or re-opens the breaker.
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.time):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self):
+        """Give back a half-open probe slot that was not used for a call."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._probing = False
+
+    def snapshot(self) -> dict:
+        return {'state': self.state, 'failures': self.failures, 'trips': self.trips}
+
+
+class RequestBudget:
+    """
+    Request weight used in the current minute, shared by every client of
+    one exchange. Market data may use up to (1 - reserve) of `limit`;
+    orders may use all of it.
+    """
+    def __init__(self, limit: int = 1200, reserve: float = 0.2, window: float = 60.0,
+                 clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.reserve = reserve
+        self.window = window
+        self.clock = clock
+        self.used = 0
+        self.blocked_until = 0.0
+        self.waits = 0
+        self._window_start = None
+        self._lock = threading.Lock()
+
+    def _roll(self, now: float):
+        # Binance counts weight per calendar minute
+        start = now - now % self.window
+        if start != self._window_start:
+            self._window_start = start
+            self.used = 0
+
+    def reserve_weight(self, weight: int, priority: str = LOW) -> float:
+        """
+        Take `weight` from the budget if it fits and return 0, else return
+        the seconds until it might (nothing is taken then).
+        """
+        with self._lock:
+            now = self.clock()
+            if now < self.blocked_until:
+                self.waits += 1
+                return self.blocked_until - now
+            self._roll(now)
+            cap = self.limit if priority == HIGH else self.limit * (1 - self.reserve)
+            if self.used + weight > cap:
+                self.waits += 1
+                return self._window_start + self.window - now
+            self.used += weight
+            return 0.0
+
+    def observe(self, used_weight: int):
+        """Adopt the exchange's own count of the weight used this minute."""
+        with self._lock:
+            self._roll(self.clock())
+            self.used = used_weight
+
+    def block(self, seconds: float):
+        """Stop all calls for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._roll(self.clock())
+            return {
+                'limit': self.limit, 'used': self.used, 'reserve': self.reserve,
+                'blocked_for': round(max(0.0, self.blocked_until - self.clock()), 3),
+                'waits': self.waits,
+            }
+
+
+class Resilience:
+    """Circuit breakers and request budget of one exchange."""
+    def __init__(self, limit: int = 1200, reserve: float = 0.2, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, retries: int = 3, max_wait: float = 10.0,
+                 backoff: Optional[Backoff] = None, clock=time):
+        self.clock = clock
+        self.budget = RequestBudget(limit, reserve, clock=clock.time)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retries = retries
+        self.max_wait = max_wait
+        self.backoff = backoff or Backoff()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'Resilience':
+        return cls(
+            limit=int(os.getenv('EXCHANGE_WEIGHT_LIMIT', '1200')),
+            reserve=float(os.getenv('EXCHANGE_ORDER_RESERVE', '0.2')),
+            failure_threshold=int(os.getenv('EXCHANGE_BREAKER_FAILURES', '5')),
+            reset_timeout=float(os.getenv('EXCHANGE_BREAKER_RESET', '30')),
+            retries=int(os.getenv('EXCHANGE_RETRIES', '3')),
+            max_wait=float(os.getenv('EXCHANGE_MAX_WAIT', '10')),
+        )
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout, clock=self.clock.time
+                )
+            return breaker
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            breakers = {name: b.snapshot() for name, b in self._breakers.items()}
+        return {'budget': self.budget.snapshot(), 'breakers': breakers}
+
+
+class ResilientClient:
+    """Proxy around a ccxt client that routes its REST calls through a Resilience."""
+    def __init__(self, client, resilience: Resilience):
+        self._client = client
+        self._resilience = resilience
+
+    def _acquire(self, method: str):
+        resilience = self._resilience
+        priority = HIGH if method in ORDER_METHODS else LOW
+        waited = 0.0
+        while True:
+            wait = resilience.budget.reserve_weight(ENDPOINT_WEIGHTS[method], priority)
+            if not wait:
+                return
+            if waited + wait > resilience.max_wait:
+                raise BudgetExhaustedError(
+                    f"{method}: request budget exhausted, next slot in {wait:.1f}s"
+                )
+            resilience.clock.sleep(wait)
+            waited += wait
+
+    def _observe(self, error: Optional[Exception] = None):
+        headers = getattr(self._client, 'last_response_headers', None)
+        used = _header(headers, 'x-mbx-used-weight-1m')
+        if used is not None:
+            try:
+                self._resilience.budget.observe(int(used))
+            except ValueError:
+                pass
+        if error is not None and _error_kind(error) == 'throttled':
+            retry_after = _header(headers, 'retry-after')
+            try:
+                seconds = float(retry_after) if retry_after is not None else self._resilience.budget.window
+            except ValueError:
+                seconds = self._resilience.budget.window
+            self._resilience.budget.block(seconds)
+
+    def call(self, method: str, *args, **kwargs):
+        """Call `method` on the wrapped client with breaker, budget and retries."""
+        resilience = self._resilience
+        breaker = resilience.breaker(method)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"{method}: circuit open after {breaker.failures} failures")
+            try:
+                self._acquire(method)
+            except BudgetExhaustedError:
+                breaker.release()
+                raise
+            try:
+                result = getattr(self._client, method)(*args, **kwargs)
+            except Exception as e:
+                self._observe(e)
+                kind = _error_kind(e)
+                if kind is None:
+                    # The endpoint answered; the request itself was bad
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                # A timed-out order may have been placed; only a rejection is safe to resend
+                retryable = kind == 'throttled' or method not in PLACE_METHODS
+                if not retryable or attempt >= resilience.retries:
+                    raise
+                resilience.clock.sleep(resilience.backoff.delay(attempt))
+                attempt += 1
+                continue
+            self._observe()
+            breaker.record_success()
+            return result
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in ENDPOINT_WEIGHTS or not callable(attr):
+            return attr
+
+        def resilient(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+        return resilient
+
+
+_resilience: Dict[str, Resilience] = {}
+_resilience_lock = threading.Lock()
+
+
+def get_resilience(exchange_id: str) -> Resilience:
+    """Return the process-wide Resilience of `exchange_id`, creating it on first use."""
+    with _resilience_lock:
+        resilience = _resilience.get(exchange_id)
+        if resilience is None:
+            resilience = _resilience[exchange_id] = Resilience.from_env()
+        return resilience
+
+
+def resilience_snapshot() -> dict:
+    with _resilience_lock:
+        items = list(_resilience.items())
+    return {exchange_id: resilience.snapshot() for exchange_id, resilience in items}
@@ -0,0 +1,256 @@
+"""
+Local simulated exchange.
+
+SimulatedExchange is a ccxt look-alike with a random-walk price per symbol,
+a bid/ask spread, linear market impact and resting limit orders. Wrap it in
+`BinanceClient(validate='none', client=SimulatedExchange())` to run bots and
+execution algorithms without network access and measure slippage.
+"""
+
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Optional
+
+MINUTE_MS = 60_000
+
+
+class _Market:
+    __slots__ = ('mid', 'updated', 'candles')
+
+    def __init__(self, mid: float, updated: float):
+        self.mid = mid
+        self.updated = updated
+        # 1m candles [ts, open, high, low, close, volume]
+        self.candles = []
+
+
+class SimulatedExchange:
+    """
+    Args:
+        price (float): Starting mid price of every symbol.
+        spread_bps (float): Bid/ask spread in basis points.
+        impact_bps (float): Price impact in basis points per unit of base
+            currency traded by a market order; half of it is permanent.
+        volatility (float): Standard deviation of log returns per second.
+        clock: `time`-like object; pass a VirtualClock for replays and tests.
+        history (int): Minutes of 1m candles generated before the start.
+    """
+    id = 'simulated'
+    precisionMode = 4
+
+    def __init__(self, price: float = 100.0, spread_bps: float = 2.0, impact_bps: float = 5.0,
+                 volatility: float = 0.0005, seed: int = 0, clock=None, history: int = 1000,
+                 fee: float = 0.001, balances: Optional[dict] = None):
+        self.start_price = price
+        self.spread_bps = spread_bps
+        self.impact_bps = impact_bps
+        self.volatility = volatility
+        self.fee = fee
+        self.clock = clock or time
+        self.history = history
+        self.balances = dict(balances or {'USDT': 100_000.0})
+        self.markets = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._markets = {}
+        self._orders = {}
+        self._open = {}
+
+    # -- price process -----------------------------------------------------
+
+    def _market(self, symbol: str) -> _Market:
+        market = self._markets.get(symbol)
+        if market is None:
+            now = self.clock.time()
+            market = self._markets[symbol] = _Market(self.start_price, now)
+            # Pre-history: a random walk that ends at the starting price
+            closes = [self.start_price]
+            step = self.volatility * math.sqrt(60)
+            for _ in range(self.history - 1):
+                closes.append(closes[-1] * math.exp(-self._rng.gauss(0, step)))
+            first = (int(now * 1000) // MINUTE_MS - len(closes) + 1) * MINUTE_MS
+            for i, close in enumerate(reversed(closes)):
+                market.candles.append([first + i * MINUTE_MS, close, close, close, close, 0.0])
+        return market
+
+    def _advance(self, symbol: str) -> _Market:
+        market = self._market(symbol)
+        now = self.clock.time()
+        # Walk the price in steps of at most a minute so candles get their own closes
+        while market.updated < now:
+            dt = min(60.0, now - market.updated)
+            market.mid *= math.exp(self._rng.gauss(0, self.volatility * math.sqrt(dt)))
+            market.updated += dt
+            self._record_price(market, market.updated, market.mid)
+        self._match(symbol, market)
+        return market
+
+    def _record_price(self, market: _Market, ts: float, price: float, volume: float = 0.0):
+        minute = int(ts * 1000) // MINUTE_MS * MINUTE_MS
+        last = market.candles[-1]
+        if last[0] == minute:
+            last[2] = max(last[2], price)
+            last[3] = min(last[3], price)
+            last[4] = price
+            last[5] += volume
+        else:
+            market.candles.append([minute, last[4], max(last[4], price), min(last[4], price), price, volume])
+            if len(market.candles) > self.history * 2:
+                del market.candles[:self.history]
+
+    def _quote(self, market: _Market):
+        half = market.mid * self.spread_bps / 2e4
+        return market.mid - half, market.mid + half
+
+    # -- orders ------------------------------------------------------------
+
+    def _fill(self, order: dict, price: float, market: _Market):
+        base, quote = order['symbol'].split('/')
+        amount = order['amount']
+        sign = 1 if order['side'] == 'buy' else -1
+        self.balances[base] = self.balances.get(base, 0.0) + sign * amount
+        self.balances[quote] = self.balances.get(quote, 0.0) - sign * amount * price - amount * price * self.fee
+        order.update({
+            'status': 'closed', 'filled': amount, 'remaining': 0.0, 'average': price,
+            'price': order.get('price') or price, 'cost': amount * price,
+            'fee': {'cost': amount * price * self.fee, 'currency': quote},
+            'lastTradeTimestamp': self.milliseconds(),
+        })
+        self._record_price(market, self.clock.time(), market.mid, amount)
+        self._open.pop(order['id'], None)
+
+    def _match(self, symbol: str, market: _Market):
+        bid, ask = self._quote(market)
+        for order in list(self._open.values()):
+            if order['symbol'] != symbol:
+                continue
+            if (order['side'] == 'buy' and ask <= order['price']) or \
+               (order['side'] == 'sell' and bid >= order['price']):
+                self._fill(order, order['price'], market)
+
+    def _new_order(self, symbol, type, side, amount, price=None) -> dict:
+        if side not in ('buy', 'sell'):
+            raise ValueError(f"Invalid order side: {side}")
+        if amount <= 0:
+            raise ValueError("Order amount must be positive.")
+        now = self.milliseconds()
+        order = {
+            'id': f"sim-{next(self._ids)}", 'symbol': symbol, 'type': type, 'side': side,
+            'amount': amount, 'price': price, 'status': 'open', 'filled': 0.0,
+            'remaining': amount, 'average': None, 'cost': 0.0, 'timestamp': now,
+            'datetime': None, 'info': {'simulated': True},
+        }
+        self._orders[order['id']] = order
+        return order
+
+    def create_market_order(self, symbol: str, side: str, amount: float, params=None):
+        with self._lock:
+            market = self._advance(symbol)
+            order = self._new_order(symbol, 'market', side, amount)
+            bid, ask = self._quote(market)
+            impact = market.mid * self.impact_bps * amount / 1e4
+            price = ask + impact if side == 'buy' else bid - impact
+            # Half of the impact stays in the market
+            market.mid += impact / 2 if side == 'buy' else -impact / 2
+            self._fill(order, price, market)
+            return dict(order)
+
+    def create_limit_order(self, symbol: str, side: str, amount: float, price: float, params=None):
+        with self._lock:
+            market = self._advance(symbol)
+            order = self._new_order(symbol, 'limit', side, amount, price)
+            self._open[order['id']] = order
+            self._match(symbol, market)
+            return dict(order)
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float, price=None, params=None):
+        if type == 'market':
+            return self.create_market_order(symbol, side, amount)
+        return self.create_limit_order(symbol, side, amount, price)
+
+    def fetch_order(self, id: str, symbol: Optional[str] = None, params=None):
+        with self._lock:
+            order = self._orders.get(id)
+            if order is None:
+                raise KeyError(f"Order {id} not found")
+            self._advance(order['symbol'])
+            return dict(order)
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None, params=None):
+        with self._lock:
+            order = self._orders.get(id)
+            if order is None:
+                raise KeyError(f"Order {id} not found")
+            if order['status'] == 'open':
+                order['status'] = 'canceled'
+                self._open.pop(id, None)
+            return dict(order)
+
+    def fetch_open_orders(self, symbol: Optional[str] = None, since=None, limit=None, params=None):
+        with self._lock:
+            return [dict(o) for o in self._open.values() if symbol is None or o['symbol'] == symbol]
+
+    # -- market data -------------------------------------------------------
+
+    def milliseconds(self) -> int:
+        return int(self.clock.time() * 1000)
+
+    def fetch_ticker(self, symbol: str, params=None):
+        with self._lock:
+            market = self._advance(symbol)
+            bid, ask = self._quote(market)
+            return {
+                'symbol': symbol, 'timestamp': self.milliseconds(),
+                'bid': bid, 'ask': ask, 'last': market.mid,
+            }
+
+    def fetch_order_book(self, symbol: str, limit=None, params=None):
+        """
+        Evenly spread depth on 0.01 ticks, sized so that walking it costs
+        about what a market order pays in impact.
+        """
+        with self._lock:
+            market = self._advance(symbol)
+            bid, ask = self._quote(market)
+            per_unit = market.mid * self.impact_bps / 1e4
+            tick = 0.01
+            amount = tick / (2 * per_unit) if per_unit else 1e9
+            levels = range(limit or 100)
+            return {
+                'symbol': symbol, 'timestamp': self.milliseconds(), 'nonce': None,
+                'bids': [[round(bid - i * tick, 2), amount] for i in levels],
+                'asks': [[round(ask + i * tick, 2), amount] for i in levels],
+            }
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since=None, limit=100, params=None):
+        if timeframe != '1m':
+            raise ValueError("The simulated exchange only serves 1m candles.")
+        with self._lock:
+            candles = self._advance(symbol).candles
+            if since is not None:
+                # Like ccxt, page forward from `since`
+                candles = [c for c in candles if c[0] >= since][:limit or None]
+            return [list(c) for c in candles[-limit:]] if limit else [list(c) for c in candles]
+
+    def fetch_balance(self, params=None):
+        with self._lock:
+            balances = dict(self.balances)
+        return {'total': balances, 'free': dict(balances), 'used': {}}
+
+    def load_markets(self, reload=False, params=None):
+        symbols = set(self._markets) | {'BTC/USDT', 'ETH/USDT'}
+        return {
+            symbol: {
+                'symbol': symbol, 'base': symbol.split('/')[0], 'quote': symbol.split('/')[1],
+                'precision': {'amount': 0.00001, 'price': 0.01},
+                'limits': {'amount': {'min': 0.00001, 'max': None}, 'cost': {'min': None}},
+            }
+            for symbol in symbols
+        }
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
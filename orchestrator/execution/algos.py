@@ -0,0 +1,413 @@
+"""
+Execution algorithms that slice a parent order into child orders.
+
+- TwapOrder sends equal market slices at fixed intervals over a duration.
+- IcebergOrder only ever shows `visible` size: it places the next child
+  (a limit order at `limit_price`, or a market order) when the previous one
+  has filled.
+
+Algorithms are stepped by an AlgoScheduler thread, so placing a parent
+order never blocks the bot loop. Child orders go through
+BinanceClient.create_order and therefore its market-metadata checks.
+"""
+
+import argparse
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Smallest remaining size treated as "nothing left"
+EPSILON = 1e-12
+
+_ids = itertools.count(1)
+
+
+class ExecutionAlgo:
+    """
+    Base class of a parent order.
+
+    Args:
+        exchange: BinanceClient (or anything with the same create_order,
+            get_order_status and cancel_order methods).
+        on_fill (callable): Called as on_fill(algo, child_order) for every
+            filled child.
+        on_done (callable): Called as on_done(algo) once the parent is done,
+            cancelled or failed.
+    """
+    kind = 'algo'
+    # Replaced by the scheduler's clock on submit
+    clock = time
+
+    def __init__(self, exchange, symbol: str, side: str, amount: float,
+                 on_fill: Optional[Callable] = None, on_done: Optional[Callable] = None):
+        if side not in ('buy', 'sell'):
+            raise ValueError(f"Invalid order side: {side}")
+        if amount <= 0:
+            raise ValueError("amount must be positive.")
+        self.id = f"{self.kind}-{next(_ids)}"
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.amount = amount
+        self.on_fill = on_fill
+        self.on_done = on_done
+        self.status = 'pending'
+        self.filled = 0.0
+        self.cost = 0.0
+        self.children: List[dict] = []
+        self.error = None
+        self.created_at = None
+        self.finished_at = None
+        self._cancel_requested = False
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.amount - self.filled)
+
+    @property
+    def average_price(self) -> Optional[float]:
+        return self.cost / self.filled if self.filled else None
+
+    @property
+    def progress(self) -> float:
+        return min(1.0, self.filled / self.amount)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('done', 'cancelled', 'failed')
+
+    def cancel(self):
+        """Stop after the current step; unfilled children are cancelled."""
+        self._cancel_requested = True
+
+    def start(self, now: float) -> float:
+        self.status = 'running'
+        self.created_at = now
+        return now
+
+    def step(self, now: float) -> Optional[float]:
+        """Do the work due at `now`; return when to be stepped again (None = finished)."""
+        raise NotImplementedError
+
+    def _send(self, amount: float, price: Optional[float] = None) -> Optional[dict]:
+        order_type = 'limit' if price is not None else 'market'
+        order = self.exchange.create_order(self.symbol, self.side, amount, price=price, type=order_type)
+        if not order:
+            self._finish('failed', f"Child {order_type} order for {amount} was rejected")
+            return None
+        child = {
+            'id': order.get('id'), 'amount': order.get('amount', amount), 'type': order_type,
+            'price': price, 'status': order.get('status'), 'filled': 0.0, 'average': None,
+        }
+        self.children.append(child)
+        self._update(child, order)
+        return child
+
+    def _update(self, child: dict, order: dict):
+        """Apply a (possibly partial) fill reported for a child."""
+        if not order:
+            return
+        status = order.get('status') or child['status']
+        filled = order.get('filled')
+        if filled is None:
+            filled = child['amount'] if status == 'closed' else child['filled']
+        new = filled - child['filled']
+        if new > EPSILON:
+            price = order.get('average') or order.get('price') or child['price']
+            self.filled += new
+            self.cost += new * price
+            child['filled'] = filled
+            child['average'] = price
+            if self.on_fill is not None:
+                self.on_fill(self, dict(child, new_fill=new, fill_price=price))
+        child['status'] = status
+
+    def _finish(self, status: str, error: Optional[str] = None):
+        if self.done:
+            return
+        self.status = status
+        self.error = error
+        self.finished_at = self.clock.time()
+        if self.on_done is not None:
+            self.on_done(self)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id, 'algo': self.kind, 'symbol': self.symbol, 'side': self.side,
+            'amount': self.amount, 'filled': self.filled, 'remaining': self.remaining,
+            'average_price': self.average_price, 'progress': round(self.progress, 4),
+            'status': self.status, 'error': self.error, 'children': len(self.children),
+            'created_at': self.created_at, 'finished_at': self.finished_at,
+        }
+
+
+class TwapOrder(ExecutionAlgo):
+    """Split `amount` into `slices` market orders spread evenly over `duration` seconds."""
+    kind = 'twap'
+
+    def __init__(self, exchange, symbol: str, side: str, amount: float,
+                 duration: float = 300.0, slices: int = 5, **kwargs):
+        super().__init__(exchange, symbol, side, amount, **kwargs)
+        if slices < 1:
+            raise ValueError("slices must be at least 1.")
+        self.duration = duration
+        self.slices = slices
+        self.sent = 0
+        self.interval = duration / slices
+
+    def step(self, now: float) -> Optional[float]:
+        if self._cancel_requested:
+            self._finish('cancelled')
+            return None
+        last = self.sent == self.slices - 1
+        size = self.remaining if last else self.amount / self.slices
+        if size > EPSILON and self._send(size) is None:
+            return None
+        self.sent += 1
+        if self.sent >= self.slices or self.remaining <= EPSILON:
+            self._finish('done')
+            return None
+        return self.created_at + self.sent * self.interval
+
+    def to_dict(self) -> dict:
+        return dict(super().to_dict(), slices=self.slices, sent=self.sent, duration=self.duration)
+
+
+class IcebergOrder(ExecutionAlgo):
+    """
+    Work `amount` while exposing at most `visible` at a time.
+
+    With a `limit_price` each child rests as a limit order and the next one
+    is placed once it has filled; without one the children are market
+    orders sent every `interval` seconds.
+    """
+    kind = 'iceberg'
+
+    def __init__(self, exchange, symbol: str, side: str, amount: float, visible: float,
+                 limit_price: Optional[float] = None, interval: float = 5.0, **kwargs):
+        super().__init__(exchange, symbol, side, amount, **kwargs)
+        if visible <= 0:
+            raise ValueError("visible must be positive.")
+        self.visible = visible
+        self.limit_price = limit_price
+        self.interval = interval
+        self.active = None
+
+    def step(self, now: float) -> Optional[float]:
+        if self.active is not None:
+            self._update(self.active, self.exchange.get_order_status(self.active['id'], self.symbol))
+            if self.active['status'] in ('closed', 'canceled', 'expired', 'rejected'):
+                self.active = None
+        if self._cancel_requested:
+            if self.active is not None:
+                self._update(self.active, self.exchange.cancel_order(self.active['id'], self.symbol))
+            self._finish('cancelled')
+            return None
+        if self.active is None:
+            if self.remaining <= EPSILON:
+                self._finish('done')
+                return None
+            child = self._send(min(self.visible, self.remaining), self.limit_price)
+            if child is None:
+                return None
+            if child['status'] == 'open':
+                self.active = child
+            elif self.remaining <= EPSILON:
+                self._finish('done')
+                return None
+        return now + self.interval
+
+    def to_dict(self) -> dict:
+        return dict(super().to_dict(), visible=self.visible, limit_price=self.limit_price)
+
+
+class AlgoScheduler:
+    """
+    Runs execution algorithms in a single background thread.
+
+    Each algorithm is kept in a heap by the time it next needs attention,
+    so the thread sleeps until the earliest one is due. With
+    `threaded=False` nothing runs in the background and `drain()` steps the
+    algorithms synchronously, advancing a virtual clock between steps.
+    """
+    def __init__(self, clock=time, threaded: bool = True, history: int = 200):
+        self.clock = clock
+        self.threaded = threaded
+        self.history = history
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._algos: Dict[str, ExecutionAlgo] = {}
+        self._thread = None
+        self._stopped = False
+
+    def submit(self, algo: ExecutionAlgo) -> ExecutionAlgo:
+        with self._cond:
+            now = self.clock.time()
+            algo.clock = self.clock
+            heapq.heappush(self._heap, (algo.start(now), next(self._seq), algo))
+            self._algos[algo.id] = algo
+            self._prune()
+            if self.threaded and (self._thread is None or not self._thread.is_alive()):
+                self._stopped = False
+                self._thread = threading.Thread(target=self._loop, name="algo-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return algo
+
+    def _prune(self):
+        finished = [a for a in self._algos.values() if a.done]
+        for algo in finished[:max(0, len(finished) - self.history)]:
+            del self._algos[algo.id]
+
+    def get(self, algo_id: str) -> Optional[ExecutionAlgo]:
+        return self._algos.get(algo_id)
+
+    def list(self) -> List[dict]:
+        with self._cond:
+            algos = list(self._algos.values())
+        return [a.to_dict() for a in algos]
+
+    def cancel(self, algo_id: str) -> bool:
+        algo = self._algos.get(algo_id)
+        if algo is None or algo.done:
+            return False
+        algo.cancel()
+        with self._cond:
+            # Step it right away instead of at its next slice
+            heapq.heappush(self._heap, (self.clock.time(), next(self._seq), algo))
+            self._cond.notify()
+        return True
+
+    def next_due(self) -> Optional[float]:
+        with self._cond:
+            while self._heap and self._heap[0][2].done:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self) -> int:
+        """Step every algorithm that is due now; returns the number of steps."""
+        now = self.clock.time()
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, algo = heapq.heappop(self._heap)
+                if not algo.done:
+                    due.append(algo)
+        for algo in due:
+            try:
+                next_time = algo.step(now)
+            except Exception as e:
+                algo._finish('failed', str(e))
+                next_time = None
+            if next_time is not None and not algo.done:
+                with self._cond:
+                    heapq.heappush(self._heap, (next_time, next(self._seq), algo))
+        return len(due)
+
+    def drain(self, max_steps: int = 100_000) -> int:
+        """Run everything to completion, sleeping on the clock between steps."""
+        steps = 0
+        while steps < max_steps:
+            due = self.next_due()
+            if due is None:
+                break
+            wait = due - self.clock.time()
+            if wait > 0:
+                self.clock.sleep(wait)
+            steps += self.run_pending()
+        return steps
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                wait = None
+                if self._heap:
+                    wait = self._heap[0][0] - self.clock.time()
+                if wait is None or wait > 0:
+                    self._cond.wait(timeout=min(wait, 1.0) if wait is not None else 1.0)
+                    continue
+            self.run_pending()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def create_algo(name: str, exchange, symbol: str, side: str, amount: float,
+                slices: int = 5, duration: float = 300.0, limit_price: Optional[float] = None,
+                **kwargs) -> ExecutionAlgo:
+    """Build a TWAP or iceberg parent order from the bot's execution settings."""
+    if name == 'twap':
+        return TwapOrder(exchange, symbol, side, amount, duration=duration, slices=slices, **kwargs)
+    if name == 'iceberg':
+        return IcebergOrder(
+            exchange, symbol, side, amount, visible=amount / slices,
+            limit_price=limit_price, interval=duration / slices, **kwargs
+        )
+    raise ValueError(f"Unknown execution algorithm: {name}")
+
+
+# Shared by every bot in the process
+algo_scheduler = AlgoScheduler()
+
+
+def benchmark(orders: int = 50, amount: float = 5.0, slices: int = 10, duration: float = 600.0) -> dict:
+    """
+    Compare single market orders with TWAP on the simulated exchange:
+    average slippage against the arrival mid price, in basis points, and
+    child orders placed per wall-clock second.
+    """
+    from orchestrator.exchange.binance import BinanceClient
+    from orchestrator.exchange.replay import VirtualClock
+    from orchestrator.exchange.simulated import SimulatedExchange
+
+    results = {}
+    for name in ('market', 'twap', 'iceberg'):
+        clock = VirtualClock(1_700_000_000.0)
+        venue = SimulatedExchange(clock=clock, volatility=0.0002, impact_bps=10.0, seed=42)
+        exchange = BinanceClient(validate='none', client=venue)
+        exchange.demo_mode = False
+        scheduler = AlgoScheduler(clock=clock, threaded=False)
+        slippage = []
+        children = 0
+        started = time.perf_counter()
+        for i in range(orders):
+            side = 'buy' if i % 2 == 0 else 'sell'
+            arrival = venue.fetch_ticker('BTC/USDT')['last']
+            if name == 'market':
+                order = exchange.create_order('BTC/USDT', side, amount)
+                price, children = order['average'], children + 1
+            else:
+                algo = scheduler.submit(create_algo(
+                    name, exchange, 'BTC/USDT', side, amount, slices=slices, duration=duration
+                ))
+                scheduler.drain()
+                price, children = algo.average_price, children + len(algo.children)
+            sign = 1 if side == 'buy' else -1
+            slippage.append(sign * (price - arrival) / arrival * 1e4)
+            clock.sleep(duration)
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            'avg_slippage_bps': round(sum(slippage) / len(slippage), 3),
+            'child_orders': children,
+            'child_orders_per_second': round(children / elapsed),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure TWAP / iceberg slippage on the simulated exchange.")
+    parser.add_argument('--orders', type=int, default=50)
+    parser.add_argument('--amount', type=float, default=5.0)
+    parser.add_argument('--slices', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=600.0)
+    options = parser.parse_args()
+    print(benchmark(options.orders, options.amount, options.slices, options.duration))
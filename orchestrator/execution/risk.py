@@ -0,0 +1,257 @@
+"""
+Pre-trade risk checks.
+
+Every order a bot wants to send goes through `RiskEngine.check()` first.
+Positions, notionals, the order-rate window and today's P&L are kept as
+running counters updated on each fill and price mark, so a check is a few
+dictionary lookups and comparisons instead of an exchange round trip.
+"""
+
+import datetime
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+def _env_limit(name: str) -> Optional[float]:
+    raw = os.getenv(name, '').strip()
+    return float(raw) if raw else None
+
+
+class RiskLimits:
+    """
+    Limits enforced by the RiskEngine; None disables a limit.
+
+    Args:
+        max_position (float): Max absolute position per symbol, in base units.
+        max_symbol_notional (float): Max absolute exposure per symbol, in quote units.
+        max_total_notional (float): Max exposure summed over all symbols.
+        max_orders_per_minute (int): Orders allowed in any 60 second window.
+        max_daily_loss (float): Loss (quote units) realized since UTC midnight
+            plus the unrealized loss of open positions, after which only
+            risk-reducing orders pass.
+    """
+    def __init__(self, max_position: Optional[float] = None, max_symbol_notional: Optional[float] = None,
+                 max_total_notional: Optional[float] = None, max_orders_per_minute: Optional[int] = None,
+                 max_daily_loss: Optional[float] = None):
+        self.max_position = max_position
+        self.max_symbol_notional = max_symbol_notional
+        self.max_total_notional = max_total_notional
+        self.max_orders_per_minute = max_orders_per_minute
+        self.max_daily_loss = max_daily_loss
+
+    @classmethod
+    def from_env(cls) -> 'RiskLimits':
+        per_minute = _env_limit('RISK_MAX_ORDERS_PER_MINUTE')
+        return cls(
+            max_position=_env_limit('RISK_MAX_POSITION'),
+            max_symbol_notional=_env_limit('RISK_MAX_SYMBOL_NOTIONAL'),
+            max_total_notional=_env_limit('RISK_MAX_TOTAL_NOTIONAL'),
+            max_orders_per_minute=int(per_minute) if per_minute is not None else None,
+            max_daily_loss=_env_limit('RISK_MAX_DAILY_LOSS'),
+        )
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class _Book:
+    """Running counters for one symbol."""
+    __slots__ = ('position', 'pending', 'avg_cost', 'mark', 'notional', 'unrealized')
+
+    def __init__(self):
+        self.position = 0.0
+        # Signed size of orders approved but not filled yet
+        self.pending = 0.0
+        self.avg_cost = 0.0
+        self.mark = 0.0
+        self.notional = 0.0
+        self.unrealized = 0.0
+
+
+class RiskEngine:
+    """
+    Gate between trading signals and the exchange.
+
+    `check()` approves or rejects an order and, when it approves, reserves
+    the order's rate slot and exposure; report the outcome with `on_fill()`
+    or `release()`. Orders that reduce a position are never blocked by the
+    position, notional or loss limits, only by the order-rate limit, and
+    protective exits (stop-loss, take-profit) are not blocked at all.
+    """
+    WINDOW = 60.0
+
+    def __init__(self, limits: Optional[RiskLimits] = None, clock=time.time):
+        self.limits = limits or RiskLimits.from_env()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._books = {}
+        self._order_times = deque()
+        self._total_notional = 0.0
+        self._total_unrealized = 0.0
+        self._realized_today = 0.0
+        self._day = None
+        self.rejections = {}
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        return book
+
+    def _roll_day(self, now: float):
+        day = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).date()
+        if day != self._day:
+            self._day = day
+            self._realized_today = 0.0
+
+    def _reject(self, reason: str) -> str:
+        key = reason.split(':')[0]
+        self.rejections[key] = self.rejections.get(key, 0) + 1
+        return reason
+
+    def _mark(self, book: _Book, price: float):
+        # Keep the global totals in step with this symbol's contribution
+        notional = abs(book.position) * price
+        unrealized = book.position * (price - book.avg_cost)
+        self._total_notional += notional - book.notional
+        self._total_unrealized += unrealized - book.unrealized
+        book.mark, book.notional, book.unrealized = price, notional, unrealized
+
+    def mark(self, symbol: str, price: float):
+        """Revalue a symbol's position at a new price."""
+        if price <= 0:
+            return
+        with self._lock:
+            self._mark(self._book(symbol), price)
+
+    def check(self, symbol: str, side: str, amount: float, price: float,
+              protective: bool = False) -> Optional[str]:
+        """
+        Approve an order of `amount` at about `price`.
+
+        Args:
+            protective (bool): The order closes a position the caller holds
+                (a triggered stop); it skips the limits but is still counted.
+
+        Returns:
+            Optional[str]: None if the order may be sent (it is then counted
+            as pending), otherwise the reason it was rejected.
+        """
+        if side not in ('buy', 'sell'):
+            return self._reject(f"invalid side: {side}")
+        if amount <= 0 or price <= 0:
+            return self._reject(f"invalid order: amount {amount} at price {price}")
+        limits = self.limits
+        signed = amount if side == 'buy' else -amount
+        with self._lock:
+            now = self.clock()
+            self._roll_day(now)
+            window = self._order_times
+            while window and now - window[0] >= self.WINDOW:
+                window.popleft()
+            limited = not protective
+            if (limited and limits.max_orders_per_minute is not None
+                    and len(window) >= limits.max_orders_per_minute):
+                return self._reject(f"order rate: {len(window)} orders in the last minute")
+
+            book = self._book(symbol)
+            exposure = book.position + book.pending
+            after = exposure + signed
+            if limited and abs(after) > abs(exposure):
+                # Exposure-increasing order: every limit applies
+                if limits.max_position is not None and abs(after) > limits.max_position:
+                    return self._reject(
+                        f"max position: {abs(after):g} > {limits.max_position:g} {symbol}"
+                    )
+                added = (abs(after) - abs(exposure)) * price
+                symbol_notional = abs(exposure) * price + added
+                if limits.max_symbol_notional is not None and symbol_notional > limits.max_symbol_notional:
+                    return self._reject(
+                        f"max symbol notional: {symbol_notional:.2f} > {limits.max_symbol_notional:.2f}"
+                    )
+                total = self._total_notional - book.notional + symbol_notional
+                if limits.max_total_notional is not None and total > limits.max_total_notional:
+                    return self._reject(
+                        f"max total notional: {total:.2f} > {limits.max_total_notional:.2f}"
+                    )
+                pnl = self._realized_today + self._total_unrealized
+                if limits.max_daily_loss is not None and pnl <= -limits.max_daily_loss:
+                    return self._reject(
+                        f"daily loss: {-pnl:.2f} >= {limits.max_daily_loss:.2f}"
+                    )
+            window.append(now)
+            book.pending += signed
+            return None
+
+    def release(self, symbol: str, side: str, amount: float):
+        """An approved order was not placed (or was cancelled unfilled)."""
+        with self._lock:
+            book = self._book(symbol)
+            book.pending -= amount if side == 'buy' else -amount
+
+    def on_fill(self, symbol: str, side: str, amount: float, price: float,
+                ordered: Optional[float] = None):
+        """
+        Apply a fill of an approved order to the position and P&L counters.
+
+        Args:
+            ordered (float): Size that was approved, if different from the
+                filled `amount`; the whole approval stops being pending.
+
+        Returns:
+            Optional[float]: P&L realized by the fill, or None if it only
+            opened or added to a position.
+        """
+        signed = amount if side == 'buy' else -amount
+        realized = None
+        with self._lock:
+            self._roll_day(self.clock())
+            book = self._book(symbol)
+            book.pending -= (ordered if ordered is not None else amount) * (1 if side == 'buy' else -1)
+            position = book.position
+            if position == 0 or (position > 0) == (signed > 0):
+                # Opening or adding: new average cost
+                new_position = position + signed
+                book.avg_cost = (book.avg_cost * abs(position) + price * amount) / abs(new_position)
+            else:
+                closed = min(abs(signed), abs(position))
+                direction = 1 if position > 0 else -1
+                realized = closed * (price - book.avg_cost) * direction
+                self._realized_today += realized
+                new_position = position + signed
+                if new_position == 0:
+                    book.avg_cost = 0.0
+                elif (new_position > 0) != (position > 0):
+                    # Flipped through zero: the remainder opens at the fill price
+                    book.avg_cost = price
+            book.position = new_position
+            self._mark(book, price)
+        return realized
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = self.clock()
+            self._roll_day(now)
+            return {
+                'limits': self.limits.to_dict(),
+                'positions': {
+                    symbol: {
+                        'position': book.position, 'pending': book.pending,
+                        'avg_cost': book.avg_cost, 'mark': book.mark,
+                        'notional': book.notional, 'unrealized': book.unrealized,
+                    }
+                    for symbol, book in self._books.items()
+                },
+                'total_notional': self._total_notional,
+                'realized_today': self._realized_today,
+                'unrealized': self._total_unrealized,
+                'orders_last_minute': sum(1 for t in self._order_times if now - t < self.WINDOW),
+                'rejections': dict(self.rejections),
+            }
+
+
+# Shared by every bot in the process so the global limits see all of them
+risk_engine = RiskEngine()
@@ -0,0 +1,220 @@
+"""
+Volatility-targeted position sizing.
+
+An order is sized so that a one-sigma candle move of the position costs
+`target_risk` of the account equity:
+
+    amount = equity * target_risk / (volatility * price)
+
+capped at `max_fraction` of equity in notional and rounded down to the
+exchange's lot step. Volatility is the same index as
+`calculate_volatility` (std of the last `window` log returns), kept per
+symbol and timeframe with running sums so each new candle costs O(1), and
+the account balance is cached for `balance_ttl` seconds.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+from orchestrator.exchange.markets import OrderValidationError
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    raw = os.getenv(name, '').strip()
+    return float(raw) if raw else default
+
+
+class RollingVolatility:
+    """
+    Population std of the last `window` log returns of a candle series,
+    updated per candle. A new close for the newest candle replaces that
+    candle's return instead of adding one.
+    """
+    # Sums are rebuilt from the window this often to shed rounding drift
+    RESYNC_EVERY = 1000
+
+    def __init__(self, window: int = 20):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._returns = deque()
+        self._sum = 0.0
+        self._squares = 0.0
+        self._updates = 0
+        self.last_ts = None
+        self._last_close = None
+        self._prev_close = None
+
+    def _push(self, value: float):
+        self._returns.append(value)
+        self._sum += value
+        self._squares += value * value
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            self._sum -= old
+            self._squares -= old * old
+
+    def _replace_last(self, value: float):
+        old = self._returns[-1]
+        self._returns[-1] = value
+        self._sum += value - old
+        self._squares += value * value - old * old
+
+    def update(self, ts: int, close: float):
+        """Feed one candle close; older candles than the last one are ignored."""
+        if close <= 0 or (self.last_ts is not None and ts < self.last_ts):
+            return
+        if ts == self.last_ts:
+            if self._prev_close is not None and self._returns:
+                self._replace_last(math.log(close / self._prev_close))
+        else:
+            if self._last_close is not None:
+                self._push(math.log(close / self._last_close))
+            self._prev_close = self._last_close
+            self.last_ts = ts
+        self._last_close = close
+        self._updates += 1
+        if self._updates % self.RESYNC_EVERY == 0:
+            self._sum = math.fsum(self._returns)
+            self._squares = math.fsum(r * r for r in self._returns)
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current volatility, or None until `window` returns have been seen."""
+        n = len(self._returns)
+        if n < self.window:
+            return None
+        mean = self._sum / n
+        return math.sqrt(max(self._squares / n - mean * mean, 0.0))
+
+
+class PositionSizer:
+    """
+    Order sizes for every bot of the process from one set of volatility
+    trackers and cached balances.
+
+    Args:
+        target_risk (float): Fraction of equity a one-sigma candle move
+            of the position may cost (0.002 = 0.2%).
+        max_fraction (float): Largest position notional as a fraction of equity.
+        equity (float): Fixed capital to size against instead of the
+            exchange balance (e.g. in demo mode).
+        balance_ttl (float): Seconds a fetched balance is reused.
+    """
+    def __init__(self, target_risk: float = 0.002, max_fraction: float = 0.25, window: int = 20,
+                 equity: Optional[float] = None, balance_ttl: float = 60.0, clock=time.time):
+        self.target_risk = target_risk
+        self.max_fraction = max_fraction
+        self.window = window
+        self.equity = equity
+        self.balance_ttl = balance_ttl
+        self.clock = clock
+        self._vols: Dict[Tuple[str, str], RollingVolatility] = {}
+        self._balances: Dict[tuple, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.balance_fetches = 0
+
+    @classmethod
+    def from_env(cls) -> 'PositionSizer':
+        return cls(
+            target_risk=_env_float('SIZING_TARGET_RISK', 0.002),
+            max_fraction=_env_float('SIZING_MAX_FRACTION', 0.25),
+            window=int(_env_float('SIZING_VOL_WINDOW', 20)),
+            equity=_env_float('SIZING_EQUITY', None),
+            balance_ttl=_env_float('SIZING_BALANCE_TTL', 60.0),
+        )
+
+    def update(self, symbol: str, timeframe: str, timestamps: Sequence[int], closes: Sequence[float]):
+        """
+        Feed a bot's candle series. Only candles from the last one seen
+        onwards are processed, so calling this every cycle with the whole
+        series costs O(new candles).
+        """
+        key = (symbol, timeframe)
+        with self._lock:
+            tracker = self._vols.get(key)
+            if tracker is None:
+                tracker = self._vols[key] = RollingVolatility(self.window)
+            start = 0
+            if tracker.last_ts is not None:
+                # Walk back from the end to the last candle already seen
+                start = len(timestamps)
+                while start > 0 and timestamps[start - 1] >= tracker.last_ts:
+                    start -= 1
+            for ts, close in zip(timestamps[start:], closes[start:]):
+                tracker.update(ts, close)
+
+    def volatility(self, symbol: str, timeframe: str) -> Optional[float]:
+        tracker = self._vols.get((symbol, timeframe))
+        return tracker.value if tracker else None
+
+    def balance(self, exchange, asset: str) -> float:
+        """`asset` balance of the exchange account, fetched at most once per balance_ttl."""
+        client = getattr(exchange, 'client', exchange)
+        key = (getattr(client, 'id', None) or id(client), getattr(client, 'apiKey', None), asset)
+        now = self.clock()
+        cached = self._balances.get(key)
+        if cached is not None and now - cached[1] < self.balance_ttl:
+            return cached[0]
+        value = exchange.get_balance(asset)
+        self.balance_fetches += 1
+        self._balances[key] = (value, now)
+        return value
+
+    def invalidate_balances(self):
+        """Forget cached balances, e.g. after a fill changed them."""
+        self._balances.clear()
+
+    def size(self, symbol: str, timeframe: str, price: float, exchange) -> dict:
+        """
+        Order size for `symbol` at `price`.
+
+        Returns:
+            dict: `amount` (None when volatility or equity is not known yet,
+            0.0 when the size is below the exchange's minimum), plus the
+            volatility, equity and the reason for a missing or capped size.
+        """
+        volatility = self.volatility(symbol, timeframe)
+        result = {'amount': None, 'volatility': volatility, 'equity': None, 'reason': None}
+        if not volatility or price <= 0:
+            result['reason'] = 'volatility not available yet'
+            return result
+        equity = self.equity
+        if equity is None:
+            equity = self.balance(exchange, symbol.split('/')[1])
+        result['equity'] = equity
+        if not equity or equity <= 0:
+            result['reason'] = 'no equity to size against'
+            return result
+        amount = equity * self.target_risk / (volatility * price)
+        cap = equity * self.max_fraction / price
+        if amount > cap:
+            amount, result['reason'] = cap, 'capped at max_fraction of equity'
+        markets = getattr(exchange, 'markets', None)
+        if markets is not None and markets.loaded:
+            try:
+                amount, _ = markets.check_order(symbol, amount, price)
+            except OrderValidationError as e:
+                amount, result['reason'] = 0.0, str(e)
+        result['amount'] = amount
+        return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            vols = {f"{symbol} {timeframe}": tracker.value for (symbol, timeframe), tracker in self._vols.items()}
+        return {
+            'target_risk': self.target_risk,
+            'max_fraction': self.max_fraction,
+            'window': self.window,
+            'equity': self.equity,
+            'volatility': vols,
+            'balance_fetches': self.balance_fetches,
+        }
+
+
+# Shared by every bot in the process
+position_sizer = PositionSizer.from_env()
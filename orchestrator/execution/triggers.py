@@ -0,0 +1,446 @@
+"""
+Price-level triggers: stop-loss, take-profit and trailing stops.
+
+Fixed stop-loss and take-profit levels are kept in sorted per-symbol
+indexes, so a price update only touches the levels it crosses: O(log n + k)
+for n active and k fired triggers. Trailing stops that share a watermark
+(high since creation for sell stops, low for buy stops) are grouped, so a
+new high moves every stop in a group at once instead of one by one; a
+price update costs O(g log n + k) for g groups. Groups merge whenever the
+price makes a new high over them, so g stays small in practice.
+"""
+
+import argparse
+import itertools
+import math
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional
+
+STOP_LOSS = 'stop_loss'
+TAKE_PROFIT = 'take_profit'
+TRAILING_STOP = 'trailing_stop'
+
+
+class Trigger:
+    """A pending exit order that is sent once the price crosses its level."""
+    __slots__ = ('id', 'symbol', 'kind', 'side', 'amount', 'level', 'offset', 'percent',
+                 'group', 'callback', 'created_at', 'fired_price', '_book', '_key')
+
+    def __init__(self, id: int, symbol: str, kind: str, side: str, amount: float,
+                 level: Optional[float] = None, offset: Optional[float] = None,
+                 percent: Optional[float] = None, group: Optional[str] = None,
+                 callback: Optional[Callable] = None):
+        self.id = id
+        self.symbol = symbol
+        self.kind = kind
+        self.side = side
+        self.amount = amount
+        self.level = level
+        self.offset = offset
+        self.percent = percent
+        self.group = group
+        self.callback = callback
+        self.created_at = time.time()
+        self.fired_price = None
+        self._book = None
+        self._key = None
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id, 'symbol': self.symbol, 'kind': self.kind, 'side': self.side,
+            'amount': self.amount, 'level': self.level, 'offset': self.offset,
+            'percent': self.percent, 'group': self.group, 'created_at': self.created_at,
+            'fired_price': self.fired_price,
+        }
+
+
+class _LevelIndex:
+    """
+    Fixed levels that fire when the (transformed) price falls to or below them.
+    Keys are kept ascending, so everything that fires is a tail slice.
+    """
+    def __init__(self, sign: int):
+        # sign=+1 fires on a falling price, -1 (negated levels) on a rising one
+        self.sign = sign
+        self.keys = []
+        self.triggers = {}
+
+    def add(self, trigger: Trigger):
+        key = (self.sign * trigger.level, trigger.id)
+        insort(self.keys, key)
+        self.triggers[key] = trigger
+        trigger._book, trigger._key = self, key
+
+    def remove(self, trigger: Trigger):
+        i = bisect_left(self.keys, trigger._key)
+        if i < len(self.keys) and self.keys[i] == trigger._key:
+            del self.keys[i]
+        self.triggers.pop(trigger._key, None)
+
+    def crossed(self, price: float) -> List[Trigger]:
+        i = bisect_left(self.keys, (self.sign * price, -1))
+        if i == len(self.keys):
+            return []
+        fired = [self.triggers.pop(key) for key in self.keys[i:]]
+        del self.keys[i:]
+        return fired
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class _TrailingGroup:
+    __slots__ = ('watermark', 'keys', 'triggers')
+
+    def __init__(self, watermark: float):
+        self.watermark = watermark
+        # (-distance, id): the stops with the smallest distance fire first and sit at the tail
+        self.keys = []
+        self.triggers = {}
+
+
+class _TrailingIndex:
+    """
+    Trailing stops in a transformed price space x where every stop fires when
+    x <= watermark - distance and the watermark is the highest x seen since
+    the stop was created. Sell stops use x = price (buy stops x = -price);
+    percentage stops work on log prices so their distance is constant.
+    """
+    def __init__(self, sign: int, log_space: bool):
+        self.sign = sign
+        self.log_space = log_space
+        # Ordered by watermark, lowest first
+        self.groups: List[_TrailingGroup] = []
+
+    def transform(self, price: float) -> float:
+        return self.sign * (math.log(price) if self.log_space else price)
+
+    def distance(self, trigger: Trigger) -> float:
+        if not self.log_space:
+            return trigger.offset
+        if self.sign > 0:
+            return -math.log(1 - trigger.percent)
+        return math.log(1 + trigger.percent)
+
+    def add(self, trigger: Trigger, price: float):
+        # The new stop joins the group at its watermark or starts its own; other
+        # stops only move with prices fed to crossed()
+        x = self.transform(price)
+        i = 0
+        while i < len(self.groups) and self.groups[i].watermark < x:
+            i += 1
+        if i < len(self.groups) and self.groups[i].watermark == x:
+            group = self.groups[i]
+        else:
+            group = _TrailingGroup(x)
+            self.groups.insert(i, group)
+        key = (-self.distance(trigger), trigger.id)
+        insort(group.keys, key)
+        group.triggers[key] = trigger
+        trigger._book, trigger._key = self, (group, key)
+
+    def remove(self, trigger: Trigger):
+        group, key = trigger._key
+        i = bisect_left(group.keys, key)
+        if i < len(group.keys) and group.keys[i] == key:
+            del group.keys[i]
+        group.triggers.pop(key, None)
+        if not group.keys and group in self.groups:
+            self.groups.remove(group)
+
+    def _raise(self, x: float):
+        """Lift every group whose watermark is below x to x, merging them."""
+        lifted = []
+        while self.groups and self.groups[0].watermark < x:
+            lifted.append(self.groups.pop(0))
+        if not lifted:
+            return
+        if self.groups and self.groups[0].watermark == x:
+            lifted.append(self.groups.pop(0))
+        # Merge the smaller groups into the largest one
+        lifted.sort(key=lambda g: len(g.keys))
+        target = lifted.pop()
+        for group in lifted:
+            for key in group.keys:
+                insort(target.keys, key)
+                trigger = group.triggers[key]
+                target.triggers[key] = trigger
+                trigger._key = (target, key)
+        target.watermark = x
+        self.groups.insert(0, target)
+
+    def crossed(self, price: float) -> List[Trigger]:
+        x = self.transform(price)
+        self._raise(x)
+        fired = []
+        for group in list(self.groups):
+            # Fires when -distance >= x - watermark
+            i = bisect_left(group.keys, (x - group.watermark, -1))
+            if i == len(group.keys):
+                continue
+            for key in group.keys[i:]:
+                fired.append(group.triggers.pop(key))
+            del group.keys[i:]
+            if not group.keys:
+                self.groups.remove(group)
+        return fired
+
+    def _price(self, x: float) -> float:
+        return math.exp(self.sign * x) if self.log_space else self.sign * x
+
+    def stop_price(self, trigger: Trigger) -> float:
+        """Current stop price of a trailing trigger."""
+        group, key = trigger._key
+        return self._price(group.watermark + key[0])
+
+    def watermark(self, trigger: Trigger) -> float:
+        """Best price seen since the trailing trigger was created."""
+        return self._price(trigger._key[0].watermark)
+
+    def __len__(self):
+        return sum(len(g.keys) for g in self.groups)
+
+
+class _SymbolBook:
+    def __init__(self):
+        self.falling = _LevelIndex(+1)
+        self.rising = _LevelIndex(-1)
+        self.trailing = {
+            ('sell', False): _TrailingIndex(+1, False),
+            ('sell', True): _TrailingIndex(+1, True),
+            ('buy', False): _TrailingIndex(-1, False),
+            ('buy', True): _TrailingIndex(-1, True),
+        }
+        self.last_price = None
+
+    def indexes(self):
+        return [self.falling, self.rising] + list(self.trailing.values())
+
+
+class TriggerEngine:
+    """
+    Holds price triggers for any number of symbols.
+
+    Call `on_price(symbol, price)` on every price update; crossed triggers
+    are removed, passed to their own callback (or else the engine's
+    `on_fire`) as `callback(trigger, price)` and returned. Triggers
+    that share a `group` are one-cancels-other: when one fires, the rest of
+    the group is cancelled (e.g. the stop-loss and take-profit of a position).
+    """
+    def __init__(self, on_fire: Optional[Callable[[Trigger, float], None]] = None):
+        self.on_fire = on_fire
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._books: Dict[str, _SymbolBook] = {}
+        self._triggers: Dict[int, Trigger] = {}
+        self._groups: Dict[str, set] = {}
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+        return book
+
+    def _register(self, trigger: Trigger):
+        self._triggers[trigger.id] = trigger
+        if trigger.group is not None:
+            self._groups.setdefault(trigger.group, set()).add(trigger.id)
+
+    def add_stop_loss(self, symbol: str, side: str, amount: float, level: float,
+                      group: Optional[str] = None, callback: Optional[Callable] = None) -> Trigger:
+        """
+        Exit with a `side` order once the price moves against the position
+        to `level` (sell side: price <= level, buy side: price >= level).
+        """
+        return self._add_level(symbol, STOP_LOSS, side, amount, level, group, callback)
+
+    def add_take_profit(self, symbol: str, side: str, amount: float, level: float,
+                        group: Optional[str] = None, callback: Optional[Callable] = None) -> Trigger:
+        """
+        Exit with a `side` order once the price reaches the profit target
+        (sell side: price >= level, buy side: price <= level).
+        """
+        return self._add_level(symbol, TAKE_PROFIT, side, amount, level, group, callback)
+
+    def _add_level(self, symbol, kind, side, amount, level, group, callback) -> Trigger:
+        _check_side(side)
+        if level <= 0:
+            raise ValueError("Trigger level must be positive.")
+        with self._lock:
+            trigger = Trigger(
+                next(self._ids), symbol, kind, side, amount, level=level, group=group, callback=callback
+            )
+            book = self._book(symbol)
+            falls = (kind == STOP_LOSS) == (side == 'sell')
+            (book.falling if falls else book.rising).add(trigger)
+            self._register(trigger)
+            return trigger
+
+    def add_trailing_stop(self, symbol: str, side: str, amount: float, price: float,
+                          offset: Optional[float] = None, percent: Optional[float] = None,
+                          group: Optional[str] = None, callback: Optional[Callable] = None) -> Trigger:
+        """
+        Trailing stop that follows the best price since creation at a fixed
+        `offset` (price units) or `percent` (e.g. 0.02 for 2%) distance.
+
+        Args:
+            price (float): Current price, the initial watermark.
+        """
+        _check_side(side)
+        if (offset is None) == (percent is None):
+            raise ValueError("Give exactly one of offset or percent.")
+        if offset is not None and offset <= 0:
+            raise ValueError("offset must be positive.")
+        if percent is not None and not 0 < percent < 1:
+            raise ValueError("percent must be between 0 and 1.")
+        with self._lock:
+            trigger = Trigger(
+                next(self._ids), symbol, TRAILING_STOP, side, amount,
+                offset=offset, percent=percent, group=group, callback=callback
+            )
+            self._book(symbol).trailing[(side, percent is not None)].add(trigger, price)
+            self._register(trigger)
+            return trigger
+
+    def cancel(self, trigger_id: int) -> bool:
+        with self._lock:
+            return self._cancel(trigger_id)
+
+    def _cancel(self, trigger_id: int) -> bool:
+        trigger = self._triggers.pop(trigger_id, None)
+        if trigger is None:
+            return False
+        trigger._book.remove(trigger)
+        if trigger.group is not None:
+            members = self._groups.get(trigger.group)
+            if members is not None:
+                members.discard(trigger_id)
+                if not members:
+                    del self._groups[trigger.group]
+        return True
+
+    def cancel_group(self, group: str) -> int:
+        with self._lock:
+            ids = list(self._groups.get(group, ()))
+            for trigger_id in ids:
+                self._cancel(trigger_id)
+            return len(ids)
+
+    def on_price(self, symbol: str, price: float) -> List[Trigger]:
+        """Feed a price update; returns the triggers it fired."""
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None:
+                return []
+            book.last_price = price
+            crossed = []
+            for index in book.indexes():
+                if len(index):
+                    crossed.extend(index.crossed(price))
+            # One-cancels-other: at most one trigger per group fires, even when
+            # several of its members cross on the same tick
+            fired = []
+            groups = set()
+            for trigger in sorted(crossed, key=lambda t: t.id):
+                self._triggers.pop(trigger.id, None)
+                if trigger.group is not None:
+                    if trigger.group in groups:
+                        continue
+                    groups.add(trigger.group)
+                trigger.fired_price = price
+                fired.append(trigger)
+            for group in groups:
+                for sibling in list(self._groups.pop(group, ())):
+                    if sibling in self._triggers:
+                        self._cancel(sibling)
+        for trigger in fired:
+            callback = trigger.callback or self.on_fire
+            if callback is None:
+                continue
+            try:
+                callback(trigger, price)
+            except Exception as e:
+                print(f"Trigger {trigger.id} callback failed: {e}")
+        return fired
+
+    def active(self, symbol: Optional[str] = None, group: Optional[str] = None) -> List[dict]:
+        """Pending triggers as dicts; trailing stops report their current stop price as `level`."""
+        with self._lock:
+            if group is not None:
+                triggers = [self._triggers[i] for i in sorted(self._groups.get(group, ()))]
+            else:
+                triggers = list(self._triggers.values())
+            result = []
+            for trigger in triggers:
+                if symbol is not None and trigger.symbol != symbol:
+                    continue
+                info = trigger.to_dict()
+                if trigger.kind == TRAILING_STOP:
+                    info['level'] = trigger._book.stop_price(trigger)
+                    info['watermark'] = trigger._book.watermark(trigger)
+                result.append(info)
+            return result
+
+    def __len__(self):
+        return len(self._triggers)
+
+
+def _check_side(side: str):
+    if side not in ('buy', 'sell'):
+        raise ValueError(f"Invalid order side: {side}")
+
+
+# Shared by every bot in the process
+trigger_engine = TriggerEngine()
+
+
+def benchmark(symbols: int = 20, triggers: int = 10000, ticks: int = 100000, seed: int = 1) -> dict:
+    """Feed a synthetic random-walk tick stream through an engine full of triggers."""
+    rng = random.Random(seed)
+    engine = TriggerEngine()
+    names = [f"SYM{i}/USDT" for i in range(symbols)]
+    prices = {name: 100.0 for name in names}
+
+    def add_random(name):
+        price = prices[name]
+        kind = rng.random()
+        side = rng.choice(('buy', 'sell'))
+        if kind < 0.4:
+            engine.add_stop_loss(name, side, 1.0, price * (1 - rng.uniform(0.001, 0.05) * (1 if side == 'sell' else -1)))
+        elif kind < 0.8:
+            engine.add_take_profit(name, side, 1.0, price * (1 + rng.uniform(0.001, 0.05) * (1 if side == 'sell' else -1)))
+        else:
+            engine.add_trailing_stop(name, side, 1.0, price, percent=rng.uniform(0.001, 0.05))
+
+    for _ in range(triggers):
+        add_random(rng.choice(names))
+    fired = 0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        name = names[rng.randrange(symbols)]
+        prices[name] *= math.exp(rng.gauss(0, 0.0005))
+        hits = engine.on_price(name, prices[name])
+        fired += len(hits)
+        for _ in hits:
+            add_random(name)
+    elapsed = time.perf_counter() - started
+    return {
+        'ticks': ticks,
+        'active_triggers': len(engine),
+        'fired': fired,
+        'seconds': round(elapsed, 3),
+        'ticks_per_second': round(ticks / elapsed),
+        'us_per_tick': round(elapsed / ticks * 1e6, 2),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the trigger engine with synthetic ticks.")
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--triggers', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=100000)
+    options = parser.parse_args()
+    print(benchmark(options.symbols, options.triggers, options.ticks))
@@ -1,5 +1,4 @@
 import os
-import requests
 from typing import Optional
 
 # Load environment variables
@@ -28,6 +27,7 @@ def send_slack_message(text: str, channel: Optional[str] = None) -> bool:
         return False
 
     try:
+        import requests
         response = requests.post(
             SLACK_WEBHOOK_URL, json={"text": text}, timeout=5
         )
@@ -0,0 +1,273 @@
+"""
+Load test of the orchestrator API under dashboard polling.
+
+Simulates N open bot-control dashboards, each loading the page and then
+polling like bot_control.html does (GET /bot-status every 1s,
+GET /bot-logs every 2s with the last seen seq, GET /price-feed?max_points=30
+every 5s) and now and then sending a control action (POST /bot-control,
+the Start button, then following the command; a start while running is
+a no-op). All dashboards start at random offsets so their polls do not
+line up.
+
+By default the app is served in-process by uvicorn with the dashboard's
+bot running against a SimulatedExchange, its 10s cycle sped up by
+`--speed`, so the run needs no network or credentials and measures the
+bot-cycle jitter caused by the API load. `--url` targets a running
+server instead (nothing is started or stopped there then).
+
+    python -m orchestrator.loadtest --dashboards 50 --duration 30
+
+The report has requests/s, latency percentiles per endpoint, how late
+polls went out against their schedule and the bot's cycle periods.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# The dashboard's polling intervals (seconds), from bot_control.html
+STATUS_INTERVAL = 1.0
+LOGS_INTERVAL = 2.0
+PRICE_FEED_INTERVAL = 5.0
+CHART_MAX_POINTS = 30
+# Nominal sleep between bot cycles (TradingBot.run)
+BOT_CYCLE_SLEEP = 10.0
+
+
+class ScaledClock:
+    """`time`-like clock whose sleeps last 1/speed of the requested time."""
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(max(0.0, seconds) / self.speed)
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': round(float(p50), 2), 'p95': round(float(p95), 2),
+            'p99': round(float(p99), 2), 'max': round(float(max(values)), 2)}
+
+
+class Recorder:
+    """Latencies (ms) and errors per endpoint, plus how late each poll was sent."""
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.lateness: List[float] = []
+
+    def add(self, endpoint: str, started: float, ok: bool):
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, seconds: float) -> dict:
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            'requests': total,
+            'errors': sum(self.errors.values()),
+            'requests_per_second': round(total / seconds, 1) if seconds else None,
+            'endpoints': {
+                endpoint: dict(_percentiles(values), requests=len(values), errors=self.errors[endpoint])
+                for endpoint, values in sorted(self.latencies.items())
+            },
+            'poll_lateness_ms': _percentiles(self.lateness),
+        }
+
+
+async def _request(client, recorder: Recorder, endpoint: str, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        recorder.add(endpoint, started, response.status_code < 400)
+        return response
+    except Exception:
+        recorder.add(endpoint, started, False)
+        return None
+
+
+async def _every(interval: float, offset: float, deadline: float, recorder: Recorder, action):
+    """Run `action` every `interval` seconds like setInterval, recording how late each run starts."""
+    loop = asyncio.get_running_loop()
+    due = loop.time() + offset
+    while due < deadline:
+        await asyncio.sleep(max(0.0, due - loop.time()))
+        recorder.lateness.append((loop.time() - due) * 1000)
+        await action()
+        due += interval
+
+
+async def _dashboard(client, recorder: Recorder, deadline: float, rng: random.Random,
+                     control_interval: Optional[float]):
+    last_seq = {'value': None}
+
+    async def status():
+        await _request(client, recorder, 'GET /bot-status', 'GET', '/bot-status')
+
+    async def logs():
+        params = {} if last_seq['value'] is None else {'after_seq': last_seq['value']}
+        response = await _request(client, recorder, 'GET /bot-logs', 'GET', '/bot-logs', params=params)
+        if response is not None and response.status_code == 200:
+            last_seq['value'] = response.json().get('last_seq', last_seq['value'])
+
+    async def price_feed():
+        await _request(client, recorder, 'GET /price-feed', 'GET', '/price-feed',
+                       params={'max_points': CHART_MAX_POINTS})
+
+    async def control():
+        response = await _request(client, recorder, 'POST /bot-control', 'POST', '/bot-control')
+        if response is not None and response.status_code == 202:
+            command = response.json()['command']
+            await _request(client, recorder, 'GET /bot-commands/{id}', 'GET', f"/bot-commands/{command['id']}")
+
+    await _request(client, recorder, 'GET /bot-control (page)', 'GET', '/bot-control')
+    loops = [
+        _every(STATUS_INTERVAL, rng.uniform(0, STATUS_INTERVAL), deadline, recorder, status),
+        _every(LOGS_INTERVAL, rng.uniform(0, LOGS_INTERVAL), deadline, recorder, logs),
+        _every(PRICE_FEED_INTERVAL, rng.uniform(0, PRICE_FEED_INTERVAL), deadline, recorder, price_feed),
+    ]
+    if control_interval:
+        loops.append(_every(control_interval, rng.uniform(0, control_interval), deadline, recorder, control))
+    await asyncio.gather(*loops)
+
+
+async def _drive(url: str, dashboards: int, duration: float, control_interval: Optional[float],
+                 seed: int) -> dict:
+    import httpx
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=dashboards * 4, max_keepalive_connections=dashboards * 4)
+    async with httpx.AsyncClient(base_url=url, timeout=30, limits=limits) as client:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + duration
+        await asyncio.gather(*(
+            _dashboard(client, recorder, deadline, rng, control_interval) for _ in range(dashboards)
+        ))
+        elapsed = loop.time() - started
+    return recorder.report(elapsed)
+
+
+class _BotCycles:
+    """Collects the start time of each bot cycle from its log hook."""
+    def __init__(self):
+        self.starts: List[float] = []
+
+    def on_log(self, entry: dict):
+        if entry.get('message') == '--- New Bot Run ---':
+            self.starts.append(time.perf_counter())
+
+    def report(self, speed: float) -> dict:
+        periods = np.diff(self.starts) * 1000 if len(self.starts) > 1 else []
+        nominal = BOT_CYCLE_SLEEP / speed * 1000
+        # Time a cycle took beyond its sleep: the bot's own work plus any stalls from the load
+        overruns = [p - nominal for p in periods]
+        return {
+            'cycles': len(self.starts),
+            'nominal_period_ms': round(nominal, 2),
+            'period_ms': _percentiles(list(periods)),
+            'overrun_ms': _percentiles(overruns),
+            'jitter_ms': round(float(np.std(periods)), 2) if len(periods) > 1 else None,
+        }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _simulated_bot_factory(speed: float, cycles: _BotCycles):
+    from orchestrator.bots.manager import TradingBot
+    from orchestrator.data.hub import MarketDataHub
+    from orchestrator.exchange.binance import BinanceClient
+    from orchestrator.exchange.simulated import SimulatedExchange
+
+    def factory(stop_event):
+        clock = ScaledClock(speed)
+        simulated = SimulatedExchange(volatility=0.001, clock=clock)
+        return TradingBot(
+            stop_event=stop_event, exchange=BinanceClient(validate='none', client=simulated),
+            hub=MarketDataHub(client_factory=lambda: simulated, clock=clock.time), clock=clock,
+            notify=None, min_vol=0.0, checkpoints=False, journal=False, config=False,
+            on_log=cycles.on_log,
+        )
+    return factory
+
+
+def run_load_test(dashboards: int = 20, duration: float = 30.0, url: Optional[str] = None,
+                  speed: float = 20.0, control_interval: Optional[float] = 30.0, seed: int = 0) -> dict:
+    """
+    Run the load test and return the report. Without `url`, serves the app
+    in this process and runs the dashboard bot on a simulated exchange.
+    """
+    if url is not None:
+        report = asyncio.run(_drive(url, dashboards, duration, control_interval, seed))
+        return dict(report, dashboards=dashboards, duration=duration, url=url)
+
+    import uvicorn
+    from orchestrator import main
+
+    cycles = _BotCycles()
+    supervisor = main.bot_supervisor
+    original_factory = supervisor.bot_factory
+    supervisor.bot_factory = _simulated_bot_factory(speed, cycles)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, name='loadtest-server', daemon=True)
+    thread.start()
+    try:
+        deadline = time.time() + 30
+        while not server.started and time.time() < deadline:
+            time.sleep(0.05)
+        if not server.started:
+            raise RuntimeError("The API server did not start")
+        supervisor.submit('start')
+        deadline = time.time() + 30
+        while not supervisor.is_running and time.time() < deadline:
+            time.sleep(0.05)
+        report = asyncio.run(_drive(f"http://127.0.0.1:{port}", dashboards, duration, control_interval, seed))
+    finally:
+        supervisor.submit('stop')
+        deadline = time.time() + 30
+        while supervisor.status()['state'] != 'stopped' and time.time() < deadline:
+            time.sleep(0.05)
+        supervisor.bot_factory = original_factory
+        server.should_exit = True
+        thread.join(timeout=10)
+    return dict(report, dashboards=dashboards, duration=duration, bot=cycles.report(speed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulate dashboards polling the orchestrator API.")
+    parser.add_argument('--dashboards', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run")
+    parser.add_argument('--url', help="Target a running server instead of starting one")
+    parser.add_argument('--speed', type=float, default=20.0,
+                        help="Speed-up of the simulated bot's cycle sleep (in-process mode)")
+    parser.add_argument('--control-interval', type=float, default=30.0,
+                        help="Seconds between control actions per dashboard (0 = none)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Also write the report to this JSON file")
+    options = parser.parse_args()
+    result = run_load_test(options.dashboards, options.duration, options.url, options.speed,
+                           options.control_interval or None, options.seed)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text + '\n')
@@ -1,3 +1,14 @@
+import time
+_startup_t0 = time.perf_counter()
+startup_report = {'phases': {}}
+
+def _mark_startup_phase(name):
+    """Record how long the startup phase ending now took (in milliseconds)."""
+    now = time.perf_counter()
+    last = startup_report.setdefault('_last', _startup_t0)
+    startup_report['phases'][name] = round((now - last) * 1000, 1)
+    startup_report['_last'] = now
+
 from dotenv import load_dotenv
 try:
     # Try to load .env file but don't fail if it can't be loaded
@@ -11,6 +22,7 @@ except Exception as e:
 # Environment variables should now be loaded from .env file
 import os
 print(f"API Key loaded: {os.environ.get('binanceusdt_api_key', 'Not Found')[:5]}...")
+_mark_startup_phase('dotenv')
 
 from fastapi import FastAPI, Request, Form, BackgroundTasks, Query
 from fastapi.responses import HTMLResponse, JSONResponse
@@ -18,26 +30,32 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from orchestrator.workflows import run_sample_workflow, COINS
-from orchestrator.mcp_client import get_new_sheet_rows
 from orchestrator.bots.manager import (
     TradingBot, bot_logs, bot_logs_history, log_categories, 
-    LOG_DIR, last_bot_run_data, last_bot_run_data_lock
+    last_bot_run_data, last_bot_run_data_lock, log_archive
 )
 import logging
 import threading
-import requests
 import sys
-import numpy as np
-import json
-from orchestrator.exchange.binance import BinanceClient
+from orchestrator.data.candles import get_aggregator, list_aggregators, BASE_TIMEFRAME
+from orchestrator.data.hub import market_data_hub
+from orchestrator.data.downsample import ChartViewCache
+from orchestrator.bots.shards import ShardSupervisor, configs_from_env
+from orchestrator.bots.supervisor import BotSupervisor
 from typing import List, Optional
+from contextlib import asynccontextmanager
 import atexit
 import signal
-import psutil
-import time
 import copy
+# psutil, requests, httpx and the MCP SDK are imported inside the handlers that use them
+_mark_startup_phase('imports')
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    report_startup_time()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware to allow requests from any origin
 app.add_middleware(
@@ -70,50 +88,30 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 #         'no_data': True  # Flag to indicate no real data is available
 #     }
 
-bot_status = {
-    'last_action': 'Bot not run yet.',
-    'last_result': None,
-    'last_error': None,
-    'is_running': False
-}
+# The dashboard's bot: control endpoints queue commands, the supervisor applies them
+bot_supervisor = BotSupervisor(lambda stop_event: TradingBot(stop_event=stop_event))
 
-bot_thread = None
-stop_event = threading.Event()
-bot_thread_lock = threading.Lock()  # Add this lock for thread safety
+# Sharded mode: bots run in worker processes (see orchestrator/bots/shards.py)
+shard_supervisor = None
+shard_supervisor_lock = threading.Lock()
 
 
-def bot_runner():
-    global stop_event, bot_status
-    print("Bot runner started")
-    bot = TradingBot(stop_event=stop_event)
-    try:
-        bot.run()
-        print("Bot run() finished")
-        if not stop_event.is_set():
-            bot_status['last_action'] = 'Bot run successfully.'
-            bot_status['last_result'] = 'Check Slack for trade actions and logs.'
-            bot_status['last_error'] = None
-    except Exception as e:
-        print(f"Exception in bot_runner: {e}")
-        bot_status['last_action'] = 'Bot run failed.'
-        bot_status['last_result'] = None
-        bot_status['last_error'] = str(e)
-    finally:
-        with bot_thread_lock:
-            bot_status['is_running'] = False
-        stop_event.clear()
+def checkpoint_active_bot():
+    """Write a final checkpoint before the process exits without stopping the bot."""
+    bot_supervisor.checkpoint()
 
 @app.get("/", response_class=HTMLResponse)
 def read_root(request: Request):
-    return templates.TemplateResponse("prices.html", {"request": request, "coins": COINS, "price": None, "selected": "BTC"})
+    return templates.TemplateResponse(request, "prices.html", {"request": request, "coins": COINS, "price": None, "selected": "BTC"})
 
 @app.get("/prices", response_class=HTMLResponse)
 def prices(request: Request):
-    return templates.TemplateResponse("prices.html", {"request": request, "coins": COINS, "price": None, "selected": "BTC"})
+    return templates.TemplateResponse(request, "prices.html", {"request": request, "coins": COINS, "price": None, "selected": "BTC"})
 
 @app.post("/get-price", response_class=JSONResponse)
 def get_price(symbol: str = Form(...)):
     try:
+        from orchestrator.mcp_client import get_new_sheet_rows
         coin_row = get_new_sheet_rows(symbol)
         price = coin_row[1]
         # If price is a list, extract the first element
@@ -136,163 +134,133 @@ def run_workflow(symbol: str = Form("BTC")):
 @app.get("/bot-control", response_class=HTMLResponse)
 def bot_control(request: Request):
     return templates.TemplateResponse(
+        request,
         "bot_control.html",
         {
             "request": request, 
-            "bot_status": bot_status, 
-            "bot_logs": bot_logs,
+            "bot_status": bot_supervisor.status(), 
+            "bot_logs": list(bot_logs),
             "log_categories": log_categories
         }
     )
 
-@app.post("/bot-control", response_class=HTMLResponse)
-def run_bot(request: Request):
-    global bot_thread, stop_event
-    
-    # Thread-safe check and update
-    with bot_thread_lock:
-        if bot_status['is_running']:
-            # Bot is already running, let's update the status message
-            bot_status['last_action'] = 'Bot is already running.'
-            bot_status['last_result'] = 'Only one bot instance allowed at a time.'
-            bot_status['last_error'] = None
-            
-            return templates.TemplateResponse(
-                "bot_control.html",
-                {
-                    "request": request, 
-                    "bot_status": bot_status, 
-                    "bot_logs": bot_logs,
-                    "log_categories": log_categories
-                }
-            )
-    
-        # Make sure stop_event is cleared
-        stop_event.clear()
-        
-        # Check if the thread exists and is still alive
-        if bot_thread and bot_thread.is_alive():
-            # Something's wrong - thread is alive but status says not running
-            bot_status['last_action'] = 'Inconsistent bot state detected.'
-            bot_status['last_result'] = 'Resetting state and starting new bot instance.'
-            bot_status['last_error'] = None
-            
-            # Force thread to stop
-            stop_event.set()
-            try:
-                bot_thread.join(timeout=2.0)  # Wait up to 2 seconds for thread to complete
-            except:
-                pass
-                
-        # Start a new thread
-        bot_thread = threading.Thread(target=bot_runner, daemon=True)
-        bot_thread.start()
-        
-        # Update status
-        bot_status['is_running'] = True
-        bot_status['last_action'] = 'Bot started.'
-        bot_status['last_result'] = 'Bot is running in the background.'
-        bot_status['last_error'] = None
-    
-    return templates.TemplateResponse(
-        "bot_control.html",
-        {
-            "request": request, 
-            "bot_status": bot_status, 
-            "bot_logs": bot_logs,
-            "log_categories": log_categories
-        }
+def _queue_bot_command(action: str):
+    """Queue a start/stop command and answer 202 right away; progress shows in /bot-status."""
+    try:
+        command = bot_supervisor.submit(action)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return JSONResponse(
+        status_code=202, 
+        content={"command": command, "status": bot_supervisor.status()}
     )
 
-@app.post("/stop-bot", response_class=HTMLResponse)
-def stop_bot(request: Request):
-    global stop_event, bot_thread
-    
-    with bot_thread_lock:
-        if bot_status['is_running'] or (bot_thread and bot_thread.is_alive()):
-            # Set stop event
-            stop_event.set()
-            
-            # Update status immediately to prevent race conditions
-            bot_status['is_running'] = False
-            bot_status['last_action'] = 'Stop signal sent to bot.'
-            bot_status['last_result'] = 'Bot will stop as soon as possible.'
-            bot_status['last_error'] = None
-            
-            # Attempt to wait for thread to complete
-            if bot_thread and bot_thread.is_alive():
-                try:
-                    bot_thread.join(timeout=2.0)  # Wait up to 2 seconds
-                    if not bot_thread.is_alive():
-                        bot_status['last_result'] = 'Bot has been stopped successfully.'
-                    else:
-                        # Thread is still alive after timeout
-                        bot_status['last_error'] = 'Bot thread did not terminate within timeout.'
-                except:
-                    bot_status['last_error'] = 'Failed to wait for bot thread to complete.'
-        else:
-            bot_status['last_action'] = 'No bot is currently running.'
-            bot_status['last_result'] = None 
-            bot_status['last_error'] = None
-        
-    return templates.TemplateResponse(
-        "bot_control.html",
-        {
-            "request": request, 
-            "bot_status": bot_status, 
-            "bot_logs": bot_logs,
-            "log_categories": log_categories
-        }
+@app.post("/bot-control", response_class=JSONResponse)
+async def run_bot(action: str = "start"):
+    """Start the bot (or stop it with ?action=stop)."""
+    return _queue_bot_command(action)
+
+@app.post("/stop-bot", response_class=JSONResponse)
+async def stop_bot():
+    return _queue_bot_command('stop')
+
+@app.get("/bot-commands/{command_id}", response_class=JSONResponse)
+async def get_bot_command(command_id: str):
+    command = bot_supervisor.command(command_id)
+    if command is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown command {command_id}"})
+    return command
+
+def _append_shard_log(entry):
+    """Collect a log entry forwarded by a shard worker into the dashboard logs."""
+    bot_logs.append(entry)
+
+@app.post("/shards/start", response_class=JSONResponse)
+def start_shards():
+    """
+    Start sharded mode: the bots listed in BOT_SYMBOLS are partitioned by
+    symbol across BOT_SHARDS worker processes (default: one per CPU core).
+    """
+    global shard_supervisor
+    with shard_supervisor_lock:
+        if shard_supervisor is not None and shard_supervisor.running:
+            return {"message": "Sharded bots are already running.", **shard_supervisor.status()}
+        try:
+            num_shards = int(os.getenv('BOT_SHARDS', '0')) or None
+            shard_supervisor = ShardSupervisor(
+                configs_from_env(), num_shards=num_shards, log_sink=_append_shard_log
+            )
+            shard_supervisor.start()
+        except Exception as e:
+            return JSONResponse(status_code=500, content={"error": f"Failed to start shards: {e}"})
+        return {"message": "Sharded bots started.", **shard_supervisor.status()}
+
+@app.post("/shards/stop", response_class=JSONResponse)
+def stop_shards():
+    """Stop sharded mode in the background and answer 202; /shards/status shows when it is done."""
+    with shard_supervisor_lock:
+        supervisor = shard_supervisor
+        if supervisor is None or not supervisor.running:
+            return {"message": "No sharded bots are running."}
+    # Workers get up to 20s to finish their cycle; neither the request nor the lock waits for them
+    threading.Thread(target=supervisor.stop, name="shard-stop", daemon=True).start()
+    return JSONResponse(
+        status_code=202,
+        content={"message": "Stopping sharded bots.", **supervisor.status()}
     )
 
+@app.get("/shards/status", response_class=JSONResponse)
+def get_shards_status():
+    if shard_supervisor is None:
+        return {"running": False, "num_shards": 0, "shards": {}}
+    return shard_supervisor.status()
+
+@app.get("/shards/chart", response_class=JSONResponse)
+def get_shard_chart(symbol: str = "BTC/USDT", timeframe: Optional[str] = None):
+    """Chart data for one bot, read from the shard's shared memory block."""
+    data = shard_supervisor.chart(symbol, timeframe) if shard_supervisor is not None else None
+    if data is None:
+        where = f"{symbol}@{timeframe}" if timeframe else symbol
+        return JSONResponse(
+            status_code=404, 
+            content={"error": f"No sharded chart data for {where}"}
+        )
+    return data
+
 @app.get("/bot-logs", response_class=JSONResponse)
-def get_bot_logs(category: Optional[str] = None):
+def get_bot_logs(
+    category: Optional[str] = None, 
+    after_seq: Optional[int] = Query(None, ge=0)
+):
     """
-    Get current bot logs with optional category filtering
+    Get current bot logs (newest first) with optional category filtering.
+
+    Pass the `last_seq` of the previous response as `after_seq` to get only
+    entries added since then. If the client can't continue from `after_seq`
+    (the server restarted, or entries it never saw were already dropped),
+    all buffered entries are returned with `reset: true`.
     """
-    if category and category in log_categories:
-        filtered_logs = [log for log in bot_logs if log["category"] == category]
-        return {"logs": filtered_logs[::-1]}  # Reverse order (newest first)
-    
-    return {"logs": bot_logs[::-1]}  # Return logs in reverse order (newest first)
+    if category not in log_categories:
+        category = None
+    last_seq = bot_logs.last_seq
+    reset = after_seq is not None and (
+        after_seq > last_seq or after_seq < bot_logs.first_seq - 1
+    )
+    logs = bot_logs.since(0 if reset else (after_seq or 0), category)
+    return {"logs": logs[::-1], "last_seq": last_seq, "reset": reset}
 
 @app.get("/bot-logs-history", response_class=JSONResponse)
 def get_bot_logs_history():
     """
-    Get list of available log files
+    Get list of archived log files (from the archive manifest, newest first)
     """
     try:
-        log_files = []
-        for filename in os.listdir(LOG_DIR):
-            if filename.startswith("bot_logs_") and filename.endswith(".json"):
-                file_path = os.path.join(LOG_DIR, filename)
-                # Extract better date format from filename (YYYYMMDD_HHMMSS)
-                parts = filename.split("_")
-                if len(parts) >= 3:
-                    date_part = parts[2]
-                    time_part = parts[3].split(".")[0] if len(parts) > 3 else "000000"
-                    
-                    # Format: YYYYMMDD_HHMMSS
-                    if len(date_part) == 8 and len(time_part) == 6:
-                        year = date_part[0:4]
-                        month = date_part[4:6]
-                        day = date_part[6:8]
-                        hour = time_part[0:2]
-                        minute = time_part[2:4]
-                        second = time_part[4:6]
-                        
-                        formatted_date = f"{year}-{month}-{day} {hour}:{minute}:{second}"
-                    else:
-                        formatted_date = f"{date_part}_{time_part}"
-                else:
-                    formatted_date = filename.replace("bot_logs_", "").replace(".json", "")
-                
-                log_files.append({
-                    "filename": filename,
-                    "date": formatted_date,
-                    "size": os.path.getsize(file_path)
-                })
-        return {"log_files": sorted(log_files, key=lambda x: x["filename"], reverse=True)}
+        log_files = [
+            {"filename": segment["filename"], "date": segment["date"], "size": segment["size"],
+             "entries": segment["entries"]}
+            for segment in log_archive.list()
+        ]
+        return {"log_files": log_files, "archive": log_archive.stats()}
     except Exception as e:
         return JSONResponse(
             status_code=500, 
@@ -300,24 +268,21 @@ def get_bot_logs_history():
         )
 
 @app.get("/bot-logs-file/{filename}", response_class=JSONResponse)
-def get_bot_logs_file(filename: str, category: Optional[str] = None):
+def get_bot_logs_file(filename: str, category: Optional[str] = None, limit: Optional[int] = None):
     """
-    Get logs from a specific file with optional category filtering
+    Get logs from a specific archived file with optional category filtering
     """
     try:
-        file_path = os.path.join(LOG_DIR, filename)
-        if not os.path.exists(file_path):
+        if not log_archive.has(filename):
             return JSONResponse(
                 status_code=404, 
                 content={"error": f"Log file {filename} not found"}
             )
-            
-        with open(file_path, 'r') as f:
-            logs = json.load(f)
-            
-        if category and category in log_categories:
-            logs = [log for log in logs if log["category"] == category]
-            
+        if category not in log_categories:
+            category = None
+        logs = list(log_archive.read(filename, category))
+        if limit:
+            logs = logs[-limit:]
         return {"logs": logs[::-1]}  # Reverse order (newest first)
     except Exception as e:
         return JSONResponse(
@@ -333,28 +298,38 @@ def get_log_categories():
     return {"categories": log_categories}
 
 @app.get("/bot-status", response_class=JSONResponse)
-def get_bot_status():
-    return bot_status
+async def get_bot_status():
+    """Bot state (starting / running / stopping / stopped) and recent control commands."""
+    return bot_supervisor.status()
 
 @app.post("/shutdown", response_class=JSONResponse)
-def shutdown(background_tasks: BackgroundTasks):
+async def shutdown(background_tasks: BackgroundTasks):
     """Shutdown both the MCP server and this orchestrator server."""
-    # 1. Shutdown MCP server
+    # 1. Shutdown MCP server, without holding a worker thread while it answers
     try:
-        mcp_url = "http://127.0.0.1:8000/shutdown"
-        requests.post(mcp_url, timeout=2)
+        import httpx
+        async with httpx.AsyncClient(timeout=2) as client:
+            await client.post("http://127.0.0.1:8000/shutdown")
     except Exception as e:
         print(f"Failed to shutdown MCP server: {e}")
-    # 2. Shutdown orchestrator (FastAPI/Uvicorn)
+    # 2. Shutdown orchestrator (FastAPI/Uvicorn) once the response is sent
     def stop_uvicorn():
-        import os
+        checkpoint_active_bot()
         os._exit(0)
     background_tasks.add_task(stop_uvicorn)
     return {"message": "Orchestrator and MCP server shutting down..."}
 
+# Downsampled chart views per data version and zoom level (max_points)
+chart_views = ChartViewCache()
+
 @app.get("/price-feed", response_class=JSONResponse)
-def price_feed():
-    """Return data from the last bot run for chart visualization"""
+def price_feed(max_points: Optional[int] = Query(None, ge=10, le=100000)):
+    """
+    Return data from the last bot run for chart visualization.
+
+    With `max_points`, all series are downsampled (LTTB, signal candles
+    always kept) to about that many points.
+    """
     # global last_bot_run_data # This global refers to the imported last_bot_run_data
     
     with last_bot_run_data_lock: # This is the lock from manager.py
@@ -404,15 +379,226 @@ def price_feed():
         # If we have data, return it (without resetting it)
         # Make a deep copy to prevent accidental modification
         # print("DEBUG /price-feed: Condition NOT MET. Returning actual data.") # Added print
-        data = copy.deepcopy(last_bot_run_data)
+        if max_points:
+            # Cached views are shared between requests; copy before adding fields
+            data = dict(chart_views.get(last_bot_run_data, max_points))
+        else:
+            data = copy.deepcopy(last_bot_run_data)
         
         # Add metadata about the data source
         data['data_source'] = 'Binance API'
-        data['data_count'] = len(data['prices']) if 'prices' in data else 0
+        data['data_count'] = data.get('original_count', len(data['prices']) if 'prices' in data else 0)
         data['timestamp'] = time.time()
         
         return data
 
+@app.get("/candles", response_class=JSONResponse)
+def get_candles(
+    symbol: str = "BTC/USDT", 
+    timeframe: str = BASE_TIMEFRAME, 
+    limit: int = Query(100, ge=1, le=5000)
+):
+    """
+    Return OHLCV candles for a symbol, rolled up from the shared 1m feed.
+    Only symbols that a bot has fetched are available.
+    """
+    if symbol not in list_aggregators():
+        return JSONResponse(
+            status_code=404, 
+            content={"error": f"No candle data for {symbol}. Start a bot on it first."}
+        )
+    aggregator = get_aggregator(symbol)
+    try:
+        aggregator.add_timeframe(timeframe)
+        candles = aggregator.get(timeframe, limit)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "timeframes": aggregator.timeframes,
+        "candles": candles
+    }
+
+@app.get("/screener", response_class=JSONResponse)
+def get_screener(
+    quote: str = "USDT",
+    timeframe: str = "1h",
+    max_symbols: int = Query(50, ge=1, le=1000),
+    top: int = Query(20, ge=1, le=1000),
+    sort_by: str = "volatility",
+    min_volatility: Optional[float] = None
+):
+    """
+    Rank the markets quoted in `quote` by volatility, MA spread, momentum or
+    volume, for picking the symbols bots should trade.
+    """
+    from orchestrator.data.screener import screen
+    try:
+        return screen(
+            quote=quote, timeframe=timeframe, max_symbols=max_symbols, top=top,
+            sort_by=sort_by, min_volatility=min_volatility
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        return JSONResponse(status_code=502, content={"error": f"Screener failed: {e}"})
+
+@app.get("/market-data", response_class=JSONResponse)
+def get_market_data_stats():
+    """
+    Shared market data feeds with subscriber counts per timeframe and the
+    number of upstream fetches made for each symbol.
+    """
+    from orchestrator.data.indicators import indicator_batcher
+    return {
+        "feeds": market_data_hub.stats(), 
+        "min_interval": market_data_hub.min_interval,
+        "indicator_batches": indicator_batcher.stats()
+    }
+
+@app.get("/triggers", response_class=JSONResponse)
+def get_triggers(symbol: Optional[str] = None):
+    """Pending stop-loss, take-profit and trailing-stop triggers."""
+    from orchestrator.execution.triggers import trigger_engine
+    return {"triggers": trigger_engine.active(symbol)}
+
+@app.get("/risk", response_class=JSONResponse)
+def get_risk():
+    """Risk limits, positions and counters of the pre-trade risk engine."""
+    from orchestrator.execution.risk import risk_engine
+    return risk_engine.snapshot()
+
+@app.get("/order-book", response_class=JSONResponse)
+def get_order_book(symbol: str = "BTC/USDT", depth: int = 20, size: Optional[float] = None):
+    """
+    Top of the local order book of `symbol`, refreshed if stale. With
+    `size`, also the expected fill price and slippage of a market order.
+    """
+    from orchestrator.data.orderbook import order_books
+    book = order_books.refresh(symbol, market_data_hub.client)
+    if book is None:
+        return JSONResponse(status_code=503, content={"error": f"No order book for {symbol}"})
+    result = dict(book.snapshot(depth), mid=book.mid(), spread=book.spread())
+    if size:
+        result['fills'] = {
+            side: {'vwap': book.vwap(side, size)[0], 'slippage_bps': book.slippage_bps(side, size)}
+            for side in ('buy', 'sell')
+        }
+    return result
+
+@app.get("/best-price", response_class=JSONResponse)
+def get_best_price(symbol: str = "BTC/USDT"):
+    """Best bid / ask of `symbol` across AGGREGATOR_VENUES, fetched in parallel."""
+    from orchestrator.exchange.aggregator import get_price_aggregator
+    return get_price_aggregator().best_price(symbol)
+
+@app.get("/best-book", response_class=JSONResponse)
+def get_best_book(symbol: str = "BTC/USDT", depth: int = 20):
+    """Order books of all AGGREGATOR_VENUES merged into one, levels tagged by venue."""
+    from orchestrator.exchange.aggregator import get_price_aggregator
+    return get_price_aggregator().best_book(symbol, depth)
+
+@app.get("/venue-stats", response_class=JSONResponse)
+def get_venue_stats():
+    """Request count, errors and latency percentiles per aggregated venue."""
+    from orchestrator.exchange.aggregator import get_price_aggregator
+    return get_price_aggregator().stats()
+
+@app.get("/exchange-health", response_class=JSONResponse)
+def get_exchange_health():
+    """Circuit breaker states and request budget use per exchange."""
+    from orchestrator.exchange.resilience import resilience_snapshot
+    return resilience_snapshot()
+
+@app.get("/config", response_class=JSONResponse)
+def get_config():
+    """Current bot configuration version, its source file and recent changes."""
+    from orchestrator.bots.config import config_store
+    config_store.start()
+    return config_store.snapshot()
+
+@app.put("/config", response_class=JSONResponse)
+async def put_config(request: Request, symbol: Optional[str] = None):
+    """
+    Change bot parameters (JSON object, merged into the current config or
+    into the overrides of `symbol`). Running bots apply the new version at
+    the start of their next cycle.
+    """
+    from orchestrator.bots.config import config_store, ConfigError
+    try:
+        changes = await request.json()
+    except ValueError:
+        return JSONResponse(status_code=400, content={"error": "Body must be a JSON object"})
+    if not isinstance(changes, dict):
+        return JSONResponse(status_code=400, content={"error": "Body must be a JSON object"})
+    config_store.start()
+    try:
+        return config_store.update(changes, symbol=symbol)
+    except ConfigError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.get("/sizing", response_class=JSONResponse)
+def get_sizing():
+    """Position sizing settings and the tracked volatility per symbol and timeframe."""
+    from orchestrator.execution.sizing import position_sizer
+    return position_sizer.snapshot()
+
+@app.get("/algo-orders", response_class=JSONResponse)
+def get_algo_orders():
+    """TWAP / iceberg parent orders with their progress."""
+    from orchestrator.execution.algos import algo_scheduler
+    return {"orders": algo_scheduler.list()}
+
+@app.post("/algo-orders/{algo_id}/cancel", response_class=JSONResponse)
+def cancel_algo_order(algo_id: str):
+    from orchestrator.execution.algos import algo_scheduler
+    if not algo_scheduler.cancel(algo_id):
+        return JSONResponse(
+            status_code=404, content={"error": f"No running algo order {algo_id}"}
+        )
+    return {"message": f"Cancelling {algo_id}"}
+
+@app.get("/journal/summary", response_class=JSONResponse)
+def get_journal_summary(
+    symbol: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
+):
+    """
+    Trade count, volume, realized P&L and win rate from the trade journal.
+    `start` / `end` are ISO dates or datetimes (UTC) or epoch seconds/ms.
+    """
+    from orchestrator.bots.journal import trade_journal
+    try:
+        return trade_journal.summary(symbol, start, end)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.get("/journal/daily", response_class=JSONResponse)
+def get_journal_daily(
+    symbol: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
+):
+    """Trades, realized P&L and win rate per UTC day."""
+    from orchestrator.bots.journal import trade_journal
+    try:
+        return {"days": trade_journal.daily(symbol, start, end)}
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+@app.get("/journal/{table}", response_class=JSONResponse)
+def get_journal_rows(
+    table: str,
+    symbol: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000)
+):
+    """Newest journal rows: signals, orders, fills or metrics."""
+    from orchestrator.bots.journal import trade_journal
+    try:
+        return {table: trade_journal.rows(table, symbol, start, end, limit)}
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
 @app.get("/chart-debug", response_class=HTMLResponse)
 def chart_debug(request: Request):
     """A debug endpoint to check chart data directly"""
@@ -540,6 +726,90 @@ def price_feed_raw():
     
     return debug_data
 
+def _profiling_off():
+    """404 response when profiling is not enabled (PROFILING_ENABLED=true)."""
+    from orchestrator.profiling import profiling_enabled
+    if profiling_enabled():
+        return None
+    return JSONResponse(status_code=404, content={"error": "Profiling is disabled (set PROFILING_ENABLED=true)"})
+
+@app.get("/profiling/memory", response_class=JSONResponse)
+def get_memory_profiling():
+    """Whether allocations are traced, and the snapshots kept for top/diff queries."""
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import memory_profiler
+    return {"tracing": memory_profiler.tracing, "snapshots": memory_profiler.snapshots()}
+
+@app.post("/profiling/memory/{action}", response_class=JSONResponse)
+def memory_profiling_action(action: str, label: str = "", frames: Optional[int] = None):
+    """`start` / `stop` allocation tracing or take a `snapshot` (written to PROFILE_DIR)."""
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import memory_profiler
+    if action == "start":
+        memory_profiler.start(frames)
+        return {"tracing": True}
+    if action == "stop":
+        memory_profiler.stop()
+        return {"tracing": False}
+    if action == "snapshot":
+        try:
+            return memory_profiler.snapshot(label)
+        except RuntimeError as e:
+            return JSONResponse(status_code=409, content={"error": str(e)})
+    return JSONResponse(status_code=400, content={"error": f"Unknown action: {action}"})
+
+@app.get("/profiling/memory/diff", response_class=JSONResponse)
+def get_memory_diff(first: int, second: int, limit: int = 20, key: str = "lineno"):
+    """Allocation sites that grew most between two snapshots."""
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import memory_profiler
+    try:
+        return {"first": first, "second": second, "stats": memory_profiler.diff(first, second, limit, key)}
+    except (KeyError, ValueError) as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
+@app.get("/profiling/memory/{snapshot_id}", response_class=JSONResponse)
+def get_memory_top(snapshot_id: int, limit: int = 20, key: str = "lineno"):
+    """Biggest allocators of one snapshot."""
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import memory_profiler
+    try:
+        return {"id": snapshot_id, "stats": memory_profiler.top(snapshot_id, limit, key)}
+    except (KeyError, ValueError) as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
+@app.get("/profiling/objects", response_class=JSONResponse)
+def get_object_summary(top: int = 20):
+    """Sizes of the bot's long-lived data structures and the most common object types."""
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import object_summary
+    return object_summary(top)
+
+@app.post("/profiling/cpu", response_class=JSONResponse)
+def profile_cpu(seconds: float = 10.0, thread: Optional[str] = "trading-bot", interval: float = 0.005):
+    """
+    Sample the stacks of a thread (the bot by default; empty = all threads)
+    for `seconds` (at most 120) and write them as folded stacks.
+    """
+    off = _profiling_off()
+    if off:
+        return off
+    from orchestrator.profiling import sample_cpu
+    try:
+        return sample_cpu(min(seconds, 120.0), max(interval, 0.001), thread or None)
+    except LookupError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
 @app.post("/frontend-error", response_class=JSONResponse)
 async def frontend_error(request: Request):
     data = await request.json()
@@ -549,6 +819,9 @@ async def frontend_error(request: Request):
 # Add process cleanup code
 def cleanup_processes():
     """Clean up any child processes when shutting down"""
+    import psutil
+    if shard_supervisor is not None and shard_supervisor.running:
+        shard_supervisor.stop(timeout=5)
     current_process = psutil.Process()
     
     # First try graceful termination of child processes
@@ -577,6 +850,8 @@ atexit.register(cleanup_processes)
 # Add this function to restart the application with a clean state
 def restart_application(background_tasks: BackgroundTasks):
     """Restart the application by terminating all child processes and starting a new instance"""
+    import psutil
+    checkpoint_active_bot()
     cleanup_processes()
     
     # Kill any process using port 8001
@@ -627,6 +902,7 @@ def restart_application(background_tasks: BackgroundTasks):
 @app.post("/restart", response_class=JSONResponse)
 def restart_endpoint(background_tasks: BackgroundTasks):
     """Restart the application with a clean state"""
+    import psutil
     try:
         # Check if port is already in use before trying to restart
         port_in_use = False
@@ -652,6 +928,7 @@ def restart_endpoint(background_tasks: BackgroundTasks):
 @app.post("/kill-port-processes", response_class=JSONResponse)
 def kill_port_processes():
     """Kill any processes using port 8001"""
+    import psutil
     killed = []
     
     try:
@@ -695,6 +972,20 @@ def debug_chart_data():
     
     return result
 
+_mark_startup_phase('app_setup')
+
+def report_startup_time():
+    """Log how long it took from process start until the server accepts requests."""
+    _mark_startup_phase('server_start')
+    startup_report.pop('_last', None)
+    startup_report['ready_ms'] = round((time.perf_counter() - _startup_t0) * 1000, 1)
+    print(f"Orchestrator ready in {startup_report['ready_ms']} ms {startup_report['phases']}")
+
+@app.get("/startup-report", response_class=JSONResponse)
+def get_startup_report():
+    """Time spent in each startup phase, in milliseconds."""
+    return {k: v for k, v in startup_report.items() if not k.startswith('_')}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
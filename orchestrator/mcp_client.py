@@ -6,8 +6,6 @@ This module connects to a real MCP server using the official Python SDK.
 
 import os
 import asyncio
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
 
 
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://127.0.0.1:8000/mcp")
@@ -19,6 +17,10 @@ def get_new_sheet_rows(symbol="BTC"):
     return asyncio.run(get_coin_price(symbol))
 
 async def get_coin_price(symbol="BTC"):
+    # The MCP SDK is only needed when a price is actually requested
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
     async with streamablehttp_client(MCP_SERVER_URL) as (read, write, _):
         async with ClientSession(read, write) as session:
             await session.initialize()
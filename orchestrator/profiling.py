@@ -0,0 +1,226 @@
+"""
+Opt-in memory and CPU profiling for long-running processes.
+
+Enabled with PROFILING_ENABLED=true; the /profiling endpoints answer 404
+otherwise. Results are written under logs/profiles (PROFILE_DIR):
+
+- memory: tracemalloc snapshots (`.tracemalloc`, loadable with
+  `tracemalloc.Snapshot.load`), their top allocators and the difference
+  between two snapshots;
+- objects: sizes of the bot's long-lived structures (log buffers, chart
+  data, candle buffers, journal queue...) and the most common object types;
+- cpu: a sampling profile of one thread (the bot by default), taken by
+  reading its stack every few milliseconds, written as folded stacks
+  (`.folded`, the input format of flamegraph.pl / speedscope).
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+PROFILE_DIR = os.getenv('PROFILE_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'logs', 'profiles'
+)
+# Snapshots kept in memory for top/diff queries (all stay on disk)
+MAX_SNAPSHOTS = 10
+
+
+def profiling_enabled() -> bool:
+    return os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+
+
+def _path(name: str) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, name)
+
+
+def _stat_row(stat) -> dict:
+    frame = stat.traceback[0]
+    return {
+        'file': frame.filename, 'line': frame.lineno,
+        'size_kb': round(stat.size / 1024, 1), 'count': stat.count,
+    }
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots numbered from 1, with top allocators and diffs."""
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self._snapshots: Dict[int, dict] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: Optional[int] = None):
+        """Start tracing allocations (slows allocation-heavy code while on)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or self.frames)
+
+    def stop(self):
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def snapshot(self, label: str = '') -> dict:
+        """Take a snapshot, write it to PROFILE_DIR and keep it for top/diff."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is off; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            path = _path(f"memory_{time.strftime('%Y%m%d_%H%M%S')}_{snapshot_id}.tracemalloc")
+            info = {
+                'id': snapshot_id, 'label': label, 'time': time.time(), 'path': path,
+                'traced_kb': round(current / 1024, 1), 'peak_kb': round(peak / 1024, 1),
+            }
+            self._snapshots[snapshot_id] = dict(info, snapshot=snapshot)
+            for old in sorted(self._snapshots)[:-MAX_SNAPSHOTS]:
+                del self._snapshots[old]
+        snapshot.dump(path)
+        return info
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            return [{k: v for k, v in s.items() if k != 'snapshot'} for _, s in sorted(self._snapshots.items())]
+
+    def _get(self, snapshot_id: int):
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise KeyError(f"No snapshot {snapshot_id} in memory")
+        return entry['snapshot']
+
+    def top(self, snapshot_id: int, limit: int = 20, key: str = 'lineno') -> List[dict]:
+        """Biggest allocators of a snapshot, grouped by 'lineno', 'filename' or 'traceback'."""
+        stats = self._get(snapshot_id).statistics(key)
+        return [_stat_row(stat) for stat in stats[:limit]]
+
+    def diff(self, first: int, second: int, limit: int = 20, key: str = 'lineno') -> List[dict]:
+        """Allocation sites that grew (or shrank) most from snapshot `first` to `second`."""
+        stats = self._get(second).compare_to(self._get(first), key)
+        rows = []
+        for stat in stats[:limit]:
+            row = _stat_row(stat)
+            row.update(size_diff_kb=round(stat.size_diff / 1024, 1), count_diff=stat.count_diff)
+            rows.append(row)
+        return rows
+
+
+def _length(value) -> Optional[int]:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def object_summary(top: int = 20) -> dict:
+    """
+    Sizes of the structures that live as long as the process, plus the
+    `top` most numerous object types tracked by the garbage collector.
+    """
+    from orchestrator.bots.manager import bot_logs, bot_logs_history, last_bot_run_data, last_bot_run_data_lock
+    from orchestrator.data import candles
+    from orchestrator.data.hub import market_data_hub
+    from orchestrator.data.orderbook import order_books
+
+    with last_bot_run_data_lock:
+        chart = {key: _length(value) for key, value in last_bot_run_data.items() if _length(value) is not None}
+    with candles._aggregators_lock:
+        aggregators = dict(candles._aggregators)
+    structures = {
+        'bot_logs': len(bot_logs.since(0)),
+        'bot_logs_history': {'entries': len(bot_logs_history), 'max': bot_logs_history.maxlen},
+        'chart_series': chart,
+        'candle_buffers': {symbol: len(aggregator) for symbol, aggregator in aggregators.items()},
+        'market_data_feeds': len(market_data_hub.stats()),
+        'order_books': len(order_books.symbols()),
+    }
+    if 'orchestrator.bots.journal' in sys.modules:
+        from orchestrator.bots.journal import trade_journal
+        structures['journal_queue'] = trade_journal.stats().get('queued')
+    types = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return {
+        'structures': structures,
+        'gc_objects': sum(types.values()),
+        'gc_counts': gc.get_count(),
+        'top_types': types.most_common(top),
+    }
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_cpu(seconds: float = 10.0, interval: float = 0.005, thread_name: Optional[str] = 'trading-bot',
+               top: int = 20, write: bool = True) -> dict:
+    """
+    Sample the stack of the thread named `thread_name` (None = every thread
+    but this one) every `interval` seconds for `seconds`.
+
+    Returns:
+        dict: Sample count, the functions with the most samples on top of
+        the stack (self) and anywhere on it (total), and the path of the
+        folded-stacks file.
+    """
+    me = threading.get_ident()
+    targets = {}
+    for thread in threading.enumerate():
+        if thread.ident != me and (thread_name is None or thread.name == thread_name):
+            targets[thread.ident] = thread.name
+    if not targets:
+        raise LookupError(f"No running thread named {thread_name}")
+
+    stacks = Counter()
+    own = Counter()
+    total = Counter()
+    samples = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frames = sys._current_frames()
+        for ident, name in targets.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            samples += 1
+            own[stack[0]] += 1
+            for function in set(stack):
+                total[function] += 1
+            stacks[';'.join([name] + stack[::-1])] += 1
+        time.sleep(interval)
+
+    path = None
+    if write and stacks:
+        path = _path(f"cpu_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    share = (lambda n: round(n / samples, 4)) if samples else (lambda n: 0.0)
+    return {
+        'threads': sorted(targets.values()),
+        'samples': samples,
+        'seconds': seconds,
+        'self': [{'function': f, 'samples': n, 'share': share(n)} for f, n in own.most_common(top)],
+        'total': [{'function': f, 'samples': n, 'share': share(n)} for f, n in total.most_common(top)],
+        'path': path,
+    }
+
+
+memory_profiler = MemoryProfiler()
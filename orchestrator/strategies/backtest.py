@@ -0,0 +1,113 @@
+"""
+Vectorized backtest of the moving-average crossover strategy.
+
+Signals follow the bot: the short SMA crossing above / below the long SMA
+on a candle's close is a buy / sell, and no trade is made while the
+volatility of the last `vol_window` log returns is below `min_vol`.
+Positions are long or flat: a buy opens a position when flat, a sell
+closes it, both at the signal candle's close, and `fee` is charged on
+each side. Indicators come from the shared (symbols x time) kernels.
+"""
+
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from orchestrator.data import indicators
+
+
+def param_grid(short_windows: Iterable[int], long_windows: Iterable[int]) -> List[Tuple[int, int]]:
+    """All (short, long) window pairs with short < long, in a stable order."""
+    return [(s, l) for s, l in product(sorted(set(short_windows)), sorted(set(long_windows))) if s < l]
+
+
+class IndicatorCache:
+    """SMAs and rolling volatility of one close series, each window computed once."""
+    def __init__(self, closes: np.ndarray):
+        self.closes = np.asarray(closes, dtype=float)
+        self._matrix = self.closes.reshape(1, -1)
+        self._sma: Dict[int, np.ndarray] = {}
+        self._vol: Dict[int, np.ndarray] = {}
+        self._signals: Dict[tuple, np.ndarray] = {}
+
+    def sma(self, window: int) -> np.ndarray:
+        if window not in self._sma:
+            self._sma[window] = indicators.sma(self._matrix, window)
+        return self._sma[window]
+
+    def volatility(self, window: int) -> np.ndarray:
+        if window not in self._vol:
+            self._vol[window] = indicators.rolling_volatility(self._matrix, window)[0]
+        return self._vol[window]
+
+    def signals(self, short_window: int, long_window: int, vol_window: int = 20,
+                min_vol: float = 0.0) -> np.ndarray:
+        """+1 / -1 on candles where the bot would buy / sell, 0 elsewhere."""
+        key = (short_window, long_window, vol_window, min_vol)
+        if key not in self._signals:
+            crosses = indicators.crossovers(self.sma(short_window), self.sma(long_window))[0]
+            if min_vol:
+                with np.errstate(invalid='ignore'):
+                    crosses = np.where(self.volatility(vol_window) >= min_vol, crosses, 0)
+            self._signals[key] = crosses
+        return self._signals[key]
+
+
+def simulate_trades(closes: np.ndarray, signals: np.ndarray, start: int = 0,
+                    end: Optional[int] = None, fee: float = 0.001) -> np.ndarray:
+    """
+    Net returns of the round trips entered in [start, end). A position still
+    open at `end` is closed at the close of candle end - 1.
+    """
+    end = len(closes) if end is None else end
+    returns = []
+    entry = None
+    for i in np.flatnonzero(signals[start:end]) + start:
+        if signals[i] > 0 and entry is None:
+            entry = closes[i]
+        elif signals[i] < 0 and entry is not None:
+            returns.append(closes[i] / entry * (1 - fee) ** 2 - 1)
+            entry = None
+    if entry is not None:
+        returns.append(closes[end - 1] / entry * (1 - fee) ** 2 - 1)
+    return np.asarray(returns, dtype=float)
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    """Largest peak-to-trough loss of the equity curve compounded from `returns`."""
+    if len(returns) == 0:
+        return 0.0
+    equity = np.concatenate(([1.0], np.cumprod(1 + returns)))
+    return float(np.max(1 - equity / np.maximum.accumulate(equity)))
+
+
+def trade_stats(returns: np.ndarray) -> dict:
+    """
+    Trade count, compounded return, win rate, mean, per-trade Sharpe and max
+    drawdown. The Sharpe is mean / std of the trade returns, not scaled by
+    the trade count, so trading more often does not raise it by itself.
+    """
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    if n == 0:
+        return {'trades': 0, 'total_return': 0.0, 'win_rate': None, 'mean_return': None,
+                'sharpe': None, 'max_drawdown': 0.0}
+    std = returns.std(ddof=1) if n > 1 else 0.0
+    return {
+        'trades': n,
+        'total_return': float(np.prod(1 + returns) - 1),
+        'win_rate': float((returns > 0).mean()),
+        'mean_return': float(returns.mean()),
+        'sharpe': float(returns.mean() / std) if std > 0 else None,
+        'max_drawdown': max_drawdown(returns),
+    }
+
+
+def backtest(closes, short_window: int = 5, long_window: int = 20, vol_window: int = 20,
+             min_vol: float = 0.0, fee: float = 0.001, cache: Optional[IndicatorCache] = None) -> dict:
+    """Backtest one parameter set over the whole series."""
+    cache = cache or IndicatorCache(closes)
+    signals = cache.signals(short_window, long_window, vol_window, min_vol)
+    returns = simulate_trades(cache.closes, signals, fee=fee)
+    return dict(trade_stats(returns), returns=returns)
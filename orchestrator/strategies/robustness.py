@@ -0,0 +1,354 @@
+"""
+Robustness analysis of the moving-average strategy.
+
+Walk-forward: the candles are cut into rolling train / test windows. On
+each train window every (short, long) pair of the grid is backtested and
+the best one by `objective` is then traded, unchanged, on the following
+test window. The concatenated test-window trades are the out-of-sample
+record; how often the chosen parameters change and how much of the
+in-sample performance survives out of sample show whether the parameters
+hold up across regimes.
+
+Monte Carlo: the out-of-sample trade returns are bootstrapped (resampled
+with replacement) into thousands of alternative trade sequences, giving
+the distribution of final return and maximum drawdown.
+
+Folds and simulation chunks run in a process pool. The closes are placed
+once in a shared memory block that every worker maps, instead of being
+pickled into each task. Progress events with the statistics aggregated so
+far are streamed to `on_progress` as tasks complete. Simulation chunks
+draw from seeds spawned from one root seed, so results are identical for
+any number of workers and any completion order.
+"""
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from orchestrator.strategies.backtest import (
+    IndicatorCache, param_grid, simulate_trades, trade_stats
+)
+
+ROBUSTNESS_WORKERS = int(os.getenv('ROBUSTNESS_WORKERS', '0')) or os.cpu_count() or 1
+OBJECTIVES = ('sharpe', 'total_return', 'win_rate')
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def walk_forward_folds(length: int, train: int, test: int,
+                       step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """(train_start, train_end, test_end) of every rolling window fitting in `length` candles."""
+    if train < 1 or test < 1:
+        raise ValueError("train and test windows must be at least one candle")
+    step = step or test
+    folds = []
+    start = 0
+    while start + train + test <= length:
+        folds.append((start, start + train, start + train + test))
+        start += step
+    return folds
+
+
+# Per-process state of pool workers: the candles mapped from shared memory
+_worker = {}
+
+
+def _init_worker(shm_name: Optional[str], length: int, closes: Optional[np.ndarray] = None):
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker['shm'] = shm
+        closes = np.ndarray((length,), dtype=np.float64, buffer=shm.buf)
+    _worker['cache'] = IndicatorCache(closes)
+
+
+def _score(stats: dict, objective: str, min_trades: int) -> float:
+    value = stats.get(objective)
+    if stats['trades'] < min_trades or value is None:
+        return -math.inf
+    return value
+
+
+def _evaluate_fold(index: int, bounds: Tuple[int, int, int], grid: List[Tuple[int, int]],
+                   settings: dict) -> dict:
+    """Pick the best parameters on the train window and trade them on the test window."""
+    cache = _worker['cache']
+    train_start, train_end, test_end = bounds
+    best, best_score, best_stats = grid[0], -math.inf, None
+    for short_window, long_window in grid:
+        signals = cache.signals(short_window, long_window, settings['vol_window'], settings['min_vol'])
+        stats = trade_stats(simulate_trades(cache.closes, signals, train_start, train_end, settings['fee']))
+        score = _score(stats, settings['objective'], settings['min_trades'])
+        if best_stats is None or score > best_score:
+            best, best_score, best_stats = (short_window, long_window), score, stats
+    signals = cache.signals(best[0], best[1], settings['vol_window'], settings['min_vol'])
+    returns = simulate_trades(cache.closes, signals, train_end, test_end, settings['fee'])
+    return {
+        'fold': index,
+        'train': [train_start, train_end],
+        'test': [train_end, test_end],
+        'short_window': best[0],
+        'long_window': best[1],
+        'in_sample': best_stats,
+        'out_of_sample': trade_stats(returns),
+        'returns': returns.tolist(),
+    }
+
+
+def _bootstrap_chunk(index: int, returns: np.ndarray, simulations: int, trades: int,
+                     seed: np.random.SeedSequence) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Final returns and max drawdowns of `simulations` resampled trade sequences."""
+    rng = np.random.default_rng(seed)
+    samples = returns[rng.integers(0, len(returns), size=(simulations, trades))]
+    equity = np.concatenate((np.ones((simulations, 1)), np.cumprod(1 + samples, axis=1)), axis=1)
+    drawdowns = np.max(1 - equity / np.maximum.accumulate(equity, axis=1), axis=1)
+    return index, equity[:, -1] - 1, drawdowns
+
+
+def _distribution(values: np.ndarray) -> dict:
+    if len(values) == 0:
+        return {}
+    result = {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    result['mean'] = float(values.mean())
+    return result
+
+
+def _monte_carlo_summary(finals: List[np.ndarray], drawdowns: List[np.ndarray]) -> dict:
+    finals = np.concatenate(finals) if finals else np.empty(0)
+    drawdowns = np.concatenate(drawdowns) if drawdowns else np.empty(0)
+    return {
+        'simulations': len(finals),
+        'final_return': _distribution(finals),
+        'max_drawdown': _distribution(drawdowns),
+        'probability_of_loss': float((finals < 0).mean()) if len(finals) else None,
+    }
+
+
+class _InlineExecutor:
+    """Runs tasks in the calling process, for workers <= 1."""
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def run_robustness(closes: Sequence[float], short_windows: Sequence[int] = (3, 5, 8, 13),
+                   long_windows: Sequence[int] = (20, 30, 50), train: int = 500, test: int = 100,
+                   step: Optional[int] = None, vol_window: int = 20, min_vol: float = 0.0,
+                   fee: float = 0.001, objective: str = 'sharpe', min_trades: int = 3,
+                   simulations: int = 5000, chunk_size: int = 250, seed: int = 0,
+                   workers: Optional[int] = None,
+                   on_progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Walk-forward optimization over `closes` followed by Monte Carlo
+    bootstrapping of the out-of-sample trades.
+
+    Args:
+        train, test, step (int): Window lengths and stride in candles
+            (step defaults to `test`, so test windows do not overlap).
+        objective (str): In-sample statistic to maximize: sharpe,
+            total_return or win_rate. Parameter sets with fewer than
+            `min_trades` in-sample trades are not eligible.
+        simulations (int): Bootstrapped trade sequences, run in chunks of
+            `chunk_size`, each with its own seed spawned from `seed`.
+        workers (int): Pool size; 1 runs everything in this process.
+        on_progress (callable): Receives a dict after every completed task
+            with the phase, the task counts and the statistics so far.
+    Returns:
+        dict: Settings, per-fold results, out-of-sample statistics,
+        parameter stability and the Monte Carlo distributions.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective}; use one of {', '.join(OBJECTIVES)}")
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    grid = param_grid(short_windows, long_windows)
+    if not grid:
+        raise ValueError("The parameter grid is empty (every short window must be below a long window)")
+    folds = walk_forward_folds(len(closes), train, test, step)
+    if not folds:
+        raise ValueError(f"{len(closes)} candles are not enough for one {train}+{test} fold")
+    workers = ROBUSTNESS_WORKERS if workers is None else workers
+    settings = {
+        'candles': len(closes), 'short_windows': sorted(set(short_windows)),
+        'long_windows': sorted(set(long_windows)), 'train': train, 'test': test,
+        'step': step or test, 'vol_window': vol_window, 'min_vol': min_vol, 'fee': fee,
+        'objective': objective, 'min_trades': min_trades, 'simulations': simulations,
+        'chunk_size': chunk_size, 'seed': seed, 'workers': workers,
+    }
+    emit = on_progress or (lambda event: None)
+    started = time.perf_counter()
+
+    shm = None
+    if workers > 1:
+        shm = shared_memory.SharedMemory(create=True, size=max(closes.nbytes, 1))
+        np.ndarray(closes.shape, dtype=np.float64, buffer=shm.buf)[:] = closes
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp.get_context('spawn'),
+            initializer=_init_worker, initargs=(shm.name, len(closes))
+        )
+    else:
+        _init_worker(None, len(closes), closes)
+        executor = _InlineExecutor()
+    try:
+        # Walk-forward folds
+        fold_results: Dict[int, dict] = {}
+        futures = [executor.submit(_evaluate_fold, i, bounds, grid, settings) for i, bounds in enumerate(folds)]
+        for future in as_completed(futures):
+            result = future.result()
+            fold_results[result['fold']] = result
+            done = [fold_results[i] for i in sorted(fold_results)]
+            emit({
+                'phase': 'walk_forward', 'completed': len(done), 'total': len(folds),
+                'out_of_sample': trade_stats(np.array([r for f in done for r in f['returns']])),
+            })
+        fold_list = [fold_results[i] for i in range(len(folds))]
+        oos_returns = np.array([r for fold in fold_list for r in fold['returns']], dtype=float)
+
+        # Monte Carlo over the out-of-sample trades
+        finals: Dict[int, np.ndarray] = {}
+        drawdowns: Dict[int, np.ndarray] = {}
+        if len(oos_returns) and simulations > 0:
+            sizes = [chunk_size] * (simulations // chunk_size)
+            if simulations % chunk_size:
+                sizes.append(simulations % chunk_size)
+            seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+            futures = [
+                executor.submit(_bootstrap_chunk, i, oos_returns, size, len(oos_returns), seeds[i])
+                for i, size in enumerate(sizes)
+            ]
+            for future in as_completed(futures):
+                index, chunk_finals, chunk_drawdowns = future.result()
+                finals[index], drawdowns[index] = chunk_finals, chunk_drawdowns
+                emit(dict(
+                    _monte_carlo_summary(list(finals.values()), list(drawdowns.values())),
+                    phase='monte_carlo', completed=len(finals), total=len(sizes)
+                ))
+        order = sorted(finals)
+        monte_carlo = _monte_carlo_summary([finals[i] for i in order], [drawdowns[i] for i in order])
+    finally:
+        executor.shutdown(wait=True)
+        _worker.clear()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    in_sample_returns = [f['in_sample']['total_return'] for f in fold_list if f['in_sample']['trades']]
+    chosen = {}
+    for fold in fold_list:
+        key = f"{fold['short_window']}/{fold['long_window']}"
+        chosen[key] = chosen.get(key, 0) + 1
+    changes = sum(
+        (a['short_window'], a['long_window']) != (b['short_window'], b['long_window'])
+        for a, b in zip(fold_list, fold_list[1:])
+    )
+    oos_stats = trade_stats(oos_returns)
+    mean_in_sample = float(np.mean(in_sample_returns)) if in_sample_returns else None
+    mean_out_of_sample = float(np.mean([f['out_of_sample']['total_return'] for f in fold_list]))
+    return {
+        'settings': settings,
+        'folds': fold_list,
+        'out_of_sample': oos_stats,
+        'parameter_stability': {
+            'chosen': chosen,
+            'changes': changes,
+            'change_rate': changes / (len(fold_list) - 1) if len(fold_list) > 1 else 0.0,
+        },
+        # Share of the in-sample return per window (train and test scaled to equal length) kept out of sample
+        'walk_forward_efficiency': (
+            mean_out_of_sample / (mean_in_sample * test / train) if mean_in_sample else None
+        ),
+        'monte_carlo': dict(monte_carlo, trades_per_simulation=len(oos_returns)),
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def export_results(result: dict, path: str):
+    """Write a result to `path`: the full result as .json, or one row per fold as .csv."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith('.csv'):
+        columns = ['fold', 'train_start', 'train_end', 'test_end', 'short_window', 'long_window']
+        stats = ['trades', 'total_return', 'win_rate', 'sharpe', 'max_drawdown']
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns + [f"is_{s}" for s in stats] + [f"oos_{s}" for s in stats])
+            for fold in result['folds']:
+                writer.writerow(
+                    [fold['fold'], *fold['train'], fold['test'][1], fold['short_window'], fold['long_window']]
+                    + [fold['in_sample'][s] for s in stats] + [fold['out_of_sample'][s] for s in stats]
+                )
+    else:
+        with open(path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+def load_closes(path: str) -> np.ndarray:
+    """
+    Close prices from a JSON file of ccxt OHLCV rows, either a plain list or
+    the `/candles` response ({"candles": [...]}).
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    candles = data['candles'] if isinstance(data, dict) else data
+    return np.array([candle[4] for candle in candles], dtype=float)
+
+
+def synthetic_closes(length: int, seed: int = 0) -> np.ndarray:
+    """Random walk whose volatility and drift switch regime every 1000 candles."""
+    rng = np.random.default_rng(seed)
+    regimes = (length + 999) // 1000
+    sigma = np.repeat(rng.uniform(0.002, 0.01, regimes), 1000)[:length]
+    drift = np.repeat(rng.normal(0, 0.0005, regimes), 1000)[:length]
+    return 100 * np.exp(np.cumsum(rng.normal(drift, sigma)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Walk-forward and Monte Carlo robustness analysis.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--candles', help="JSON file of OHLCV rows (e.g. saved from /candles)")
+    source.add_argument('--synthetic', type=int, help="Use a synthetic random walk of this many candles")
+    parser.add_argument('--short', default='3,5,8,13', help="Comma-separated short windows")
+    parser.add_argument('--long', default='20,30,50', help="Comma-separated long windows")
+    parser.add_argument('--train', type=int, default=500)
+    parser.add_argument('--test', type=int, default=100)
+    parser.add_argument('--step', type=int, default=None)
+    parser.add_argument('--min-vol', type=float, default=0.0)
+    parser.add_argument('--fee', type=float, default=0.001)
+    parser.add_argument('--objective', choices=OBJECTIVES, default='sharpe')
+    parser.add_argument('--simulations', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--export', help="Write the result to this .json or .csv file")
+    options = parser.parse_args()
+
+    prices = load_closes(options.candles) if options.candles else synthetic_closes(options.synthetic, options.seed)
+
+    def show(event):
+        print(json.dumps(event), file=sys.stderr, flush=True)
+
+    result = run_robustness(
+        prices, [int(w) for w in options.short.split(',')], [int(w) for w in options.long.split(',')],
+        train=options.train, test=options.test, step=options.step, min_vol=options.min_vol,
+        fee=options.fee, objective=options.objective, simulations=options.simulations,
+        seed=options.seed, workers=options.workers, on_progress=show,
+    )
+    if options.export:
+        export_results(result, options.export)
+    summary = {key: value for key, value in result.items() if key != 'folds'}
+    print(json.dumps(summary, indent=2))
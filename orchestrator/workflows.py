@@ -1,4 +1,5 @@
-from orchestrator.mcp_client import get_new_sheet_rows, send_slack_message, COINS
+from orchestrator.mcp_client import get_new_sheet_rows, COINS
+from orchestrator.integrations.slack import send_slack_message
 
 def run_sample_workflow(symbol="BTC"):
     # Fetch the current coin price from the MCP server
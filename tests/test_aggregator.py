@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from orchestrator.exchange.aggregator import PriceAggregator
+from orchestrator.exchange.base import CcxtConnector, ExchangeConnector
+from orchestrator.exchange.binance import BinanceClient
+
+
+class FakeVenue:
+    def __init__(self, id, bid, ask, delay=0.0, fail=False):
+        self.id = id
+        self.bid, self.ask = bid, ask
+        self.delay = delay
+        self.fail = fail
+
+    def _wait(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.id} is down")
+
+    def fetch_ticker(self, symbol):
+        self._wait()
+        return {'symbol': symbol, 'bid': self.bid, 'ask': self.ask, 'last': (self.bid + self.ask) / 2}
+
+    def fetch_order_book(self, symbol, limit=None):
+        self._wait()
+        levels = range(limit or 5)
+        return {'bids': [[self.bid - i, 1.0] for i in levels], 'asks': [[self.ask + i, 1.0] for i in levels]}
+
+
+def connectors(*venues):
+    return {venue.id: CcxtConnector(venue.id, client=venue) for venue in venues}
+
+
+def test_venues_are_queried_in_parallel_and_best_quotes_win():
+    aggregator = PriceAggregator(connectors(
+        FakeVenue('a', 100.0, 101.0, delay=0.2),
+        FakeVenue('b', 100.5, 101.5, delay=0.2),
+        FakeVenue('c', 99.0, 100.8, delay=0.2),
+        FakeVenue('down', 0, 0, fail=True),
+    ))
+    started = time.perf_counter()
+    result = aggregator.best_price('BTC/USDT')
+    assert time.perf_counter() - started < 0.35
+    assert result['bid'] == {'venue': 'b', 'price': 100.5}
+    assert result['ask'] == {'venue': 'c', 'price': 100.8}
+    assert result['spread'] == pytest.approx(0.3)
+    assert 'down' in result['venues']['down']['error']
+    assert result['venues']['a']['latency_ms'] >= 200
+
+    book = aggregator.best_book('BTC/USDT', depth=3)
+    assert [level[0] for level in book['bids']] == [100.5, 100.0, 99.5]
+    assert book['asks'][0] == [100.8, 1.0, 'c']
+
+    stats = aggregator.stats()
+    assert stats['a']['samples'] == 2 and stats['down']['errors'] == 2
+    aggregator.close()
+
+
+def test_slow_venue_is_cut_off_at_the_timeout():
+    aggregator = PriceAggregator(connectors(
+        FakeVenue('fast', 100.0, 101.0), FakeVenue('slow', 100.9, 100.95, delay=1.0),
+    ), timeout=0.2)
+    started = time.perf_counter()
+    result = aggregator.best_price('BTC/USDT')
+    assert time.perf_counter() - started < 0.5
+    assert result['bid']['venue'] == 'fast' and 'timed out' in result['venues']['slow']['error']
+    aggregator.close()
+
+
+def test_binance_client_is_a_connector():
+    assert issubclass(BinanceClient, ExchangeConnector)
+    exchange = BinanceClient(validate='none', client=FakeVenue('binanceus', 1.0, 2.0))
+    assert exchange.name == 'binanceus' and exchange.get_price('BTC/USDT') == 1.5
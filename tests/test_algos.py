@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.manager import TradingBot
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import VirtualClock
+from orchestrator.exchange.simulated import SimulatedExchange
+from orchestrator.execution.algos import AlgoScheduler, IcebergOrder, TwapOrder
+from orchestrator.execution.risk import RiskEngine, RiskLimits
+from orchestrator.execution.triggers import TriggerEngine
+
+
+def make_exchange(clock, **kwargs):
+    exchange = BinanceClient(validate='none', client=SimulatedExchange(clock=clock, **kwargs))
+    exchange.demo_mode = False
+    return exchange
+
+
+def test_twap_slices_evenly_over_the_duration():
+    clock = VirtualClock(1_700_000_000.0)
+    exchange = make_exchange(clock)
+    scheduler = AlgoScheduler(clock=clock, threaded=False)
+    fills = []
+    twap = scheduler.submit(TwapOrder(
+        exchange, 'BTC/USDT', 'buy', 1.0, duration=100, slices=4,
+        on_fill=lambda algo, child: fills.append((clock.time(), child['new_fill']))
+    ))
+    scheduler.drain()
+
+    assert twap.status == 'done' and twap.filled == 1.0
+    assert [t - fills[0][0] for t, _ in fills] == [0, 25, 50, 75]
+    assert [size for _, size in fills] == [0.25] * 4
+    assert twap.average_price > 100 * (1 - 0.01)
+
+
+def test_iceberg_waits_for_each_visible_child_and_can_be_cancelled():
+    clock = VirtualClock(1_700_000_000.0)
+    exchange = make_exchange(clock, volatility=0.0)
+    scheduler = AlgoScheduler(clock=clock, threaded=False)
+    resting = scheduler.submit(IcebergOrder(
+        exchange, 'BTC/USDT', 'buy', 1.0, visible=0.25, limit_price=90.0, interval=5
+    ))
+    scheduler.run_pending()
+    clock.sleep(60)
+    scheduler.run_pending()
+    assert len(resting.children) == 1 and resting.filled == 0
+    assert scheduler.cancel(resting.id)
+    scheduler.run_pending()
+    assert resting.status == 'cancelled'
+    assert exchange.client.fetch_open_orders() == []
+
+    marketable = scheduler.submit(IcebergOrder(
+        exchange, 'BTC/USDT', 'sell', 1.0, visible=0.4, limit_price=90.0, interval=5
+    ))
+    scheduler.drain()
+    assert marketable.status == 'done'
+    assert [c['amount'] for c in marketable.children] == pytest.approx([0.4, 0.4, 0.2])
+
+
+def test_scheduler_runs_in_the_background():
+    exchange = make_exchange(time)
+    scheduler = AlgoScheduler()
+    started = time.perf_counter()
+    twap = scheduler.submit(TwapOrder(exchange, 'BTC/USDT', 'sell', 0.5, duration=0.3, slices=3))
+    assert time.perf_counter() - started < 0.1
+    deadline = time.time() + 5
+    while not twap.done and time.time() < deadline:
+        time.sleep(0.02)
+    scheduler.stop()
+    assert twap.status == 'done' and len(twap.children) == 3
+
+
+def test_sliced_entry_arms_exits_for_the_filled_amount(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path)))
+    clock = VirtualClock(1_700_000_000.0)
+    scheduler = AlgoScheduler(clock=clock, threaded=False)
+    triggers = TriggerEngine()
+    bot = TradingBot(
+        exchange=make_exchange(clock), clock=clock, notify=None, min_vol=0.0, checkpoints=False,
+        journal=False, config=False, stop_loss_pct=0.05, execution_algo='twap', algo_slices=4,
+        algo_duration=100, scheduler=scheduler, triggers=triggers, risk=RiskEngine(RiskLimits()),
+    )
+    bot._submit_order('buy', 1.0, 100.0)
+    sizes = []
+    while scheduler.next_due() is not None:
+        clock.sleep(max(0.0, scheduler.next_due() - clock.time()))
+        scheduler.run_pending()
+        sizes.append([t['amount'] for t in triggers.active('BTC/USDT')])
+
+    # One stop at a time, growing with the fills instead of covering the whole parent up front
+    assert sizes == [[0.25], [0.5], [0.75], [1.0]]
+    assert bot.entry_amount == 1.0
+
+
+def test_stop_during_a_sliced_entry_cancels_the_rest_of_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path)))
+    clock = VirtualClock(1_700_000_000.0)
+    scheduler = AlgoScheduler(clock=clock, threaded=False)
+    triggers = TriggerEngine()
+    bot = TradingBot(
+        exchange=make_exchange(clock), clock=clock, notify=None, min_vol=0.0, checkpoints=False,
+        journal=False, config=False, stop_loss_pct=0.05, execution_algo='twap', algo_slices=4,
+        algo_duration=100, scheduler=scheduler, triggers=triggers, risk=RiskEngine(RiskLimits()),
+    )
+    entry = bot.algo_orders[bot._submit_order('buy', 1.0, 100.0)['id']]
+    for _ in range(2):
+        clock.sleep(max(0.0, scheduler.next_due() - clock.time()))
+        scheduler.run_pending()
+    assert [t['amount'] for t in triggers.active('BTC/USDT')] == [0.5]
+
+    fired = triggers.on_price('BTC/USDT', 90.0)
+    scheduler.drain()
+
+    # The stop sold the half that was bought and no more buy slices followed
+    assert [t.amount for t in fired] == [0.5]
+    assert entry.status == 'cancelled' and entry.filled == 0.5 and len(entry.children) == 2
+    assert bot.entry_algo is None and bot.entry_amount is None
+    assert triggers.active('BTC/USDT') == []
@@ -0,0 +1,61 @@
+import json
+import os
+
+from orchestrator.bots.archive import LogArchive
+
+
+def entries(n, category='INFO'):
+    return [{'seq': i, 'category': category if i % 2 else 'TRADE', 'message': f"line {i} " + 'x' * 80}
+            for i in range(n)]
+
+
+def test_segments_are_compressed_indexed_and_streamed(tmp_path, monkeypatch):
+    legacy = tmp_path / 'logs'
+    legacy.mkdir()
+    with open(legacy / 'bot_logs_20250101_120000.json', 'w') as f:
+        json.dump(entries(10), f, indent=2)
+    archive = LogArchive(str(legacy / 'archive'), legacy_dir=str(legacy))
+
+    segment = archive.write_segment('20250102_080000', entries(500))
+    assert segment['size'] < segment['raw_size'] / 5
+    # The old uncompressed file was moved into the archive
+    assert not (legacy / 'bot_logs_20250101_120000.json').exists()
+    assert [s['date'] for s in archive.list()] == ['2025-01-02 08:00:00', '2025-01-01 12:00:00']
+
+    trades = list(archive.read(segment['filename'], 'TRADE'))
+    assert len(trades) == 250 and trades[0]['seq'] == 0
+
+    # A new process lists the history from the manifest, without scanning the directory
+    reopened = LogArchive(str(legacy / 'archive'))
+    monkeypatch.setattr(os, 'listdir', lambda path: (_ for _ in ()).throw(AssertionError("scanned")))
+    assert [s['filename'] for s in reopened.list()] == [s['filename'] for s in archive.list()]
+    assert reopened.stats()['compression_ratio'] > 5
+
+
+def test_retention_drops_the_oldest_segments(tmp_path):
+    now = [1_000_000.0]
+    archive = LogArchive(str(tmp_path), max_bytes=None, max_age=3600, clock=lambda: now[0])
+    for hour in range(5):
+        archive.write_segment(f"2025010{hour + 1}_000000", entries(100))
+        now[0] += 1800
+    # Segments older than an hour are gone, from the manifest and the disk
+    assert [s['run_id'] for s in archive.list()] == ['20250105_000000', '20250104_000000', '20250103_000000']
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.gz')]) == 3
+
+    size = archive.list()[0]['size']
+    archive.max_bytes = size * 2
+    archive.enforce_retention()
+    assert [s['run_id'] for s in archive.list()] == ['20250105_000000', '20250104_000000']
+
+
+def test_lost_manifest_is_rebuilt_from_the_segments(tmp_path):
+    archive = LogArchive(str(tmp_path))
+    archive.write_segment('20250101_000000', entries(50))
+    archive.write_segment('20250102_000000', entries(50))
+    os.remove(tmp_path / 'manifest.json')
+
+    reopened = LogArchive(str(tmp_path), max_bytes=archive.list()[0]['size'])
+    # Both segments were found again, and retention counts them
+    assert [s['run_id'] for s in reopened.list()] == ['20250102_000000']
+    assert (tmp_path / 'manifest.json').exists()
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.gz')]) == 1
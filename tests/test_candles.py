@@ -0,0 +1,59 @@
+from orchestrator.data.candles import CandleAggregator
+
+MINUTE = 60_000
+HOUR_START = 1_700_000_000_000 - 1_700_000_000_000 % (60 * MINUTE)
+
+
+def make_candles(count, start=HOUR_START):
+    candles = []
+    for i in range(count):
+        price = 100.0 + (i % 7) - (i % 3)
+        candles.append([start + i * MINUTE, price, price + 2, price - 1, price + 0.5, 1.0 + i])
+    return candles
+
+
+def brute_force_rollup(candles, minutes):
+    buckets = {}
+    for ts, o, h, l, c, v in candles:
+        bucket = ts - ts % (minutes * MINUTE)
+        if bucket not in buckets:
+            buckets[bucket] = [bucket, o, h, l, c, v]
+        else:
+            b = buckets[bucket]
+            b[2], b[3], b[4], b[5] = max(b[2], h), min(b[3], l), c, b[5] + v
+    return [buckets[k] for k in sorted(buckets)]
+
+
+def test_incremental_rollup_matches_brute_force():
+    candles = make_candles(130)
+    aggregator = CandleAggregator('BTC/USDT', timeframes=('5m', '15m'))
+    aggregator.update(candles[:50])
+    for candle in candles[50:]:
+        aggregator.update([candle])
+
+    assert aggregator.get('1m') == [[float(x) if i else x for i, x in enumerate(c)] for c in candles]
+    assert aggregator.get('5m') == brute_force_rollup(candles, 5)
+    assert aggregator.get('15m') == brute_force_rollup(candles, 15)
+
+
+def test_in_progress_candle_is_replaced():
+    candles = make_candles(7)
+    aggregator = CandleAggregator('BTC/USDT', timeframes=('5m',))
+    aggregator.update(candles)
+    revised = list(candles[-1])
+    revised[2], revised[4] = 500.0, 499.0
+    assert aggregator.update([candles[-2], revised]) == 0
+
+    expected = brute_force_rollup(candles[:-1] + [revised], 5)
+    assert aggregator.get('5m') == expected
+    assert aggregator.get('1m', limit=1)[0][4] == 499.0
+
+
+def test_partial_leading_bucket_is_dropped_and_late_timeframe_is_built():
+    candles = make_candles(12, start=HOUR_START + 3 * MINUTE)
+    aggregator = CandleAggregator('BTC/USDT', timeframes=())
+    aggregator.update(candles)
+    aggregator.add_timeframe('5m')
+
+    rolled = aggregator.get('5m')
+    assert [c[0] for c in rolled] == [HOUR_START + 5 * MINUTE, HOUR_START + 10 * MINUTE]
@@ -0,0 +1,68 @@
+import json
+import threading
+
+from orchestrator.bots import checkpoint, manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.manager import TradingBot
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import VirtualClock
+from tests.test_replay import SineExchange
+
+
+class CountingExchange(SineExchange):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=100):
+        self.requests.append((since, limit))
+        return super().fetch_ohlcv(symbol, timeframe, since, limit)
+
+
+def make_bot(client, clock, path, stop_event):
+    bot = TradingBot(
+        stop_event=stop_event, exchange=BinanceClient(validate='none', client=client),
+        hub=MarketDataHub(client_factory=lambda: client, clock=clock.time), clock=clock,
+        notify=None, min_vol=0.0, checkpoints=True, journal=False, config=False,
+    )
+    bot.checkpoint_file = path
+    return bot
+
+
+def test_save_is_atomic_and_stale_checkpoints_are_ignored(tmp_path):
+    path = str(tmp_path / 'BTC_USDT_1m.json')
+    checkpoint.save_checkpoint(path, {'config': {'symbol': 'BTC/USDT'}})
+    assert [p.name for p in tmp_path.iterdir()] == ['BTC_USDT_1m.json']
+    state = checkpoint.load_checkpoint(path)
+    assert state['config'] == {'symbol': 'BTC/USDT'}
+    assert checkpoint.load_checkpoint(path, now=state['saved_at'] + 10, max_age=5) is None
+
+
+def test_restart_resumes_without_warm_up_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path / 'logs')))
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    path = str(tmp_path / 'BTC_USDT_1m.json')
+    stop_event = threading.Event()
+    first = CountingExchange(cycles=30, stop_event=stop_event)
+    clock = VirtualClock(start=1_000_000.0)
+    make_bot(first, clock, path, stop_event).run()
+
+    with open(path) as f:
+        saved = json.load(f)
+    # Stamped with the bot's clock, the one its age is checked against on restore
+    assert 1_000_000.0 < saved['saved_at'] <= clock.time()
+    assert len(saved['base_candles']) == 101
+    assert saved['chart']['prices']
+
+    stop_event = threading.Event()
+    second = CountingExchange(cycles=1, stop_event=stop_event)
+    second.now = first.now + 2 * 60_000
+    restarted = make_bot(second, VirtualClock(start=clock.time() + 120), path, stop_event)
+    restarted.run()
+
+    since, limit = second.requests[0]
+    assert since == saved['base_candles'][-1][0]
+    assert limit <= 5
+    assert len(restarted.prices) == 100
+    assert restarted.last_trade_candle == saved['last_trade_candle']
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.config import ConfigError, ConfigStore
+from orchestrator.bots.manager import TradingBot
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.simulated import SimulatedExchange
+
+
+def write(path, config):
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    # Make sure the watcher sees a new mtime even on coarse filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_file_and_api_changes_are_validated_and_versioned(tmp_path):
+    path = str(tmp_path / 'bot.json')
+    store = ConfigStore(path)
+    assert not store.reload(force=True) and store.version == 0
+
+    write(path, {'short_window': 8, 'long_window': 30, 'symbols': {'ETH/USDT': {'trade_amount': 0.05}}})
+    assert store.reload() and store.version == 1
+    assert store.for_symbol('ETH/USDT') == (1, {'short_window': 8, 'long_window': 30, 'trade_amount': 0.05})
+    assert not store.reload()
+
+    # A bad file is reported and the last good version stays
+    write(path, {'short_window': 40, 'long_window': 30})
+    assert not store.reload() and 'short_window' in store.last_error
+    assert store.current()[1]['short_window'] == 8
+
+    with pytest.raises(ConfigError):
+        store.update({'long_window': 'fast'})
+    with pytest.raises(ConfigError):
+        store.update({'long_window': 5}, symbol='ETH/USDT')
+    snapshot = store.update({'stop_loss_pct': 0.02, 'long_window': 50})
+    assert snapshot['version'] == 2 and snapshot['last_error'] is None
+    with open(path) as f:
+        assert json.load(f)['long_window'] == 50
+    # Our own write is not picked up as another change
+    assert not store.reload()
+
+
+def test_running_bot_switches_parameters_between_cycles(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path / 'logs')))
+    store = ConfigStore(str(tmp_path / 'bot.json'))
+    simulated = SimulatedExchange()
+    fetch_ohlcv, requested = simulated.fetch_ohlcv, []
+
+    def recording_fetch(symbol, timeframe='1m', since=None, limit=100):
+        requested.append(since)
+        return fetch_ohlcv(symbol, timeframe, since, limit)
+
+    monkeypatch.setattr(simulated, 'fetch_ohlcv', recording_fetch)
+    bot = TradingBot(
+        exchange=BinanceClient(validate='none', client=simulated), config=store,
+        hub=MarketDataHub(client_factory=lambda: simulated, clock=lambda: 0.0),
+        notify=None, min_vol=0.0, checkpoints=False, journal=False,
+    )
+    assert not bot._apply_config()
+    bot.fetch_recent_prices(bot._history_needed())
+    assert len(bot.prices) == 100 and requested == [None]
+
+    store.update({'short_window': 10, 'long_window': 150, 'timeframe': '5m'})
+    store.update({'trade_amount': 0.5}, symbol='ETH/USDT')
+    assert bot._apply_config()
+    assert (bot.short_window, bot.long_window, bot.timeframe, bot.trade_amount) == (10, 150, '5m', 0.001)
+    assert bot._history_needed() == 151
+    assert bot.checkpoint_file.endswith('BTC_USDT_5m.json')
+    assert not bot._apply_config()
+
+    # The 5m feed reuses the 1m buffer and only pages in the older candles it lacks
+    bot.fetch_recent_prices(bot._history_needed())
+    assert len(bot.prices) == 151
+    assert len(requested) == 2 and requested[1] < bot.timestamps[0]
+    bot.subscription.close()
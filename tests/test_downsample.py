@@ -0,0 +1,43 @@
+import numpy as np
+
+from orchestrator.data.downsample import ChartViewCache, downsample_chart, lttb_indices
+
+
+def chart(n=10_000):
+    rng = np.random.default_rng(1)
+    prices = list(100 + np.cumsum(rng.normal(0, 0.1, n)))
+    prices[1234] = 200.0  # a spike the downsampled chart must not lose
+    return {
+        'timestamps': [1_700_000_000_000 + i * 60_000 for i in range(n)],
+        'prices': prices,
+        'short_ma': prices[:],
+        'long_ma': [None] * 19 + prices[19:],
+        'signals': [{'type': 'buy', 'index': 5001, 'price': prices[5001]}],
+        'volatility': 0.01,
+        'symbol': 'BTC/USDT',
+    }
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    data = chart()
+    indices = lttb_indices(data['timestamps'], data['prices'], 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(data['prices']) - 1
+    assert 1234 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_chart_series_stay_aligned_and_signals_are_kept():
+    data = chart()
+    view = downsample_chart(data, 300)
+    assert view['downsampled'] and view['original_count'] == 10_000
+    assert 300 <= len(view['prices']) <= 301
+    assert len(view['timestamps']) == len(view['long_ma']) == len(view['prices'])
+    signal = view['signals'][0]
+    assert view['prices'][signal['index']] == data['prices'][5001]
+
+    cache = ChartViewCache()
+    assert cache.get(data, 300) is cache.get(data, 300)
+    data['prices'][-1] += 1
+    assert cache.get(data, 300)['prices'][-1] == data['prices'][-1]
+    assert (cache.hits, cache.misses) == (1, 2)
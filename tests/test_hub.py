@@ -0,0 +1,88 @@
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.data.candles import list_aggregators
+
+MINUTE = 60_000
+NOW = 1_700_000_000_000 - 1_700_000_000_000 % (60 * MINUTE)
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def milliseconds(self):
+        return NOW
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=100):
+        self.calls.append((symbol, since, limit))
+        end = NOW // MINUTE
+        start = end - limit + 1 if since is None else since // MINUTE
+        return [[m * MINUTE, 1.0, 2.0, 0.5, float(m % 10), 1.0] for m in range(start, end + 1)][:limit]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bots_on_same_symbol_share_one_fetch():
+    client, clock = FakeClient(), FakeClock()
+    hub = MarketDataHub(client_factory=lambda: client, min_interval=5.0, clock=clock)
+    received = []
+    fast = hub.subscribe('ETH/USDT', '1m', limit=30)
+    slow = hub.subscribe('ETH/USDT', '5m', limit=10,
+                         callback=lambda symbol, tf, candles: received.append((tf, len(candles))))
+
+    assert len(fast.fetch()) == 30
+    assert len(slow.fetch()) == 10
+    assert len(client.calls) == 1
+    assert received == [('5m', 10)]
+
+    clock.now += 6
+    fast.fetch()
+    assert len(client.calls) == 2
+    # Incremental refresh only asks for the newest candles
+    assert client.calls[-1][1] == NOW
+
+
+def test_feed_is_released_with_last_subscriber():
+    client = FakeClient()
+    hub = MarketDataHub(client_factory=lambda: client, clock=FakeClock())
+    first = hub.subscribe('SOL/USDT', '1m', limit=20)
+    second = hub.subscribe('SOL/USDT', '15m', limit=5)
+    first.fetch()
+    assert hub.refcount('SOL/USDT') == 2
+
+    first.close()
+    assert hub.refcount('SOL/USDT') == 1
+    assert 'SOL/USDT' in list_aggregators()
+
+    second.close()
+    assert hub.refcount('SOL/USDT') == 0
+    assert 'SOL/USDT' not in list_aggregators()
+    assert hub.stats() == {}
+
+
+def test_late_subscriber_gets_the_history_it_needs():
+    client = FakeClient()
+    hub = MarketDataHub(client_factory=lambda: client, min_interval=60.0, clock=FakeClock())
+    running = hub.subscribe('ADA/USDT', '1m', limit=100)
+    assert len(running.fetch()) == 100
+    first_seen = client.calls[-1]
+
+    # Joining the running feed pages in the older candles instead of
+    # waiting for them to accumulate
+    longer = hub.subscribe('ADA/USDT', '1m', limit=300)
+    assert len(longer.fetch()) == 300
+    hourly = hub.subscribe('ADA/USDT', '1h', limit=16)
+    assert len(hourly.fetch()) == 16
+    assert len(client.calls) == 3
+    assert all(since < NOW - 100 * MINUTE for _, since, _ in client.calls[1:])
+    assert first_seen == ('ADA/USDT', None, 101)
+
+    # Once the history is complete, refreshes within the interval stay local
+    assert not hub.refresh('ADA/USDT')
+    for subscription in (running, longer, hourly):
+        subscription.close()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import numpy as np
+
+from orchestrator.data import indicators
+from orchestrator.data.volatility import calculate_volatility
+from orchestrator.strategies.moving_average import MovingAverageStrategy
+
+
+def random_series(count, length, seed=3):
+    rng = np.random.default_rng(seed)
+    return [list(100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))) for _ in range(count)]
+
+
+def test_kernels_match_the_per_symbol_calculations():
+    series = random_series(40, 60)
+    # Ragged input: shorter rows are NaN-padded on the left
+    series[3] = series[3][-30:]
+    matrix = indicators.as_matrix(series)
+    short_ma = indicators.sma(matrix, 5)
+    long_ma = indicators.sma(matrix, 20)
+    crosses = indicators.crossovers(short_ma, long_ma)
+    vols = indicators.volatility(matrix, 20)
+    rolling = indicators.rolling_volatility(matrix, 20)
+    strategy = MovingAverageStrategy()
+
+    for i, prices in enumerate(series):
+        row = slice(matrix.shape[1] - len(prices), None)
+        expected = np.convolve(prices, np.ones(20) / 20, mode='valid')
+        np.testing.assert_allclose(long_ma[i, row][19:], expected, rtol=1e-10)
+        assert np.isnan(long_ma[i, row][:19]).all()
+        assert abs(vols[i] - calculate_volatility(prices, 20)) < 1e-12
+        assert abs(rolling[i, -1] - vols[i]) < 1e-9
+        for t in range(21, len(prices) + 1):
+            cross = crosses[i, row][t - 1]
+            assert (cross == 1) == strategy.should_buy(prices[:t], 5, 20)
+            assert (cross == -1) == strategy.should_sell(prices[:t], 5, 20)
+
+
+def test_ema_is_seeded_with_the_first_value():
+    values = indicators.ema(np.array([[1.0, 2.0, 3.0], [np.nan, 4.0, 4.0]]), span=3)
+    np.testing.assert_allclose(values[0], [1.0, 1.5, 2.25])
+    np.testing.assert_allclose(values[1, 1:], [4.0, 4.0])
+
+
+def test_batcher_evaluates_concurrent_bots_together():
+    batcher = indicators.IndicatorBatcher(max_wait=2.0)
+    series = random_series(8, 50)
+    results = [None] * len(series)
+    participants = [batcher.register() for _ in series]
+
+    def bot(i):
+        results[i] = batcher.ma_crossover(series[i], 5, 20, 20, participant=participants[i])
+
+    threads = [threading.Thread(target=bot, args=(i,)) for i in range(len(series))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert batcher.stats()['batches'] == 1
+    for prices, result in zip(series, results):
+        assert abs(result['volatility'] - calculate_volatility(prices, 20)) < 1e-12
+
+
+def test_batcher_does_not_wait_for_sleeping_bots():
+    batcher = indicators.IndicatorBatcher(max_wait=2.0)
+    awake, asleep = batcher.register(), batcher.register()
+    prices = random_series(1, 50)[0]
+    with batcher.idle(asleep):
+        started = time.perf_counter()
+        batcher.ma_crossover(prices, 5, 20, 20, participant=awake)
+        assert time.perf_counter() - started < 0.5
+    # Woken up, it is due again for the next tick
+    assert batcher.stats()['due'] == 1
+    batcher.unregister(awake)
+    batcher.unregister(asleep)
+    assert batcher.stats()['participants'] == 0 and batcher.stats()['due'] == 0
@@ -0,0 +1,66 @@
+import threading
+
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.journal import DAY_MS, TradeJournal
+from orchestrator.bots.manager import TradingBot
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import VirtualClock
+from orchestrator.execution.risk import RiskEngine, RiskLimits
+from tests.test_replay import SineExchange
+
+DAY0 = 19_000 * DAY_MS
+
+
+def test_aggregates_match_the_fills_with_and_without_daily_totals(tmp_path):
+    journal = TradeJournal(str(tmp_path / 'journal.db'), batch_size=7)
+    pnls = [None, 5.0, None, -2.0, None, 1.0, None, 3.0]
+    for i, pnl in enumerate(pnls):
+        side = 'buy' if pnl is None else 'sell'
+        ts = DAY0 + (i // 4) * DAY_MS + i * 1000
+        journal.record_fill('BTC/USDT', side, 0.5, 100.0 + i, realized_pnl=pnl, ts=ts)
+    journal.record_fill('ETH/USDT', 'sell', 1.0, 10.0, realized_pnl=-4.0, ts=DAY0)
+    for _ in range(3):
+        journal.record_signal('BTC/USDT', 'buy', 100.0, candle_ts=DAY0, timeframe='1m', ts=DAY0)
+    assert journal.flush()
+    assert journal.batches >= 2
+
+    summary = journal.summary('BTC/USDT')
+    assert (summary['trades'], summary['buys'], summary['sells']) == (8, 4, 4)
+    assert summary['realized_pnl'] == 7.0 and summary['win_rate'] == 0.75
+    assert summary['signals'] == 1
+
+    days = journal.daily('BTC/USDT', start=DAY0, end=DAY0 + 2 * DAY_MS)
+    assert [(d['trades'], d['realized_pnl'], d['win_rate']) for d in days] == [(4, 3.0, 0.5), (4, 4.0, 1.0)]
+    # A range inside a day is answered from the fills themselves
+    partial = journal.summary(start=DAY0 + 2000, end=DAY0 + DAY_MS)
+    assert (partial['trades'], partial['realized_pnl']) == (2, -2.0)
+    assert journal.summary(end=DAY0 + DAY_MS)['losses'] == 2
+    assert journal.rows('fills', 'ETH/USDT')[0]['realized_pnl'] == -4.0
+
+
+def test_bot_journals_orders_fills_and_cycle_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path / 'logs')))
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    stop_event = threading.Event()
+    client = SineExchange(cycles=40, stop_event=stop_event)
+    clock = VirtualClock()
+    journal = TradeJournal(str(tmp_path / 'journal.db'))
+    bot = TradingBot(
+        stop_event=stop_event, exchange=BinanceClient(validate='none', client=client),
+        hub=MarketDataHub(client_factory=lambda: client, clock=clock.time), clock=clock,
+        notify=None, min_vol=0.0, checkpoints=False, journal=journal, config=False,
+        risk=RiskEngine(RiskLimits(), clock=clock.time),
+    )
+    bot.run()
+    journal.flush()
+
+    orders = journal.rows('orders', 'BTC/USDT')
+    fills = journal.rows('fills', 'BTC/USDT')
+    assert orders and len(fills) == len(orders)
+    assert {o['source'] for o in orders} == {'strategy'}
+    assert len(journal.rows('signals')) == len(orders)
+    assert len(journal.rows('metrics', limit=1000)) >= 10
+    summary = journal.summary('BTC/USDT')
+    assert summary['trades'] == len(fills) and summary['closing'] >= 1
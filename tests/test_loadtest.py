@@ -0,0 +1,18 @@
+from orchestrator import loadtest
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+
+
+def test_dashboards_poll_a_simulated_bot_without_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path)))
+    report = loadtest.run_load_test(dashboards=3, duration=2.5, speed=50, control_interval=1.0)
+
+    assert report['errors'] == 0
+    endpoints = report['endpoints']
+    assert endpoints['GET /bot-status']['requests'] >= 3 * 2
+    assert endpoints['GET /bot-logs']['requests'] >= 3
+    assert endpoints['GET /price-feed']['requests'] >= 1
+    assert endpoints['GET /bot-control (page)']['requests'] == 3
+    assert endpoints['POST /bot-control']['requests'] >= 3
+    assert report['bot']['cycles'] >= 5
+    assert report['bot']['period_ms']['p50'] >= report['bot']['nominal_period_ms']
@@ -0,0 +1,57 @@
+import threading
+
+from orchestrator.bots.logbuffer import LogRingBuffer
+
+
+def entry(i, category="INFO"):
+    return {"timestamp": f"t{i}", "category": category, "message": f"m{i}"}
+
+
+def test_cursor_returns_only_new_entries_per_category():
+    logs = LogRingBuffer(capacity=5)
+    for i in range(4):
+        logs.append(entry(i, "TRADE" if i % 2 else "INFO"))
+    cursor = logs.last_seq
+    logs.append(entry(4, "TRADE"))
+
+    assert [e["message"] for e in logs.since(cursor)] == ["m4"]
+    assert [e["message"] for e in logs.since(0, "TRADE")] == ["m1", "m3", "m4"]
+    assert [e["message"] for e in logs.latest("INFO")] == ["m2", "m0"]
+
+
+def test_overwritten_and_cleared_entries_are_not_returned():
+    logs = LogRingBuffer(capacity=3)
+    for i in range(5):
+        logs.append(entry(i))
+    assert [e["seq"] for e in logs] == [3, 4, 5]
+    assert logs.first_seq == 3
+
+    logs.clear()
+    assert len(logs) == 0 and not logs
+    assert logs.append(entry(5)) == 6
+    assert [e["message"] for e in logs.since(0)] == ["m5"]
+
+
+def test_concurrent_writers_and_readers():
+    logs = LogRingBuffer(capacity=50)
+    errors = []
+
+    def write():
+        for i in range(2000):
+            logs.append(entry(i, "PRICE"))
+
+    def read():
+        try:
+            for _ in range(2000):
+                seqs = [e["seq"] for e in logs.since(0, "PRICE")]
+                assert seqs == sorted(seqs) and len(seqs) <= 50
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(2)] + [threading.Thread(target=read)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert logs.last_seq == 4000
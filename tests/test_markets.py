@@ -0,0 +1,68 @@
+import pytest
+
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.markets import MarketCache, OrderValidationError
+
+MARKETS = {
+    'BTC/USDT': {
+        'symbol': 'BTC/USDT',
+        'precision': {'amount': 0.00001, 'price': 0.01},
+        'limits': {'amount': {'min': 0.00001, 'max': 9000}, 'cost': {'min': 10}},
+    },
+}
+
+
+class FakeClient:
+    id = 'fakex'
+    precisionMode = 4
+    currencies = {'BTC': {}, 'USDT': {}}
+
+    def __init__(self):
+        self.load_calls = 0
+        self.markets = None
+        self.orders = []
+
+    def load_markets(self, reload=False):
+        self.load_calls += 1
+        return MARKETS
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+
+    def create_market_order(self, symbol, side, amount):
+        self.orders.append((symbol, side, amount))
+        return {'id': '1', 'symbol': symbol, 'side': side, 'amount': amount, 'status': 'closed'}
+
+
+def test_markets_load_once_and_persist(tmp_path):
+    path = str(tmp_path / 'fakex.json')
+    first, second = FakeClient(), FakeClient()
+    cache = MarketCache('fakex', path=path)
+    assert cache.apply(first) and cache.apply(second)
+    assert first.load_calls + second.load_calls == 1
+    assert second.markets is MARKETS
+
+    # A new process reads the disk copy instead of asking the exchange
+    third = FakeClient()
+    MarketCache('fakex', path=path).apply(third)
+    assert third.load_calls == 0 and third.markets == MARKETS
+
+    clock = lambda: 10 ** 12
+    MarketCache('fakex', path=path, clock=clock).apply(third)
+    assert third.load_calls == 1
+
+
+def test_orders_are_rounded_and_checked_before_sending(tmp_path, monkeypatch):
+    monkeypatch.setenv('DEMO_MODE', 'False')
+    client = FakeClient()
+    cache = MarketCache('fakex', path=str(tmp_path / 'fakex.json'))
+    exchange = BinanceClient(validate='none', client=client, markets=cache)
+
+    order = exchange.create_order('BTC/USDT', 'buy', 0.0012349, reference_price=65000)
+    assert cache.loaded and client.markets is MARKETS
+    assert order['amount'] == 0.00123
+    assert exchange.create_order('BTC/USDT', 'buy', 0.0001, reference_price=65000) is None
+    assert client.orders == [('BTC/USDT', 'buy', 0.00123)]
+    assert cache.price_to_precision('BTC/USDT', 65000.126) == 65000.13
+    with pytest.raises(OrderValidationError):
+        cache.check_order('DOGE/USDT', 1)
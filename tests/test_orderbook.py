@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from orchestrator.data.orderbook import OrderBook, OrderBookCache, OrderBookGapError
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.simulated import SimulatedExchange
+
+
+def test_diffs_match_a_dict_book_and_gaps_need_a_snapshot():
+    rng = np.random.default_rng(0)
+    book = OrderBook('BTC/USDT', depth=50)
+    bids = {round(100 - i * 0.1, 1): 1.0 for i in range(1, 30)}
+    asks = {round(100 + i * 0.1, 1): 1.0 for i in range(1, 30)}
+    book.apply_snapshot(list(bids.items()), list(asks.items()), update_id=10)
+    for update_id in range(11, 2000):
+        side = bids if rng.random() < 0.5 else asks
+        sign = -1 if side is bids else 1
+        price = round(100 + sign * rng.integers(1, 40) * 0.1, 1)
+        amount = 0.0 if rng.random() < 0.3 else float(rng.integers(1, 5))
+        if amount:
+            side[price] = amount
+        else:
+            side.pop(price, None)
+        level = [[price, amount]]
+        book.apply_diff(level if side is bids else [], level if side is asks else [], update_id, update_id)
+
+    snapshot = book.snapshot(depth=50)
+    assert snapshot['bids'] == [[p, bids[p]] for p in sorted(bids, reverse=True)]
+    assert snapshot['asks'] == [[p, asks[p]] for p in sorted(asks)]
+    assert book.mid() == (max(bids) + min(asks)) / 2
+
+    # Already applied diffs are skipped; a missing one desyncs the book
+    assert book.apply_diff([[99.0, 9.0]], [], 1500, 1999) is False
+    with pytest.raises(OrderBookGapError):
+        book.apply_diff([[99.0, 9.0]], [], 2005, 2006)
+    assert not book.synced
+
+
+def test_vwap_and_slippage_walk_the_levels():
+    book = OrderBook('BTC/USDT')
+    book.apply_snapshot([[99, 1], [98, 2]], [[101, 1], [102, 1], [103, 5]])
+    assert book.vwap('buy', 2.5) == (pytest.approx((101 + 102 + 103 * 0.5) / 2.5), 2.5)
+    assert book.vwap('sell', 2) == (pytest.approx(98.5), 2)
+    assert book.vwap('sell', 10) == (pytest.approx((99 + 196) / 3), 3)
+    assert book.slippage_bps('buy', 1) == pytest.approx(100)
+    assert book.slippage_bps('sell', 10) == float('inf')
+
+
+def test_demo_fills_walk_the_book(monkeypatch):
+    from orchestrator.data import orderbook
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    monkeypatch.setattr(orderbook, 'order_books', OrderBookCache())
+    simulated = SimulatedExchange(price=100.0, spread_bps=2.0, impact_bps=5.0, volatility=0.0)
+    exchange = BinanceClient(validate='none', client=simulated)
+    small = exchange.create_order('BTC/USDT', 'buy', 0.01)
+    large = exchange.create_order('BTC/USDT', 'buy', 5.0)
+    assert small['price'] == pytest.approx(100.01)
+    # Walking the book costs about what the simulated market order would
+    assert large['price'] == pytest.approx(100.01 + 100 * 5e-4 * 5, abs=0.02)
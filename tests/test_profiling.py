@@ -0,0 +1,48 @@
+import threading
+
+from orchestrator import profiling
+from orchestrator.bots.manager import bot_logs_history
+
+
+def busy(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_memory_snapshots_show_the_growing_allocator(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    profiler = profiling.MemoryProfiler()
+    profiler.start()
+    try:
+        first = profiler.snapshot('before')
+        leak = [bytearray(1024) for _ in range(2000)]
+        second = profiler.snapshot('after')
+        grown = profiler.diff(first['id'], second['id'], limit=5)
+        assert grown[0]['file'].endswith('test_profiling.py') and grown[0]['size_diff_kb'] > 1500
+        assert profiler.top(second['id'], limit=1)[0]['size_kb'] > 1500
+        assert (tmp_path / second['path'].split('/')[-1]).exists()
+        del leak
+    finally:
+        profiler.stop()
+
+
+def test_cpu_samples_name_the_hot_function(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    stop = threading.Event()
+    worker = threading.Thread(target=busy, args=(stop,), name='trading-bot', daemon=True)
+    worker.start()
+    try:
+        result = profiling.sample_cpu(seconds=0.3, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+    assert result['samples'] > 20 and result['threads'] == ['trading-bot']
+    assert any(row['function'].startswith('busy ') and row['share'] > 0.9 for row in result['total'])
+    with open(result['path']) as f:
+        assert f.readline().startswith('trading-bot;')
+
+
+def test_object_summary_reports_bounded_log_history():
+    summary = profiling.object_summary(top=5)
+    assert summary['structures']['bot_logs_history']['max'] == bot_logs_history.maxlen
+    assert len(summary['top_types']) == 5
@@ -0,0 +1,71 @@
+import math
+import threading
+
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.manager import TradingBot
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import ExchangeRecorder, RecordingClient, VirtualClock, run_replay
+
+MINUTE = 60_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+class SineExchange:
+    """ccxt stand-in whose close prices follow a sine wave, one new candle per fetch."""
+    def __init__(self, cycles, stop_event):
+        self.now = START
+        self.fetches = 0
+        self.cycles = cycles
+        self.stop_event = stop_event
+
+    def milliseconds(self):
+        return self.now
+
+    def price(self, ts):
+        return 100 + 5 * math.sin(ts / MINUTE / 4)
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=100):
+        self.fetches += 1
+        self.now += MINUTE
+        if self.fetches >= self.cycles:
+            self.stop_event.set()
+        end = self.now // MINUTE
+        start = end - limit + 1 if since is None else since // MINUTE
+        candles = []
+        for m in range(start, end + 1):
+            p = self.price(m * MINUTE)
+            candles.append([m * MINUTE, p, p + 0.5, p - 0.5, p, 1.0])
+        return candles[-limit:]
+
+    def fetch_ticker(self, symbol):
+        return {'symbol': symbol, 'last': self.price(self.now)}
+
+
+def test_recorded_session_replays_identically(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path / 'logs')))
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    path = str(tmp_path / 'session.jsonl.gz')
+    stop_event = threading.Event()
+    recorder = ExchangeRecorder(path)
+    client = RecordingClient(SineExchange(cycles=40, stop_event=stop_event), recorder)
+    clock = VirtualClock()
+    recorded_orders = []
+
+    bot = TradingBot(
+        stop_event=stop_event, exchange=BinanceClient(validate='none', client=client),
+        hub=MarketDataHub(client_factory=lambda: client, clock=clock.time), clock=clock,
+        notify=None, min_vol=0.0, checkpoints=False, journal=False, config=False,
+        on_log=lambda e: e['message'].startswith('Placing') and recorded_orders.append(e['message']),
+    )
+    bot.run()
+    recorder.close()
+
+    summary = run_replay(path, min_vol=0.0)
+    assert recorded_orders, "the sine wave should produce crossovers"
+    assert summary['orders'] == recorded_orders
+    assert summary['replayed_calls']['fetch_ohlcv'] == 40
+    assert summary['unused_calls'] == 0
+    assert summary['virtual_seconds'] >= 390
+    assert summary['wall_seconds'] < 30
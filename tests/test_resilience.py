@@ -0,0 +1,105 @@
+import ccxt
+import pytest
+
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import VirtualClock
+from orchestrator.exchange.resilience import (
+    BudgetExhaustedError, CircuitOpenError, Resilience, ResilientClient, OPEN,
+)
+
+
+class FlakyClient:
+    id = 'flaky'
+
+    def __init__(self):
+        self.calls = []
+        self.failures = {}
+        self.last_response_headers = {}
+        self.price = 100.0
+
+    def _call(self, name, result):
+        self.calls.append(name)
+        errors = self.failures.get(name)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    def fetch_ticker(self, symbol):
+        return self._call('fetch_ticker', {'symbol': symbol, 'last': self.price})
+
+    def create_market_order(self, symbol, side, amount):
+        return self._call('create_market_order', {'id': '1', 'symbol': symbol, 'amount': amount})
+
+
+def make(limit=100, **kwargs):
+    clock = VirtualClock(start=1_000_000.0)
+    resilience = Resilience(limit=limit, reserve=0.2, failure_threshold=3, reset_timeout=30,
+                            retries=2, max_wait=120, clock=clock, **kwargs)
+    client = FlakyClient()
+    return ResilientClient(client, resilience), client, resilience, clock
+
+
+def test_transient_errors_are_retried_and_open_the_breaker():
+    wrapped, client, resilience, clock = make()
+    client.failures['fetch_ticker'] = [ccxt.RequestTimeout('slow'), ccxt.NetworkError('reset')]
+    assert wrapped.fetch_ticker('BTC/USDT')['last'] == 100.0
+    assert client.calls == ['fetch_ticker'] * 3 and clock.slept > 0
+
+    # A timed-out order may have gone through, so it is not sent again
+    client.failures['create_market_order'] = [ccxt.RequestTimeout('slow')]
+    with pytest.raises(ccxt.RequestTimeout):
+        wrapped.create_market_order('BTC/USDT', 'buy', 1)
+    assert client.calls.count('create_market_order') == 1
+
+    client.failures['fetch_ticker'] = [ccxt.ExchangeNotAvailable('down')] * 3
+    with pytest.raises(ccxt.ExchangeNotAvailable):
+        wrapped.fetch_ticker('BTC/USDT')
+    assert resilience.breaker('fetch_ticker').state == OPEN
+    calls = len(client.calls)
+    with pytest.raises(CircuitOpenError):
+        wrapped.fetch_ticker('BTC/USDT')
+    assert len(client.calls) == calls
+    # Other endpoints are unaffected, and one probe closes the breaker after the pause
+    assert wrapped.create_market_order('BTC/USDT', 'buy', 1)['id'] == '1'
+    clock.sleep(30)
+    assert wrapped.fetch_ticker('BTC/USDT')['last'] == 100.0
+    assert resilience.breaker('fetch_ticker').state == 'closed'
+
+
+def test_budget_keeps_headroom_for_orders_and_honours_retry_after():
+    wrapped, client, resilience, clock = make(limit=100)
+    # Start of a weight minute
+    clock.advance_to(1_000_020.0)
+    # Market data may use 80 of the 100 weight this minute, orders the rest
+    for _ in range(40):
+        wrapped.fetch_ticker('BTC/USDT')
+    assert resilience.budget.used == 80
+    before = clock.time()
+    for _ in range(20):
+        wrapped.create_market_order('BTC/USDT', 'buy', 1)
+    assert clock.time() == before
+    wrapped.fetch_ticker('BTC/USDT')
+    # ...market data waits for the next minute
+    assert clock.time() == 1_000_080.0
+
+    # The exchange's own count wins over ours
+    client.last_response_headers = {'X-MBX-USED-WEIGHT-1M': '95'}
+    wrapped.fetch_ticker('BTC/USDT')
+    assert resilience.budget.used == 95
+
+    client.last_response_headers = {'Retry-After': '200'}
+    client.failures['fetch_ticker'] = [ccxt.RateLimitExceeded('429')]
+    with pytest.raises(BudgetExhaustedError):
+        wrapped.fetch_ticker('BTC/USDT')
+    assert resilience.budget.snapshot()['blocked_for'] == pytest.approx(200, abs=1)
+
+
+def test_demo_order_without_a_price_is_not_filled_at_zero(monkeypatch):
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    client = FlakyClient()
+    client.milliseconds = lambda: 0
+    client.failures['fetch_ticker'] = [ccxt.NetworkError('down')] * 2
+    exchange = BinanceClient(validate='none', client=client)
+    assert exchange.create_order('BTC/USDT', 'buy', 1) is None
+    order = exchange.create_order('BTC/USDT', 'buy', 2, reference_price=50.0)
+    assert order['cost'] == 100.0
@@ -0,0 +1,58 @@
+from orchestrator.execution.risk import RiskEngine, RiskLimits
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_position_and_notional_limits_only_block_exposure_increases():
+    risk = RiskEngine(RiskLimits(max_position=2.2, max_symbol_notional=250, max_total_notional=300))
+    assert risk.check('BTC/USDT', 'buy', 2, 100) is None
+    # Pending exposure counts before the fill arrives
+    assert risk.check('BTC/USDT', 'buy', 0.5, 100).startswith('max position')
+    risk.on_fill('BTC/USDT', 'buy', 2, 100)
+    assert risk.check('ETH/USDT', 'buy', 1, 120).startswith('max total notional')
+    risk.mark('BTC/USDT', 130)
+    assert risk.check('BTC/USDT', 'buy', 0.1, 130).startswith('max symbol notional')
+    assert risk.check('BTC/USDT', 'sell', 1, 130) is None
+    risk.release('BTC/USDT', 'sell', 1)
+    assert risk.snapshot()['positions']['BTC/USDT']['pending'] == 0
+
+
+def test_order_rate_uses_a_sliding_window():
+    clock = FakeClock()
+    risk = RiskEngine(RiskLimits(max_orders_per_minute=2), clock=clock)
+    assert risk.check('BTC/USDT', 'buy', 1, 100) is None
+    clock.now += 30
+    assert risk.check('BTC/USDT', 'sell', 1, 100) is None
+    assert risk.check('BTC/USDT', 'buy', 1, 100).startswith('order rate')
+    clock.now += 31
+    assert risk.check('BTC/USDT', 'buy', 1, 100) is None
+    assert risk.snapshot()['rejections'] == {'order rate': 1}
+
+
+def test_daily_loss_blocks_new_risk_until_the_next_day():
+    clock = FakeClock()
+    risk = RiskEngine(RiskLimits(max_daily_loss=50), clock=clock)
+    risk.check('BTC/USDT', 'buy', 1, 100)
+    risk.on_fill('BTC/USDT', 'buy', 1, 100)
+    risk.check('BTC/USDT', 'sell', 1, 40)
+    risk.on_fill('BTC/USDT', 'sell', 1, 40)
+    assert risk.snapshot()['realized_today'] == -60
+    assert risk.check('ETH/USDT', 'buy', 1, 10).startswith('daily loss')
+    clock.now += 24 * 60 * 60
+    assert risk.check('ETH/USDT', 'buy', 1, 10) is None
+
+
+def test_protective_exits_pass_every_limit():
+    risk = RiskEngine(RiskLimits(max_orders_per_minute=1, max_daily_loss=10))
+    assert risk.check('BTC/USDT', 'buy', 1, 100) is None
+    risk.on_fill('BTC/USDT', 'buy', 1, 100)
+    risk.mark('BTC/USDT', 80)
+    assert risk.check('BTC/USDT', 'sell', 1, 80).startswith('order rate')
+    assert risk.check('BTC/USDT', 'sell', 1, 80, protective=True) is None
+    assert risk.snapshot()['positions']['BTC/USDT']['pending'] == -1
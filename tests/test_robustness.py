@@ -0,0 +1,50 @@
+import csv
+
+import numpy as np
+import pytest
+
+from orchestrator.strategies.backtest import backtest
+from orchestrator.strategies.moving_average import MovingAverageStrategy
+from orchestrator.strategies.robustness import export_results, run_robustness, synthetic_closes
+
+
+def test_backtest_trades_like_the_strategy_class():
+    closes = synthetic_closes(2000, seed=3)
+    strategy = MovingAverageStrategy()
+    expected, entry = [], None
+    for i in range(len(closes)):
+        window = list(closes[:i + 1])
+        if entry is None and strategy.should_buy(window, 5, 20):
+            entry = closes[i]
+        elif entry is not None and strategy.should_sell(window, 5, 20):
+            expected.append(closes[i] / entry * 0.999 ** 2 - 1)
+            entry = None
+    if entry is not None:
+        expected.append(closes[-1] / entry * 0.999 ** 2 - 1)
+
+    result = backtest(closes, 5, 20, fee=0.001)
+    assert result['trades'] == len(expected) > 5
+    assert result['returns'] == pytest.approx(expected)
+
+
+def test_results_are_reproducible_across_worker_counts(tmp_path):
+    closes = synthetic_closes(3000, seed=1)
+    kwargs = dict(short_windows=(3, 5, 8), long_windows=(20, 30), train=400, test=100,
+                  simulations=1000, chunk_size=100, seed=7)
+    events = []
+    inline = run_robustness(closes, workers=1, on_progress=events.append, **kwargs)
+    pooled = run_robustness(closes, workers=2, **kwargs)
+
+    assert len(inline['folds']) == 26
+    assert [e['phase'] for e in events].count('monte_carlo') == 10
+    assert events[-1]['simulations'] == 1000
+    assert inline['folds'] == pooled['folds']
+    assert inline['monte_carlo'] == pooled['monte_carlo']
+    assert run_robustness(closes, workers=1, **dict(kwargs, seed=8))['monte_carlo'] != inline['monte_carlo']
+
+    path = str(tmp_path / 'folds.csv')
+    export_results(inline, path)
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 26 and int(rows[0]['short_window']) in (3, 5, 8)
+    assert np.isclose(float(rows[-1]['oos_total_return']), inline['folds'][-1]['out_of_sample']['total_return'])
@@ -0,0 +1,51 @@
+import numpy as np
+
+from orchestrator.data.screener import screen
+from orchestrator.data.volatility import calculate_volatility
+
+HOUR = 3_600_000
+
+
+class UniverseExchange:
+    """Fake exchange with 300 USDT markets whose volatility grows with their index."""
+    def __init__(self, count=300):
+        self.markets = {f"C{i}/USDT": {'quote': 'USDT', 'active': True, 'spot': True} for i in range(count)}
+        self.markets['C0/BTC'] = {'quote': 'BTC', 'active': True, 'spot': True}
+        self.markets['DEAD/USDT'] = {'quote': 'USDT', 'active': True, 'spot': True}
+
+    def fetch_tickers(self):
+        return {s: {'quoteVolume': i} for i, s in enumerate(self.markets)}
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', limit=100):
+        end = 1_700_000_000_000 // HOUR * HOUR
+        if symbol == 'DEAD/USDT':
+            end -= 10 * HOUR
+        seed = int(symbol[1:].split('/')[0]) if symbol != 'DEAD/USDT' else 0
+        rng = np.random.default_rng(seed)
+        sigma = 0.001 * (seed + 1)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, sigma, limit)))
+        return [[end - (limit - 1 - i) * HOUR, c, c, c, c, 10.0 + i] for i, c in enumerate(closes)]
+
+
+def test_screen_ranks_the_whole_universe_in_one_pass():
+    client = UniverseExchange()
+    result = screen(client, max_symbols=None, top=5, ttl=0)
+
+    assert result['screened'] == 300
+    ranked = [r['symbol'] for r in result['results']]
+    assert 'DEAD/USDT' not in ranked and len(ranked) == 5
+
+    candles = client.fetch_ohlcv(ranked[0], limit=21)
+    expected = calculate_volatility([c[4] for c in candles], window=20)
+    assert abs(result['results'][0]['volatility'] - expected) < 1e-12
+    vols = [r['volatility'] for r in result['results']]
+    assert vols == sorted(vols, reverse=True)
+
+
+def test_cached_candles_are_reranked_without_refetching():
+    client = UniverseExchange(count=20)
+    first = screen(client, max_symbols=None, top=None, ttl=60)
+    client.fetch_ohlcv = None
+    by_momentum = screen(client, max_symbols=None, top=None, sort_by='momentum', ttl=60)
+    assert by_momentum['fetch_seconds'] == 0.0
+    assert {r['symbol'] for r in by_momentum['results']} == {r['symbol'] for r in first['results']}
@@ -0,0 +1,44 @@
+import pytest
+
+from orchestrator.bots.shards import (
+    ChartBuffer, ShardSupervisor, chart_key, configs_from_env, partition_symbols
+)
+
+
+def test_partition_is_balanced_and_keeps_symbol_together():
+    symbols = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ETH/USDT', 'ADA/USDT']
+    assignment = partition_symbols(symbols, 2)
+    assert set(assignment) == {'BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT'}
+    assert sorted(list(assignment.values()).count(i) for i in (0, 1)) == [2, 2]
+    assert partition_symbols(list(reversed(symbols)), 2) == assignment
+
+
+def test_chart_buffer_round_trip_through_shared_memory():
+    writer = ChartBuffer(capacity=8, create=True)
+    reader = ChartBuffer(writer.name, capacity=8)
+    try:
+        assert reader.read() is None
+        writer.write({
+            'timestamps': [1000, 2000, 3000],
+            'prices': [1.0, 2.0, 3.0],
+            'short_ma': [None, 1.5, 2.5],
+            'long_ma': [None, None, 2.0],
+            'volatility': 0.25,
+        })
+        data = reader.read()
+        assert data['timestamps'] == [1000, 2000, 3000]
+        assert data['short_ma'] == [None, 1.5, 2.5]
+        assert data['long_ma'] == [None, None, 2.0]
+        assert data['volatility'] == 0.25
+    finally:
+        reader.close()
+        writer.close()
+        writer.unlink()
+
+
+def test_each_timeframe_of_a_symbol_gets_its_own_chart(monkeypatch):
+    monkeypatch.setenv('BOT_SYMBOLS', 'BTC/USDT,BTC/USDT@5m,ETH/USDT')
+    configs = configs_from_env()
+    assert [chart_key(c) for c in configs] == ['BTC/USDT@1m', 'BTC/USDT@5m', 'ETH/USDT@1m']
+    with pytest.raises(ValueError, match='BTC/USDT@1m'):
+        ShardSupervisor(configs + [{'symbol': 'BTC/USDT', 'timeframe': '1m'}])
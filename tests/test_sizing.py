@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from orchestrator.data.volatility import calculate_volatility
+from orchestrator.exchange.markets import MarketCache
+from orchestrator.execution.sizing import PositionSizer, RollingVolatility
+
+MARKETS = {
+    'BTC/USDT': {
+        'symbol': 'BTC/USDT',
+        'precision': {'amount': 0.001, 'price': 0.01},
+        'limits': {'amount': {'min': 0.001, 'max': 9000}, 'cost': {'min': 10}},
+    },
+}
+
+
+class FakeClient:
+    id = 'fakex'
+    precisionMode = 4
+    currencies = {'BTC': {}, 'USDT': {}}
+
+    def load_markets(self, reload=False):
+        return MARKETS
+
+
+class FakeExchange:
+    def __init__(self, balance, tmp_path):
+        self.client = FakeClient()
+        self.markets = MarketCache('fakex', path=str(tmp_path / 'fakex.json'))
+        self.markets.load(self.client)
+        self.balance = balance
+        self.fetches = 0
+
+    def get_balance(self, asset):
+        self.fetches += 1
+        return self.balance
+
+
+def test_rolling_volatility_matches_the_batch_index():
+    closes = list(100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, 3000))))
+    tracker = RollingVolatility(20)
+    for i, close in enumerate(closes):
+        # Every candle is first seen mid-way and then with its final close
+        tracker.update(i, close * 1.003)
+        tracker.update(i, close)
+        if i >= 20:
+            assert tracker.value == pytest.approx(calculate_volatility(closes[:i + 1], 20), rel=1e-9)
+        else:
+            assert tracker.value is None
+
+
+def test_sizes_target_risk_round_to_lots_and_cache_the_balance(tmp_path):
+    now = [0.0]
+    sizer = PositionSizer(target_risk=0.002, max_fraction=0.5, window=5, balance_ttl=60, clock=lambda: now[0])
+    exchange = FakeExchange(10000.0, tmp_path)
+    assert sizer.size('BTC/USDT', '1h', 100.0, exchange)['amount'] is None
+
+    closes = [100, 101, 100, 102, 101, 103, 102]
+    sizer.update('BTC/USDT', '1h', list(range(7)), closes)
+    # Feeding the whole series again only processes the candles not seen yet
+    sizer.update('BTC/USDT', '1h', list(range(8)), closes + [104])
+    vol = calculate_volatility(closes + [104], 5)
+    assert sizer.volatility('BTC/USDT', '1h') == pytest.approx(vol)
+
+    decision = sizer.size('BTC/USDT', '1h', 104.0, exchange)
+    expected = 10000 * 0.002 / (vol * 104.0)
+    assert decision['amount'] == np.floor(expected * 1000) / 1000 and decision['reason'] is None
+    sizer.size('BTC/USDT', '1h', 104.0, exchange)
+    assert exchange.fetches == 1
+    now[0] = 61
+    sizer.size('BTC/USDT', '1h', 104.0, exchange)
+    assert exchange.fetches == 2
+
+    sizer.target_risk = 1.0
+    capped = sizer.size('BTC/USDT', '1h', 104.0, exchange)
+    assert capped['amount'] == np.floor(10000 * 0.5 / 104.0 * 1000) / 1000
+    assert capped['reason'].startswith('capped')
+
+    # Too small an account yields a size the exchange would reject
+    sizer.invalidate_balances()
+    exchange.balance = 5.0
+    assert sizer.size('BTC/USDT', '1h', 104.0, exchange)['amount'] == 0.0
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from orchestrator.bots.supervisor import BotSupervisor, RUNNING, STARTING, STOPPED, STOPPING
+
+
+class GatedExchange:
+    def __init__(self):
+        self.validated = threading.Event()
+        self.credentials_error = None
+
+    def wait_until_validated(self, timeout=None):
+        self.validated.wait(timeout)
+        return True
+
+
+class LoopingBot:
+    def __init__(self, stop_event, exchange):
+        self.stop_event = stop_event
+        self.exchange = exchange
+
+    def run(self):
+        while not self.stop_event.wait(0.01):
+            pass
+        # Stopping takes a while, like a bot finishing its cycle
+        time.sleep(0.1)
+
+
+def wait_for(supervisor, state, timeout=5.0):
+    deadline = time.time() + timeout
+    while supervisor.state != state and time.time() < deadline:
+        time.sleep(0.005)
+    return supervisor.state
+
+
+def test_commands_return_at_once_and_states_follow_the_bot():
+    exchange = GatedExchange()
+    bots = []
+    supervisor = BotSupervisor(lambda stop_event: bots.append(LoopingBot(stop_event, exchange)) or bots[-1])
+
+    started = time.perf_counter()
+    command = supervisor.submit('start')
+    assert time.perf_counter() - started < 0.05 and command['status'] == 'queued'
+    assert wait_for(supervisor, STARTING) == STARTING
+    exchange.validated.set()
+    assert wait_for(supervisor, RUNNING) == RUNNING
+    assert supervisor.command(command['id'])['status'] == 'done'
+
+    again = supervisor.submit('start')
+    stop = supervisor.submit('stop')
+    assert wait_for(supervisor, STOPPING) == STOPPING
+    assert supervisor.command(again['id'])['status'] == 'ignored'
+    assert supervisor.command(stop['id'])['status'] == 'done'
+
+    # A start while the old bot is still stopping runs once it has exited
+    supervisor.submit('start')
+    assert wait_for(supervisor, RUNNING) == RUNNING and len(bots) == 2
+    states = [t['state'] for t in supervisor.transitions]
+    assert states == [STARTING, RUNNING, STOPPING, STOPPED, STARTING, RUNNING]
+
+    supervisor.submit('stop')
+    assert wait_for(supervisor, STOPPED) == STOPPED
+    assert supervisor.status()['last_action'] == 'Bot stopped.'
+
+
+class SilentExchange:
+    credentials_error = None
+
+    def wait_until_validated(self, timeout=None):
+        return None
+
+
+def test_bot_whose_credential_check_times_out_never_runs():
+    bots = []
+    supervisor = BotSupervisor(
+        lambda stop_event: bots.append(LoopingBot(stop_event, SilentExchange())) or bots[-1], start_timeout=0.01
+    )
+    command = supervisor.submit('start')
+    deadline = time.time() + 5
+    while len(supervisor.transitions) < 2 and time.time() < deadline:
+        time.sleep(0.005)
+    assert supervisor.command(command['id'])['status'] == 'done' and supervisor.state == STOPPED
+    assert RUNNING not in [t['state'] for t in supervisor.transitions]
+    assert 'did not finish' in supervisor.status()['last_error']
@@ -0,0 +1,129 @@
+import math
+import random
+import threading
+
+import pytest
+
+from orchestrator.bots import manager
+from orchestrator.bots.archive import LogArchive
+from orchestrator.bots.manager import TradingBot
+from orchestrator.data.hub import MarketDataHub
+from orchestrator.exchange.binance import BinanceClient
+from orchestrator.exchange.replay import VirtualClock
+from orchestrator.execution.triggers import TriggerEngine
+from tests.test_replay import SineExchange
+
+
+class RecordingEngine(TriggerEngine):
+    def __init__(self):
+        super().__init__()
+        self.fired = []
+
+    def on_price(self, symbol, price):
+        fired = super().on_price(symbol, price)
+        self.fired.extend(fired)
+        return fired
+
+
+def test_levels_fire_once_in_the_right_direction():
+    engine = TriggerEngine()
+    stop = engine.add_stop_loss('BTC/USDT', 'sell', 1, 95.0)
+    target = engine.add_take_profit('BTC/USDT', 'sell', 1, 110.0)
+    short_stop = engine.add_stop_loss('BTC/USDT', 'buy', 1, 105.0)
+
+    assert engine.on_price('BTC/USDT', 100.0) == []
+    assert engine.on_price('BTC/USDT', 106.0) == [short_stop]
+    assert engine.on_price('BTC/USDT', 94.0) == [stop]
+    assert engine.on_price('BTC/USDT', 94.0) == []
+    assert [t['id'] for t in engine.active()] == [target.id]
+
+
+def test_group_is_one_cancels_other():
+    fired = []
+    engine = TriggerEngine(on_fire=lambda trigger, price: fired.append((trigger.kind, price)))
+    engine.add_stop_loss('ETH/USDT', 'sell', 1, 90.0, group='position')
+    engine.add_take_profit('ETH/USDT', 'sell', 1, 120.0, group='position')
+    engine.add_trailing_stop('ETH/USDT', 'sell', 1, 100.0, percent=0.05, group='position')
+
+    engine.on_price('ETH/USDT', 121.0)
+    assert fired == [('take_profit', 121.0)]
+    assert len(engine) == 0
+
+
+def test_group_members_crossing_on_the_same_tick_fire_once():
+    fired = []
+    engine = TriggerEngine(on_fire=lambda trigger, price: fired.append(trigger.kind))
+    engine.add_stop_loss('BTC/USDT', 'sell', 1, 98.0, group='position')
+    engine.add_trailing_stop('BTC/USDT', 'sell', 1, 100.0, percent=0.01, group='position')
+
+    assert [t.kind for t in engine.on_price('BTC/USDT', 97.0)] == ['stop_loss']
+    assert fired == ['stop_loss']
+    assert len(engine) == 0 and engine.on_price('BTC/USDT', 90.0) == []
+
+
+def test_new_trailing_stop_does_not_move_existing_ones():
+    engine = TriggerEngine()
+    first = engine.add_trailing_stop('X', 'sell', 1, 100.0, percent=0.05)
+    # e.g. restored from a checkpoint with its own high-water mark
+    engine.add_trailing_stop('X', 'sell', 1, 110.0, percent=0.05)
+    assert engine.active('X')[0]['watermark'] == pytest.approx(100.0)
+    fired = engine.on_price('X', 102.0)
+    assert [t.id for t in fired] == [2]
+    assert engine.active()[0]['id'] == first.id
+
+
+def test_trailing_stops_match_a_naive_simulation():
+    rng = random.Random(7)
+    engine = TriggerEngine()
+    price = 100.0
+    naive = {}
+    for step in range(3000):
+        if rng.random() < 0.05:
+            side = rng.choice(('buy', 'sell'))
+            if rng.random() < 0.5:
+                trigger = engine.add_trailing_stop('X', side, 1, price, offset=rng.uniform(0.1, 3))
+            else:
+                trigger = engine.add_trailing_stop('X', side, 1, price, percent=rng.uniform(0.001, 0.03))
+            naive[trigger.id] = [trigger, price]
+        price *= math.exp(rng.gauss(0, 0.002))
+
+        expected = set()
+        for trigger_id, (trigger, best) in naive.items():
+            if trigger.side == 'sell':
+                best = max(best, price)
+                stop = best - trigger.offset if trigger.offset else best * (1 - trigger.percent)
+                hit = price <= stop
+            else:
+                best = min(best, price)
+                stop = best + trigger.offset if trigger.offset else best * (1 + trigger.percent)
+                hit = price >= stop
+            naive[trigger_id][1] = best
+            if hit:
+                expected.add(trigger_id)
+        fired = {t.id for t in engine.on_price('X', price)}
+        assert fired == expected, step
+        for trigger_id in expected:
+            del naive[trigger_id]
+    assert len(engine) == len(naive)
+
+
+def test_bot_closes_position_on_trailing_stop(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'log_archive', LogArchive(str(tmp_path / 'logs')))
+    monkeypatch.setenv('DEMO_MODE', 'True')
+    stop_event = threading.Event()
+    client = SineExchange(cycles=40, stop_event=stop_event)
+    clock = VirtualClock()
+    engine = RecordingEngine()
+    messages = []
+    bot = TradingBot(
+        stop_event=stop_event, exchange=BinanceClient(validate='none', client=client),
+        hub=MarketDataHub(client_factory=lambda: client, clock=clock.time), clock=clock,
+        notify=None, min_vol=0.0, checkpoints=False, journal=False, config=False,
+        trailing_stop_pct=0.01, triggers=engine,
+        on_log=lambda e: messages.append(e['message']),
+    )
+    bot.run()
+
+    assert bot.triggers is engine
+    assert any(m.startswith('Trailing Stop triggered') for m in messages)
+    assert [t.kind for t in engine.fired] == ['trailing_stop'] and len(engine) == 0